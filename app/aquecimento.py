@@ -0,0 +1,88 @@
+"""
+Aquecimento do processo antes de receber requisições: carrega as URLs (e com
+elas views, serializers e services), as classes configuradas no DRF, os caches
+de localidades e da configuração da empresa e o catálogo de permissões, para
+que a primeira requisição de cada worker não pague esse custo.
+"""
+import logging
+import time
+
+from django.apps import apps
+from django.db import connection, connections
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+
+def _carregar_urls():
+    # reverse_dict força a importação de todas as views do ROOT_URLCONF
+    return len(get_resolver().reverse_dict)
+
+
+def _carregar_classes_drf():
+    from rest_framework.settings import api_settings
+
+    for nome in ('DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES',
+                 'DEFAULT_AUTHENTICATION_CLASSES', 'DEFAULT_PERMISSION_CLASSES'):
+        getattr(api_settings, nome)
+    return api_settings.DEFAULT_PAGINATION_CLASS
+
+
+def _conectar_banco():
+    connection.ensure_connection()
+
+
+def _carregar_localidades():
+    from cliente.localidades import obter_versao_localidades
+
+    return obter_versao_localidades()
+
+
+def _carregar_configuracao_empresa():
+    from empresa.configuracao import obter_configuracao
+
+    return obter_configuracao()
+
+
+def _carregar_permissoes():
+    from django.contrib.auth.models import Permission
+    from django.contrib.contenttypes.models import ContentType
+
+    # Preenche o cache de ContentType usado nas verificações de permissão e no admin
+    ContentType.objects.get_for_models(*apps.get_models())
+    return Permission.objects.count()
+
+
+ETAPAS = [
+    ('urls', _carregar_urls),
+    ('drf', _carregar_classes_drf),
+    ('banco', _conectar_banco),
+    ('localidades', _carregar_localidades),
+    ('configuracao_empresa', _carregar_configuracao_empresa),
+    ('permissoes', _carregar_permissoes),
+]
+
+
+def aquecer():
+    """
+    Executa as etapas de aquecimento e retorna a duração de cada uma em ms.
+    Falhas (ex.: banco ainda sem migrações) são registradas no log e não
+    impedem a inicialização do worker. As conexões abertas são fechadas ao
+    final; os caches preenchidos continuam valendo.
+    """
+    duracoes = {}
+    for nome, etapa in ETAPAS:
+        inicio = time.perf_counter()
+        try:
+            etapa()
+        except Exception as e:
+            logger.warning('Aquecimento: etapa %s falhou: %s', nome, e)
+        duracoes[nome] = round((time.perf_counter() - inicio) * 1000, 2)
+
+    # Servidores que carregam a aplicação antes do fork (gunicorn --preload)
+    # passariam a conexão aberta aqui a todos os workers, e uma conexão sqlite3
+    # não pode ser compartilhada entre processos: cada worker abre a sua na
+    # primeira requisição
+    connections.close_all()
+    logger.info('Aquecimento concluído em %.1f ms: %s', sum(duracoes.values()), duracoes)
+    return duracoes
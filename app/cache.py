@@ -0,0 +1,224 @@
+"""
+Cache em duas camadas para dados muito lidos: um LRU pequeno na memória do
+processo (L1) na frente do cache compartilhado do Django (L2).
+
+Cada namespace tem uma versão guardada no L2 e as chaves do L2 incluem essa
+versão. `invalidar()` gera uma nova versão: o worker que invalidou descarta o
+seu L1 na hora e os demais percebem a troca na próxima verificação da versão
+(no máximo CACHE_LOCAL_INTERVALO_VERSAO segundos depois).
+
+Um valor calculado após uma falta é guardado na versão lida antes do cálculo:
+se o namespace foi invalidado no meio, o valor (possivelmente anterior à
+invalidação) não entra na nova versão.
+"""
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+AUSENTE = object()
+CONTADORES = ('l1_acertos', 'l1_falhas', 'l2_acertos', 'l2_falhas', 'invalidacoes')
+
+_namespaces = {}
+
+
+class CacheDuasCamadas:
+    """
+    Cache de um namespace (ex.: 'localidades'). Os valores precisam ser
+    serializáveis pelo backend do L2 e não devem ser alterados por quem os lê,
+    pois o L1 devolve sempre o mesmo objeto.
+    """
+
+    def __init__(self, namespace, timeout=300, tamanho_local=None, intervalo_versao=None):
+        self.namespace = namespace
+        self.timeout = timeout
+        # Segundos entre verificações da versão no L2 (0: a cada leitura); padrão nas settings
+        self.intervalo_versao = intervalo_versao
+        self.tamanho_local = tamanho_local or getattr(settings, 'CACHE_LOCAL_TAMANHO', 256)
+        self.metricas = Counter()
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._versao = None
+        self._versao_verificada_em = 0.0
+        _namespaces[namespace] = self
+
+    @property
+    def chave_versao(self):
+        return f'camadas:{self.namespace}:versao'
+
+    def _chave_compartilhada(self, chave, versao):
+        return f'camadas:{self.namespace}:{versao}:{chave}'
+
+    def versao(self):
+        """
+        Versão atual do namespace. É lida do L2 no máximo uma vez a cada
+        intervalo_versao segundos; se mudou, o L1 é descartado.
+        """
+        agora = time.monotonic()
+        intervalo = self.intervalo_versao
+        if intervalo is None:
+            intervalo = getattr(settings, 'CACHE_LOCAL_INTERVALO_VERSAO', 1)
+        if self._versao is not None and agora - self._versao_verificada_em < intervalo:
+            return self._versao
+
+        versao = cache.get(self.chave_versao)
+        if versao is None:
+            cache.add(self.chave_versao, uuid.uuid4().hex, None)
+            versao = cache.get(self.chave_versao)
+        with self._lock:
+            if versao != self._versao:
+                self._local.clear()
+            self._versao = versao
+            self._versao_verificada_em = agora
+        return versao
+
+    def buscar(self, chave):
+        """
+        Retorna o valor da chave ou AUSENTE, consultando o L1 e depois o L2
+        """
+        return self.buscar_versionado(chave)[1]
+
+    def buscar_versionado(self, chave):
+        """
+        Como `buscar`, mas retorna (versão, valor). Quem calcula o valor após
+        uma falta deve guardá-lo com essa versão: guardar(chave, valor, versao=versao)
+        """
+        versao = self.versao()
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._local.get(chave)
+            if entrada is not None and entrada[0] > agora:
+                self._local.move_to_end(chave)
+                self.metricas['l1_acertos'] += 1
+                return versao, entrada[1]
+            self.metricas['l1_falhas'] += 1
+
+        valor = cache.get(self._chave_compartilhada(chave, versao), AUSENTE)
+        if valor is AUSENTE:
+            self.metricas['l2_falhas'] += 1
+        else:
+            self.metricas['l2_acertos'] += 1
+            self._guardar_local(chave, valor, versao=versao)
+        return versao, valor
+
+    def guardar(self, chave, valor, timeout=None, versao=None):
+        """
+        Guarda o valor na versão `versao` (padrão: a atual). Se o namespace foi
+        invalidado depois dessa versão ser lida, o valor é descartado: pode ter
+        sido calculado com dados anteriores à invalidação.
+        """
+        atual = self.versao()
+        if versao is not None and versao != atual:
+            return
+        timeout = timeout or self.timeout
+        cache.set(self._chave_compartilhada(chave, atual), valor, timeout)
+        self._guardar_local(chave, valor, timeout, versao=atual)
+
+    def obter(self, chave, calcular, timeout=None):
+        """
+        Retorna o valor em cache ou calcula, guarda e retorna. Exceções de
+        `calcular` não são guardadas.
+        """
+        versao, valor = self.buscar_versionado(chave)
+        if valor is AUSENTE:
+            valor = calcular()
+            self.guardar(chave, valor, timeout, versao=versao)
+        return valor
+
+    def invalidar(self):
+        """
+        Descarta o namespace em todos os workers
+        """
+        versao = uuid.uuid4().hex
+        cache.set(self.chave_versao, versao, None)
+        with self._lock:
+            self._local.clear()
+            self._versao = versao
+            self._versao_verificada_em = time.monotonic()
+        self.metricas['invalidacoes'] += 1
+
+    def _guardar_local(self, chave, valor, timeout=None, versao=None):
+        # Entradas do L1 expiram pelo mesmo timeout do namespace
+        expira_em = time.monotonic() + (timeout or self.timeout)
+        with self._lock:
+            # Comparada sob o lock: uma invalidação neste worker entre a leitura
+            # da versão e este ponto descarta o valor em vez de guardá-lo no L1
+            if versao is not None and versao != self._versao:
+                return
+            self._local[chave] = (expira_em, valor)
+            self._local.move_to_end(chave)
+            while len(self._local) > self.tamanho_local:
+                self._local.popitem(last=False)
+
+    def resumo_metricas(self):
+        resumo = {nome: self.metricas[nome] for nome in CONTADORES}
+        for camada in ('l1', 'l2'):
+            total = resumo[f'{camada}_acertos'] + resumo[f'{camada}_falhas']
+            resumo[f'{camada}_taxa_acerto'] = round(resumo[f'{camada}_acertos'] / total, 4) if total else None
+        resumo['itens_locais'] = len(self._local)
+        return resumo
+
+
+class CachePorOrganizacao:
+    """
+    Um namespace por organização ('<namespace>:<id>'), criado no primeiro
+    acesso: cada organização tem a sua versão e a invalidação de uma não
+    descarta o cache das outras
+    """
+
+    def __init__(self, namespace, **opcoes):
+        self.namespace = namespace
+        self.opcoes = opcoes
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def para(self, organizacao_id):
+        """
+        Cache da organização; None é a instalação sem organizações
+        """
+        camadas = self._caches.get(organizacao_id)
+        if camadas is None:
+            with self._lock:
+                camadas = self._caches.get(organizacao_id)
+                if camadas is None:
+                    sufixo = 'padrao' if organizacao_id is None else organizacao_id
+                    camadas = CacheDuasCamadas(f'{self.namespace}:{sufixo}', **self.opcoes)
+                    self._caches[organizacao_id] = camadas
+        return camadas
+
+    def invalidar(self, organizacao_id):
+        self.para(organizacao_id).invalidar()
+
+
+def obter_metricas():
+    """
+    Acertos e falhas por camada de cada namespace, neste processo
+    """
+    return {namespace: camadas.resumo_metricas() for namespace, camadas in sorted(_namespaces.items())}
+
+
+def limpar_caches():
+    """
+    Invalida todos os namespaces e zera as métricas (usado nos testes)
+    """
+    for camadas in _namespaces.values():
+        camadas.invalidar()
+        camadas.metricas.clear()
+
+
+def responder_com_cache(camadas, chave, handler, request, *args, **kwargs):
+    """
+    Serve do cache os dados de uma resposta do DRF. Só respostas 200 são
+    guardadas; as demais passam direto.
+    """
+    versao, dados = camadas.buscar_versionado(chave)
+    if dados is not AUSENTE:
+        return Response(dados)
+    response = handler(request, *args, **kwargs)
+    if response.status_code == 200:
+        camadas.guardar(chave, response.data, versao=versao)
+    return response
@@ -0,0 +1,120 @@
+"""
+Sparse fieldsets e expansão de relacionamentos nas leituras da API:
+?fields=id,cnpj,nome_fantasia devolve só esses campos e lê só essas colunas;
+?expand=criado_por troca o id do relacionamento pelo objeto, carregado no
+mesmo SELECT (select_related) ou em uma consulta extra por relação N:N.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+METODOS_LEITURA = ('GET', 'HEAD')
+
+
+def _lista(valor):
+    return [item.strip() for item in valor.split(',') if item.strip()]
+
+
+class CamposDinamicosSerializerMixin:
+    """
+    Serializer que recebe no contexto `campos` (nomes a manter) e `expandir`
+    (relacionamentos a serializar com a classe indicada em `expansoes`)
+    """
+    expansoes = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for nome in self.context.get('expandir', ()):
+            muitos = self.Meta.model._meta.get_field(nome).many_to_many
+            self.fields[nome] = self.expansoes[nome](many=muitos, read_only=True)
+        campos = self.context.get('campos')
+        if campos:
+            for nome in set(self.fields) - set(campos):
+                self.fields.pop(nome)
+
+
+class CamposDinamicosMixin:
+    """
+    Mixin de viewsets que interpreta ?fields= e ?expand= em list/retrieve e
+    restringe o queryset às colunas e relacionamentos pedidos
+    """
+
+    def campos_solicitados(self):
+        """
+        Retorna (campos, expandir) validados contra o serializer; campos vazio
+        significa todos. Relacionamentos expandidos entram nos campos.
+        """
+        if self.request is None or self.request.method not in METODOS_LEITURA:
+            return [], []
+        if not hasattr(self, '_campos_solicitados'):
+            params = self.request.query_params
+            campos = _lista(params.get('fields', ''))
+            expandir = _lista(params.get('expand', ''))
+            serializer_class = self.get_serializer_class()
+            legiveis = self._campos_legiveis(serializer_class)
+
+            invalidos = [nome for nome in campos if nome not in legiveis]
+            if invalidos:
+                raise serializers.ValidationError({'fields': [f"Campo(s) inválido(s): {', '.join(invalidos)}."]})
+            invalidos = [nome for nome in expandir if nome not in serializer_class.expansoes]
+            if invalidos:
+                raise serializers.ValidationError({'expand': [f"Não é possível expandir: {', '.join(invalidos)}."]})
+            if campos:
+                campos += [nome for nome in expandir if nome not in campos]
+            self._campos_solicitados = (campos, expandir)
+        return self._campos_solicitados
+
+    @staticmethod
+    def _campos_legiveis(serializer_class):
+        return {nome: campo for nome, campo in serializer_class().fields.items() if not campo.write_only}
+
+    def get_serializer_context(self):
+        contexto = super().get_serializer_context()
+        contexto['campos'], contexto['expandir'] = self.campos_solicitados()
+        return contexto
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = self.restringir_queryset(queryset)
+        return queryset
+
+    def restringir_queryset(self, queryset):
+        """
+        only() com as colunas dos campos pedidos, select_related/prefetch_related
+        dos relacionamentos expandidos e prefetch das relações N:N exibidas
+        """
+        campos, expandir = self.campos_solicitados()
+        serializer_class = self.get_serializer_class()
+        legiveis = self._campos_legiveis(serializer_class)
+        modelo = queryset.model
+        colunas = {modelo._meta.pk.name}
+        relacionados = []
+        # Sem ?fields= todas as colunas são lidas; campos calculados também impedem o only()
+        restringir = bool(campos)
+
+        for nome in campos or legiveis:
+            if nome in expandir:
+                continue
+            try:
+                campo_modelo = modelo._meta.get_field(legiveis[nome].source)
+            except FieldDoesNotExist:
+                restringir = False
+                continue
+            if campo_modelo.many_to_many:
+                relacionados.append(campo_modelo.name)
+            else:
+                colunas.add(campo_modelo.name)
+
+        for nome in expandir:
+            if modelo._meta.get_field(nome).many_to_many:
+                relacionados.append(nome)
+                continue
+            queryset = queryset.select_related(nome)
+            colunas.add(nome)
+            colunas.update(f'{nome}__{campo}' for campo in serializer_class.expansoes[nome].Meta.fields)
+
+        if restringir:
+            queryset = queryset.only(*colunas)
+        if relacionados:
+            queryset = queryset.prefetch_related(*relacionados)
+        return queryset
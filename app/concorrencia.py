@@ -0,0 +1,116 @@
+"""
+Controle de concorrência otimista. Modelos versionados gravam as alterações
+com UPDATE ... WHERE versao = <versão lida> quando a requisição informa a
+versão que o usuário editou (If-Match ou campo `versao`); se outra requisição
+gravou antes, nenhuma linha é afetada e a API responde 412.
+"""
+from django.db import models, transaction
+from django.utils.http import parse_etags
+from rest_framework import exceptions, serializers, status
+
+from .conditional import gerar_etag
+
+
+class ConflitoVersao(exceptions.APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'O registro foi alterado por outra requisição. Recarregue os dados e tente novamente.'
+    default_code = 'conflito_versao'
+
+
+class ModeloVersionado(models.Model):
+    """
+    Modelo com versão incrementada a cada save() de atualização. Definir
+    `versao_esperada` antes do save() torna o UPDATE condicional a ela; sem
+    ela o UPDATE incrementa a versão do banco (F('versao') + 1), para que
+    gravações incondicionais simultâneas não gravem a mesma versão.
+    """
+    # Incrementada a cada atualização do registro
+    versao = models.PositiveIntegerField(default=1, editable=False)
+
+    # Versão lida pelo usuário; usada (e descartada) pelo próximo save()
+    versao_esperada = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        versao_anterior = self.versao
+        if not self._state.adding:
+            self.versao = (self.versao_esperada or self.versao) + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'versao'}
+        try:
+            if self.versao_esperada is None:
+                super().save(*args, **kwargs)
+            else:
+                # Savepoint: o conflito não invalida a transação de quem chamou
+                with transaction.atomic(using=kwargs.get('using')):
+                    super().save(*args, **kwargs)
+        except ConflitoVersao:
+            self.versao = versao_anterior
+            raise
+        finally:
+            self.versao_esperada = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        if self.versao_esperada is None:
+            values = [
+                (campo, modelo, models.F('versao') + 1 if campo.attname == 'versao' else valor)
+                for campo, modelo, valor in values
+            ]
+            if not super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update):
+                return False
+            # A versão gravada pode estar à frente da lida por esta instância
+            self.versao = base_qs.filter(pk=pk_val).values_list('versao', flat=True).get()
+            return True
+        filtrado = base_qs.filter(versao=self.versao_esperada)
+        if not super()._do_update(filtrado, using, pk_val, values, update_fields, forced_update):
+            raise ConflitoVersao()
+        return True
+
+
+class ConcorrenciaOtimistaMixin:
+    """
+    Mixin de viewsets de modelos versionados. O ETag do registro deriva da
+    versão; PUT/PATCH aceitam If-Match com esse ETag (ou o campo `versao` no
+    corpo) e devolvem o novo ETag, dispensando uma nova leitura.
+    Sem If-Match nem `versao`, a gravação continua incondicional.
+    """
+    prefixo_etag = None
+
+    def etag_da_versao(self, pk, versao):
+        return gerar_etag(self.prefixo_etag, pk, versao)
+
+    def definir_versao_esperada(self, instancia):
+        """
+        Confere a versão informada com a instância já carregada pela view e a
+        guarda para o UPDATE condicional, que detecta gravações concorrentes
+        """
+        if_match = self.request.headers.get('If-Match')
+        if if_match:
+            # ETags fracos (respostas comprimidas) valem como o ETag original
+            etags = {etag.removeprefix('W/') for etag in parse_etags(if_match)}
+            if '*' not in etags and self.etag_da_versao(instancia.pk, instancia.versao) not in etags:
+                raise ConflitoVersao()
+            instancia.versao_esperada = instancia.versao
+            return
+
+        dados = self.request.data
+        versao = dados.get('versao') if hasattr(dados, 'get') else None
+        if versao in (None, ''):
+            return
+        try:
+            versao = int(versao)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({'versao': ['Informe um número inteiro.']})
+        if versao != instancia.versao:
+            raise ConflitoVersao()
+        instancia.versao_esperada = versao
+
+    def aplicar_etag_versao(self, response):
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED) and 'versao' in response.data:
+            response['ETag'] = self.etag_da_versao(response.data['id'], response.data['versao'])
+        return response
+
+    def update(self, request, *args, **kwargs):
+        return self.aplicar_etag_versao(super().update(request, *args, **kwargs))
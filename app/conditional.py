@@ -0,0 +1,88 @@
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+# Métodos em que o GET condicional é avaliado
+METODOS_SEGUROS = ('GET', 'HEAD')
+
+
+def gerar_etag(*partes):
+    """
+    Gera um ETag forte a partir das partes informadas
+    """
+    base = '|'.join(str(parte) for parte in partes)
+    return '"%s"' % hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+
+def gerar_etag_conteudo(dados):
+    """
+    Gera um ETag forte a partir do conteúdo serializável de uma resposta
+    """
+    conteudo = json.dumps(dados, sort_keys=True, ensure_ascii=False, default=str)
+    return gerar_etag(conteudo)
+
+
+def para_timestamp(data):
+    """
+    Converte um datetime em timestamp inteiro (precisão do cabeçalho Last-Modified)
+    """
+    if data is None:
+        return None
+    return int(data.timestamp())
+
+
+def verificar_condicional(request, etag=None, last_modified=None):
+    """
+    Retorna uma resposta 304/412 se as pré-condições da requisição permitirem,
+    ou None se a view deve montar a resposta completa
+    """
+    if request.method not in METODOS_SEGUROS:
+        return None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def aplicar_validadores(response, etag=None, last_modified=None, cache_control=None):
+    """
+    Adiciona ETag, Last-Modified e Cache-Control à resposta
+    """
+    if response.status_code not in (200, 304):
+        return response
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, **(cache_control or {'private': True, 'no_cache': True}))
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin que adiciona ETag/Last-Modified e respostas 304 a list e retrieve.
+    As views definem `get_validadores` retornando (etag, last_modified) sem
+    serializar os dados.
+    """
+    cache_control = {'private': True, 'no_cache': True}
+
+    def get_validadores(self, request, *args, **kwargs):
+        return None, None
+
+    def montar_resposta(self, handler, request, *args, **kwargs):
+        """
+        Monta a resposta completa quando não cabe 304; as views podem servir do cache
+        """
+        return handler(request, *args, **kwargs)
+
+    def responder_condicional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validadores(request, *args, **kwargs)
+        response = verificar_condicional(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.montar_resposta(handler, request, *args, **kwargs)
+        return aplicar_validadores(response, etag, last_modified, self.cache_control)
+
+    def list(self, request, *args, **kwargs):
+        return self.responder_condicional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.responder_condicional(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,146 @@
+"""
+Disjuntores (circuit breakers) das APIs externas. O estado fica no cache
+compartilhado, visível a todos os workers: após DISJUNTOR_LIMITE_FALHAS
+falhas seguidas o disjuntor abre e as chamadas falham na hora, sem esperar o
+serviço, por DISJUNTOR_TEMPO_ABERTO segundos. Depois disso (meio aberto) uma
+única chamada de teste decide se ele fecha ou abre de novo.
+"""
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+FECHADO = 'fechado'
+ABERTO = 'aberto'
+MEIO_ABERTO = 'meio_aberto'
+
+_disjuntores = {}
+_lock = threading.Lock()
+
+
+class ServicoIndisponivel(requests.ConnectionError):
+    """Chamada recusada pelo disjuntor aberto; tratada como erro de conexão"""
+
+
+class Disjuntor:
+
+    def __init__(self, nome, limite_falhas=None, tempo_aberto=None):
+        self.nome = nome
+        self.limite_falhas = limite_falhas or getattr(settings, 'DISJUNTOR_LIMITE_FALHAS', 5)
+        self.tempo_aberto = tempo_aberto or getattr(settings, 'DISJUNTOR_TEMPO_ABERTO', 30)
+
+    def _chave(self, sufixo):
+        return f'disjuntor:{self.nome}:{sufixo}'
+
+    def _ler(self):
+        valores = cache.get_many([self._chave('falhas'), self._chave('aberto_ate')])
+        return valores.get(self._chave('falhas'), 0), valores.get(self._chave('aberto_ate'))
+
+    @staticmethod
+    def _estado(aberto_ate):
+        if aberto_ate is None:
+            return FECHADO
+        return ABERTO if time.time() < aberto_ate else MEIO_ABERTO
+
+    def estado(self):
+        return self._estado(self._ler()[1])
+
+    def _abrir(self):
+        cache.set(self._chave('aberto_ate'), time.time() + self.tempo_aberto, None)
+        cache.delete_many([self._chave('falhas'), self._chave('teste')])
+
+    def registrar_falha(self, estado=FECHADO):
+        if estado == MEIO_ABERTO:
+            self._abrir()
+            return
+        if cache.add(self._chave('falhas'), 1, None):
+            falhas = 1
+        else:
+            try:
+                falhas = cache.incr(self._chave('falhas'))
+            except ValueError:
+                # A chave expirou ou foi removida entre o add e o incr
+                falhas = 1
+                cache.set(self._chave('falhas'), falhas, None)
+        if falhas >= self.limite_falhas:
+            self._abrir()
+
+    def registrar_sucesso(self, falhas, estado):
+        # Só escreve no cache quando há algo a limpar
+        if falhas or estado != FECHADO:
+            cache.delete_many([self._chave('falhas'), self._chave('aberto_ate'), self._chave('teste')])
+
+    def chamar(self, funcao, *args, **kwargs):
+        """
+        Executa a chamada HTTP `funcao` (ex.: requests.get) pelo disjuntor.
+        Erros de conexão e respostas 5xx/429 contam como falha; com o
+        disjuntor aberto levanta ServicoIndisponivel sem chamar o serviço.
+        """
+        return self._executar(funcao, args, kwargs)[0]
+
+    def chamar_json(self, funcao, *args, **kwargs):
+        """
+        Como `chamar`, mas retorna o corpo JSON da resposta. Respostas 5xx/429
+        e corpos que não são JSON (ex.: página de erro do gateway) contam como
+        falha e levantam ServicoIndisponivel, que a fila tenta de novo e as
+        views respondem com 503; só uma recusa (4xx sem JSON) vira ValueError.
+        """
+        return self._executar(funcao, args, kwargs, ler_json=True)[1]
+
+    def _executar(self, funcao, args, kwargs, ler_json=False):
+        falhas, aberto_ate = self._ler()
+        estado = self._estado(aberto_ate)
+        if estado == ABERTO or (
+            estado == MEIO_ABERTO and not cache.add(self._chave('teste'), 1, self.tempo_aberto)
+        ):
+            raise ServicoIndisponivel(f'{self.nome} indisponível (disjuntor aberto)')
+
+        try:
+            response = funcao(*args, **kwargs)
+        except requests.RequestException:
+            self.registrar_falha(estado)
+            raise
+        if response.status_code >= 500 or response.status_code == 429:
+            self.registrar_falha(estado)
+            if ler_json:
+                raise ServicoIndisponivel(f'{self.nome} indisponível (HTTP {response.status_code})')
+            return response, None
+
+        dados = None
+        if ler_json:
+            try:
+                dados = response.json()
+            except ValueError:
+                if response.status_code < 400:
+                    self.registrar_falha(estado)
+                    raise ServicoIndisponivel(f'{self.nome} respondeu sem JSON (HTTP {response.status_code})')
+                # 4xx sem JSON: o serviço está no ar e recusou a consulta
+                self.registrar_sucesso(falhas, estado)
+                raise ValueError(f'{self.nome} recusou a consulta (HTTP {response.status_code})')
+        self.registrar_sucesso(falhas, estado)
+        return response, dados
+
+    def resumo(self):
+        falhas, aberto_ate = self._ler()
+        estado = self._estado(aberto_ate)
+        return {
+            'estado': estado,
+            'falhas_seguidas': falhas,
+            'reabre_em': round(aberto_ate - time.time(), 1) if estado == ABERTO else None,
+        }
+
+
+def obter_disjuntor(nome):
+    """
+    Disjuntor do serviço `nome`, compartilhado pelos módulos que o consultam
+    """
+    with _lock:
+        if nome not in _disjuntores:
+            _disjuntores[nome] = Disjuntor(nome)
+        return _disjuntores[nome]
+
+
+def resumo_disjuntores():
+    return {nome: disjuntor.resumo() for nome, disjuntor in sorted(_disjuntores.items())}
@@ -0,0 +1,75 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+
+# Linha do -X importtime: "import time: self [us] | cumulative | imported package"
+RE_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+@dataclass
+class Importacao:
+    modulo: str
+    proprio_ms: float
+    acumulado_ms: float
+    nivel: int
+
+    @property
+    def pacote(self):
+        return self.modulo.split('.')[0]
+
+
+def analisar_importtime(saida):
+    """
+    Converte a saída de `python -X importtime` em uma lista de Importacao
+    """
+    importacoes = []
+    for linha in saida.splitlines():
+        match = RE_IMPORTTIME.match(linha)
+        if match:
+            proprio, acumulado, recuo, modulo = match.groups()
+            importacoes.append(Importacao(modulo, int(proprio) / 1000, int(acumulado) / 1000, len(recuo) // 2))
+    return importacoes
+
+
+def medir_importacao(modulo='app.wsgi', aquecer=False):
+    """
+    Importa o módulo em um interpretador novo com -X importtime e retorna
+    (importações, tempo total de inicialização em segundos)
+    """
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'app.settings'),
+        AQUECIMENTO_NA_INICIALIZACAO='1' if aquecer else '0',
+    )
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return analisar_importtime(processo.stderr), time.perf_counter() - inicio
+
+
+def resumir_por_pacote(importacoes):
+    """
+    Soma o tempo próprio de importação por pacote de primeiro nível
+    """
+    totais = defaultdict(float)
+    for importacao in importacoes:
+        totais[importacao.pacote] += importacao.proprio_ms
+    return sorted(totais.items(), key=lambda item: -item[1])
+
+
+def pacotes_do_projeto():
+    """
+    Pacotes de primeiro nível das apps instaladas que ficam dentro do projeto
+    """
+    from django.apps import apps
+
+    base = str(settings.BASE_DIR)
+    return {config.name.split('.')[0] for config in apps.get_app_configs() if config.path.startswith(base)}
@@ -0,0 +1,80 @@
+"""
+Limites de taxa por usuário e por endpoint. Em vez do histórico de horários
+do SimpleRateThrottle (lista lida e regravada a cada requisição, sem
+atomicidade entre workers), cada limite é um contador de janela fixa no
+cache compartilhado: um incr atômico por requisição. Nas bordas da janela
+podem passar até duas vezes o limite, o que basta para proteger os workers.
+
+As taxas ficam em REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']; escopo sem taxa
+(ou com taxa None) não é limitado. A resposta 429 traz Retry-After.
+"""
+import math
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import ScopedRateThrottle, UserRateThrottle
+
+
+class ContadorJanelaMixin:
+
+    def _incrementar(self, chave):
+        # Caso comum: o contador da janela já existe e basta um incr
+        try:
+            return self.cache.incr(chave)
+        except ValueError:
+            if self.cache.add(chave, 1, self.duration + 1):
+                return 1
+            return self.cache.incr(chave)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        agora = self.timer()
+        janela = int(agora // self.duration)
+        if self._incrementar(f'{self.key}:{janela}') <= self.num_requests:
+            return True
+        self.espera = (janela + 1) * self.duration - agora
+        return False
+
+    def wait(self):
+        return math.ceil(self.espera)
+
+
+class LimiteUsuario(ContadorJanelaMixin, UserRateThrottle):
+    """
+    Limite geral por usuário (ou por IP, sem autenticação) em toda a API
+    """
+    scope = 'usuario'
+
+
+def escopo_da_view(request, view):
+    """
+    Escopo declarado na view ou na @action (throttle_scope); sem ele,
+    'escrita' para métodos que alteram dados e 'listagem' para a action list
+    """
+    escopo = getattr(view, 'throttle_scope', None)
+    if escopo:
+        return escopo
+    if request.method not in SAFE_METHODS:
+        return 'escrita'
+    if getattr(view, 'action', None) == 'list':
+        return 'listagem'
+    return None
+
+
+class LimiteEndpoint(ContadorJanelaMixin, ScopedRateThrottle):
+    """
+    Limite por usuário em cada escopo de endpoint (consulta, login, listagem,
+    escrita), contado separadamente do limite geral
+    """
+
+    def allow_request(self, request, view):
+        self.scope = escopo_da_view(request, view)
+        self.rate = self.THROTTLE_RATES.get(self.scope) if self.scope else None
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from app.aquecimento import aquecer
+
+
+class Command(BaseCommand):
+    help = 'Executa o aquecimento do worker (URLs, caches e permissões) e mostra a duração de cada etapa'
+
+    def handle(self, *args, **options):
+        duracoes = aquecer()
+        for etapa, duracao in duracoes.items():
+            self.stdout.write(f'{etapa:<24}{duracao:>10.2f} ms')
+        self.stdout.write(self.style.SUCCESS(f'Total: {sum(duracoes.values()):.2f} ms'))
@@ -0,0 +1,65 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from app.importacao import medir_importacao, pacotes_do_projeto, resumir_por_pacote
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a inicialização de um worker com `python -X importtime` e lista as '
+        'importações mais caras, candidatas a importação tardia'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modulo', default='app.wsgi', help='Módulo importado na medição')
+        parser.add_argument('--top', type=int, default=20, help='Quantidade de módulos listados')
+        parser.add_argument('--minimo-ms', type=float, default=1.0, help='Ignora módulos abaixo deste tempo acumulado')
+        parser.add_argument('--aquecer', action='store_true', help='Inclui o aquecimento (app/aquecimento.py) na medição')
+        parser.add_argument('--json', action='store_true', help='Imprime o relatório em JSON')
+
+    def handle(self, *args, **options):
+        importacoes, duracao = medir_importacao(options['modulo'], aquecer=options['aquecer'])
+        projeto = pacotes_do_projeto()
+        mais_caras = sorted(
+            (importacao for importacao in importacoes if importacao.acumulado_ms >= options['minimo_ms']),
+            key=lambda importacao: -importacao.acumulado_ms,
+        )[:options['top']]
+        # Módulos do projeto com dependências pesadas são os candidatos a importação tardia
+        candidatos = [
+            importacao for importacao in mais_caras
+            if importacao.pacote in projeto and importacao.modulo != options['modulo']
+        ]
+
+        relatorio = {
+            'modulo': options['modulo'],
+            'inicializacao_s': round(duracao, 3),
+            'modulos_importados': len(importacoes),
+            'mais_caras': [
+                {'modulo': i.modulo, 'acumulado_ms': i.acumulado_ms, 'proprio_ms': i.proprio_ms} for i in mais_caras
+            ],
+            'por_pacote': [
+                {'pacote': pacote, 'proprio_ms': round(total, 3)}
+                for pacote, total in resumir_por_pacote(importacoes)[:options['top']]
+            ],
+            'candidatos_importacao_tardia': [i.modulo for i in candidatos],
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(relatorio, indent=2))
+            return
+
+        self.stdout.write(
+            f"Inicialização de {relatorio['modulo']}: {relatorio['inicializacao_s']:.3f} s "
+            f"({relatorio['modulos_importados']} módulos)\n"
+        )
+        self.stdout.write(f"{'acumulado ms':>14}{'próprio ms':>12}  módulo")
+        for importacao in mais_caras:
+            marca = ' *' if importacao in candidatos else ''
+            self.stdout.write(
+                f"{importacao.acumulado_ms:>14.1f}{importacao.proprio_ms:>12.1f}  {importacao.modulo}{marca}"
+            )
+        self.stdout.write(f"\n{'próprio ms':>14}  pacote")
+        for item in relatorio['por_pacote']:
+            self.stdout.write(f"{item['proprio_ms']:>14.1f}  {item['pacote']}")
+        if candidatos:
+            self.stdout.write('\n* módulos do projeto candidatos a importação tardia')
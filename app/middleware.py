@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # Brotli é opcional: sem ele as respostas usam apenas gzip
+    brotli = None
+
+re_aceita_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+class CompressaoMiddleware(GZipMiddleware):
+    """
+    Comprime respostas com brotli (quando instalado e aceito pelo cliente) ou
+    gzip, apenas acima de COMPRESSAO_TAMANHO_MINIMO bytes. Respostas pequenas
+    não compensam o custo de CPU da compressão.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSAO_TAMANHO_MINIMO:
+            return response
+
+        aceita_brotli = re_aceita_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is None or not aceita_brotli or response.streaming or response.has_header('Content-Encoding'):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        comprimido = brotli.compress(response.content, quality=settings.COMPRESSAO_QUALIDADE_BROTLI)
+        if len(comprimido) >= len(response.content):
+            return response
+        response.content = comprimido
+        response.headers['Content-Length'] = str(len(comprimido))
+
+        # ETag forte vira fraco no conteúdo comprimido, como no GZipMiddleware
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,52 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Chaves não-string (ex.: ids inteiros nos resultados em lote) viram string, como no json padrão
+OPCOES_ORJSON = orjson.OPT_NON_STR_KEYS
+
+_encoder_drf = JSONEncoder()
+
+
+def _padrao(obj):
+    # Tipos que o orjson não conhece (Decimal, textos lazy, QuerySets...) usam o encoder do DRF
+    return _encoder_drf.default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderer JSON baseado em orjson, compatível com o JSONRenderer do DRF
+    (mesmo media type e suporte a indent=2 pelo cabeçalho Accept)
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        opcoes = OPCOES_ORJSON
+        if accepted_media_type:
+            parametros = dict(
+                parte.strip().split('=', 1) for parte in accepted_media_type.split(';')[1:] if '=' in parte
+            )
+            if parametros.get('indent'):
+                opcoes |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_padrao, option=opcoes)
+
+
+class ORJSONParser(BaseParser):
+    """
+    Parser JSON baseado em orjson
+    """
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f'JSON parse error - {e}')
@@ -0,0 +1,121 @@
+"""
+Sondagens de saúde para orquestradores e balanceadores de carga. O resultado
+de cada sondagem é reaproveitado no processo por SAUDE_CACHE_SEGUNDOS, então
+sondagens frequentes não viram carga no banco nem no cache compartilhado.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+from .disjuntor import FECHADO, obter_disjuntor
+
+SERVICOS_EXTERNOS = ('receitaws', 'viacep', 'ibge')
+
+_resultados = {}
+_lock = threading.Lock()
+# Migrações aplicadas só voltam a ficar pendentes num novo deploy, que reinicia
+# os processos: depois da primeira sondagem positiva não é preciso repetir
+_migracoes_aplicadas = False
+
+
+def _reaproveitar(nome, sondar):
+    agora = time.monotonic()
+    with _lock:
+        guardado = _resultados.get(nome)
+    if guardado and agora - guardado[0] < settings.SAUDE_CACHE_SEGUNDOS:
+        return guardado[1]
+    resultado = sondar()
+    with _lock:
+        _resultados[nome] = (agora, resultado)
+    return resultado
+
+
+def limpar_sondagens():
+    """
+    Descarta os resultados guardados (usado nos testes)
+    """
+    global _migracoes_aplicadas
+    with _lock:
+        _resultados.clear()
+        _migracoes_aplicadas = False
+
+
+def sondar_banco():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception as e:
+        return {'ok': False, 'erro': str(e)}
+    return {'ok': True}
+
+
+def sondar_cache():
+    # Chave única por sondagem: workers concorrentes não leem o valor um do outro
+    chave = f'saude:{uuid.uuid4().hex}'
+    try:
+        cache.set(chave, 1, 10)
+        lido = cache.get(chave)
+        cache.delete(chave)
+    except Exception as e:
+        return {'ok': False, 'erro': str(e)}
+    if lido != 1:
+        return {'ok': False, 'erro': 'valor gravado não foi lido de volta'}
+    return {'ok': True}
+
+
+def sondar_migracoes():
+    global _migracoes_aplicadas
+    if _migracoes_aplicadas:
+        return {'ok': True}
+    try:
+        executor = MigrationExecutor(connection)
+        pendentes = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    except Exception as e:
+        return {'ok': False, 'erro': str(e)}
+    if pendentes:
+        return {'ok': False, 'pendentes': len(pendentes)}
+    _migracoes_aplicadas = True
+    return {'ok': True}
+
+
+def _sondar_prontidao():
+    verificacoes = {
+        'banco': sondar_banco(),
+        'cache': sondar_cache(),
+        'migracoes': sondar_migracoes(),
+    }
+    return all(v['ok'] for v in verificacoes.values()), verificacoes
+
+
+def prontidao():
+    """
+    (pronto, verificacoes): banco acessível, cache compartilhado respondendo e
+    nenhuma migração pendente
+    """
+    return _reaproveitar('prontidao', _sondar_prontidao)
+
+
+def _sondar_dependencias():
+    servicos = {}
+    for nome in SERVICOS_EXTERNOS:
+        try:
+            servicos[nome] = obter_disjuntor(nome).resumo()
+        except Exception as e:
+            servicos[nome] = {'estado': 'desconhecido', 'erro': str(e)}
+    return servicos
+
+
+def dependencias():
+    """
+    Estado do disjuntor de cada API externa (ReceitaWS, ViaCEP, IBGE)
+    """
+    return _reaproveitar('dependencias', _sondar_dependencias)
+
+
+def dependencias_ok(servicos):
+    return all(s['estado'] == FECHADO for s in servicos.values())
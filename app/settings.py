@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,10 +46,17 @@ INSTALLED_APPS = [
     'usuario',
     'cliente',
     'empresa',
+    'fila',
+    'simulador',
+    'auditoria',
+    # Projeto registrado como app para os comandos de gerenciamento gerais (app/management)
+    'app',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Antes dos demais para comprimir a resposta final
+    'app.middleware.CompressaoMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -124,6 +134,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Arquivos enviados (logo da empresa e suas versões redimensionadas)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -141,5 +155,99 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
-}
\ No newline at end of file
+    'PAGE_SIZE': 10,
+    # JSON com orjson; a API navegável e os uploads (multipart) continuam disponíveis
+    'DEFAULT_RENDERER_CLASSES': (
+        'app.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'app.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Limites de taxa (app/limites.py): geral por usuário e por escopo de
+    # endpoint. Taxa vazia na variável de ambiente desliga o escopo.
+    'DEFAULT_THROTTLE_CLASSES': (
+        'app.limites.LimiteUsuario',
+        'app.limites.LimiteEndpoint',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'usuario': os.environ.get('LIMITE_USUARIO', '2000/min') or None,
+        'consulta': os.environ.get('LIMITE_CONSULTA', '60/min') or None,
+        'login': os.environ.get('LIMITE_LOGIN', '20/min') or None,
+        'listagem': os.environ.get('LIMITE_LISTAGEM', '600/min') or None,
+        'escrita': os.environ.get('LIMITE_ESCRITA', '300/min') or None,
+    },
+}
+
+# O token JWT leva a organização do usuário (empresa/organizacao.py), que as
+# views leem sem consultar o banco
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'usuario.serializers.TokenOrganizacaoSerializer',
+}
+ORGANIZACAO_CLAIM = 'organizacao'
+
+# Compressão das respostas (app/middleware.py): abaixo deste tamanho em bytes
+# a resposta é enviada sem compressão. Brotli é usado se o pacote estiver instalado.
+COMPRESSAO_TAMANHO_MINIMO = int(os.environ.get('COMPRESSAO_TAMANHO_MINIMO', 1024))
+COMPRESSAO_QUALIDADE_BROTLI = 5
+
+# Cache compartilhado entre os workers (L2 de app/cache.py, respostas de clientes e
+# contadores dos limites de taxa). Sem REDIS_URL usa a memória do processo, que só
+# serve com um worker: com vários, cada um teria sua geração das respostas em cache
+# (e serviria dados antigos) e seus próprios contadores de limite. Fora do DEBUG é
+# preciso configurar REDIS_URL ou declarar CACHE_LOCAL_PERMITIDO=1 (um único worker).
+if not DEBUG and not os.environ.get('REDIS_URL') and os.environ.get('CACHE_LOCAL_PERMITIDO') != '1':
+    raise ImproperlyConfigured(
+        'Defina REDIS_URL (cache compartilhado entre os workers) ou CACHE_LOCAL_PERMITIDO=1 '
+        'se a aplicação roda em um único worker.'
+    )
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Cache em memória de cada worker (L1): itens por namespace e intervalo (segundos)
+# entre verificações da versão no L2, que limita o atraso da invalidação entre workers
+CACHE_LOCAL_TAMANHO = 256
+CACHE_LOCAL_INTERVALO_VERSAO = float(os.environ.get('CACHE_LOCAL_INTERVALO_VERSAO', 1))
+# Tempo (segundos) de cache das consultas a CNPJ, CEP e IBGE
+CACHE_CONSULTAS_TIMEOUT = int(os.environ.get('CACHE_CONSULTAS_TIMEOUT', 86400))
+
+# Executa app/aquecimento.py ao carregar o WSGI/ASGI de cada worker
+AQUECIMENTO_NA_INICIALIZACAO = os.environ.get('AQUECIMENTO_NA_INICIALIZACAO', '1') == '1'
+
+# URLs base das APIs externas consultadas pelos services (configuráveis para
+# apontar para o servidor de testes/benchmark)
+RECEITAWS_URL = os.environ.get('RECEITAWS_URL', 'https://www.receitaws.com.br/v1')
+VIACEP_URL = os.environ.get('VIACEP_URL', 'https://viacep.com.br/ws')
+IBGE_URL = os.environ.get('IBGE_URL', 'https://servicodados.ibge.gov.br/api/v1')
+# Tempo máximo (segundos) de cada chamada às APIs externas
+APIS_EXTERNAS_TIMEOUT = float(os.environ.get('APIS_EXTERNAS_TIMEOUT', 10))
+# Disjuntores das APIs externas (app/disjuntor.py): falhas seguidas até abrir
+# e segundos aberto antes de tentar de novo
+DISJUNTOR_LIMITE_FALHAS = int(os.environ.get('DISJUNTOR_LIMITE_FALHAS', 5))
+DISJUNTOR_TEMPO_ABERTO = float(os.environ.get('DISJUNTOR_TEMPO_ABERTO', 30))
+
+# Sincronização de clientes (cliente/sincronizacao.py): alterações mais recentes que
+# isso (segundos) esperam a próxima leitura do feed. Deve passar da duração da maior
+# transação que grava clientes, para o token não pular ids confirmados fora de ordem.
+SINCRONIZACAO_ATRASO = float(os.environ.get('SINCRONIZACAO_ATRASO', 5))
+
+# Segundos em que o resultado das sondagens de /health/ é reaproveitado
+SAUDE_CACHE_SEGUNDOS = float(os.environ.get('SAUDE_CACHE_SEGUNDOS', 5))
+
+# Auditoria: registros são acumulados em memória e gravados em lote ao fim de
+# cada requisição ou após este intervalo (segundos) / tamanho de buffer
+AUDITORIA_INTERVALO_DESCARGA = 5
+AUDITORIA_TAMANHO_MAXIMO_BUFFER = 500
@@ -0,0 +1,347 @@
+import json
+import time
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.throttling import SimpleRateThrottle
+
+from empresa.configuracao import obter_configuracao
+from simulador.servidor import SimuladorUpstream
+from .aquecimento import ETAPAS, aquecer
+from .cache import AUSENTE, CacheDuasCamadas, limpar_caches
+from .disjuntor import ABERTO, FECHADO, MEIO_ABERTO, Disjuntor, ServicoIndisponivel, obter_disjuntor
+from .importacao import analisar_importtime
+from .saude import limpar_sondagens
+
+SAIDA_IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     PIL._version
+import time:      2054 |       2174 |   PIL.Image
+import time:       938 |       3112 | empresa.services.logo_service
+"""
+
+
+class AquecimentoTestCase(TestCase):
+    """Testes para o aquecimento do worker antes de receber requisições"""
+    
+    def test_aquecer_executa_todas_as_etapas(self):
+        """Teste para executar as etapas e deixar caches prontos para a primeira requisição"""
+        ContentType.objects.clear_cache()
+        duracoes = aquecer()
+        self.assertEqual(list(duracoes), [nome for nome, _ in ETAPAS])
+        
+        with self.assertNumQueries(0):
+            obter_configuracao()
+            ContentType.objects.get_for_model(ContentType)
+    
+    def test_aquecer_fecha_conexoes(self):
+        """Teste para fechar as conexões ao final, sem herdá-las em workers criados por fork"""
+        with patch('app.aquecimento.connections.close_all') as mock_fechar:
+            aquecer()
+        mock_fechar.assert_called_once_with()
+
+    def test_comando_aquecer(self):
+        """Teste para mostrar a duração das etapas pelo comando de gerenciamento"""
+        saida = StringIO()
+        call_command('aquecer', stdout=saida)
+        self.assertIn('localidades', saida.getvalue())
+
+
+class RelatorioImportacaoTestCase(TestCase):
+    """Testes para o relatório de tempo de importação"""
+    
+    def test_analisar_importtime(self):
+        """Teste para interpretar a saída de python -X importtime"""
+        importacoes = analisar_importtime(SAIDA_IMPORTTIME)
+        self.assertEqual([i.modulo for i in importacoes], ['PIL._version', 'PIL.Image', 'empresa.services.logo_service'])
+        self.assertEqual(importacoes[1].acumulado_ms, 2.174)
+        self.assertEqual(importacoes[1].pacote, 'PIL')
+        self.assertEqual(importacoes[2].nivel, 0)
+    
+    def test_relatorio_sem_importacoes_tardias(self):
+        """Teste para gerar o relatório e garantir que o Pillow não é importado na inicialização"""
+        saida = StringIO()
+        call_command('relatorio_importacao', '--json', '--top', '1000', '--minimo-ms', '0', stdout=saida)
+        relatorio = json.loads(saida.getvalue())
+        
+        self.assertGreater(relatorio['inicializacao_s'], 0)
+        modulos = {item['modulo'] for item in relatorio['mais_caras']}
+        self.assertIn('empresa.services.logo_service', modulos)
+        self.assertNotIn('PIL.Image', modulos)
+
+
+@override_settings(CACHE_LOCAL_INTERVALO_VERSAO=0)
+class CacheDuasCamadasTestCase(APITestCase):
+    """Testes para o cache em duas camadas (L1 do processo e L2 compartilhado)"""
+    
+    def setUp(self):
+        self.camadas = CacheDuasCamadas('teste', timeout=60, tamanho_local=2)
+        self.camadas.invalidar()
+        self.camadas.metricas.clear()
+    
+    def test_acertos_por_camada(self):
+        """Teste para calcular uma vez e servir as leituras seguintes do L1"""
+        chamadas = []
+        calcular = lambda: chamadas.append(1) or {'valor': 1}
+        self.assertEqual(self.camadas.obter('a', calcular), {'valor': 1})
+        self.assertEqual(self.camadas.obter('a', calcular), {'valor': 1})
+        self.assertEqual(len(chamadas), 1)
+        
+        # Outro worker (L1 vazio) encontra o valor no L2
+        outro_worker = CacheDuasCamadas('teste', timeout=60)
+        self.assertEqual(outro_worker.obter('a', calcular), {'valor': 1})
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(outro_worker.metricas['l2_acertos'], 1)
+        
+        metricas = self.camadas.resumo_metricas()
+        self.assertEqual((metricas['l1_acertos'], metricas['l1_falhas'], metricas['l2_falhas']), (1, 1, 1))
+        self.assertEqual(metricas['l1_taxa_acerto'], 0.5)
+    
+    def test_invalidacao_entre_workers(self):
+        """Teste para descartar o L1 dos demais workers quando a versão muda"""
+        outro_worker = CacheDuasCamadas('teste', timeout=60)
+        self.camadas.guardar('a', 1)
+        self.assertEqual(outro_worker.buscar('a'), 1)
+        
+        self.camadas.invalidar()
+        self.assertIs(outro_worker.buscar('a'), AUSENTE)
+        self.assertIs(self.camadas.buscar('a'), AUSENTE)
+    
+    def test_valor_calculado_antes_da_invalidacao_nao_e_guardado(self):
+        """Teste para não guardar na nova versão um valor lido antes de uma invalidação"""
+        outro_worker = CacheDuasCamadas('teste', timeout=60, intervalo_versao=0)
+
+        def calcular():
+            # Outro worker grava e invalida enquanto este ainda calcula com dados antigos
+            outro_worker.invalidar()
+            return 'antigo'
+
+        self.camadas.intervalo_versao = 0
+        self.assertEqual(self.camadas.obter('k', calcular), 'antigo')
+        self.assertIs(self.camadas.buscar('k'), AUSENTE)
+        self.assertIs(outro_worker.buscar('k'), AUSENTE)
+        self.assertEqual(self.camadas.obter('k', lambda: 'novo'), 'novo')
+
+    def test_lru_limita_itens_locais(self):
+        """Teste para descartar do L1 o item menos usado ao atingir o tamanho máximo"""
+        for chave in ('a', 'b', 'c'):
+            self.camadas.guardar(chave, chave)
+        self.assertEqual(list(self.camadas._local), ['b', 'c'])
+        # O item descartado do L1 continua no L2
+        self.assertEqual(self.camadas.buscar('a'), 'a')
+    
+    def test_endpoint_de_metricas(self):
+        """Teste para expor as métricas apenas para usuários staff"""
+        self.client.force_authenticate(user=User.objects.create_user(username='comum', password='x'))
+        self.assertEqual(self.client.get('/cache/metricas/').status_code, status.HTTP_403_FORBIDDEN)
+        
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', is_staff=True))
+        self.camadas.obter('a', lambda: 1)
+        response = self.client.get('/cache/metricas/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['teste']['l2_falhas'], 1)
+
+
+
+def resposta_http(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+class DisjuntorTestCase(APITestCase):
+    """Testes para os disjuntores das APIs externas"""
+
+    def setUp(self):
+        cache.clear()
+        self.disjuntor = Disjuntor('teste', limite_falhas=2, tempo_aberto=30)
+        self.chamada = MagicMock(side_effect=requests.ConnectionError('fora do ar'))
+
+    def test_abre_apos_falhas_seguidas_e_recusa_sem_chamar(self):
+        """Teste para abrir após o limite de falhas e recusar chamadas sem acionar o serviço"""
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.disjuntor.chamar(self.chamada, 'url')
+        self.assertEqual(self.disjuntor.estado(), ABERTO)
+
+        with self.assertRaises(ServicoIndisponivel):
+            self.disjuntor.chamar(self.chamada, 'url')
+        self.assertEqual(self.chamada.call_count, 2)
+
+    def test_respostas_5xx_contam_como_falha_e_4xx_nao(self):
+        """Teste para contar 5xx como falha e tratar 404 como resposta normal"""
+        self.disjuntor.chamar(MagicMock(return_value=resposta_http(503)), 'url')
+        self.assertEqual(self.disjuntor.resumo()['falhas_seguidas'], 1)
+        self.disjuntor.chamar(MagicMock(return_value=resposta_http(404)), 'url')
+        self.assertEqual(self.disjuntor.resumo()['falhas_seguidas'], 0)
+
+    def test_chamar_json_trata_indisponibilidade_como_falha(self):
+        """Teste para 5xx/429 e corpo sem JSON levantarem ServicoIndisponivel e contarem como falha"""
+        resposta = resposta_http(503)
+        resposta.json.return_value = {'status': 'ERROR', 'message': 'Serviço indisponível'}
+        with self.assertRaises(ServicoIndisponivel):
+            self.disjuntor.chamar_json(MagicMock(return_value=resposta), 'url')
+        self.assertEqual(self.disjuntor.resumo()['falhas_seguidas'], 1)
+
+        resposta = resposta_http(200)
+        resposta.json.side_effect = requests.JSONDecodeError('Expecting value', '<html>', 0)
+        with self.assertRaises(ServicoIndisponivel):
+            self.disjuntor.chamar_json(MagicMock(return_value=resposta), 'url')
+        self.assertEqual(self.disjuntor.estado(), ABERTO)
+
+    def test_chamar_json_recusa_4xx_sem_json_sem_contar_falha(self):
+        """Teste para um 4xx sem JSON virar ValueError com o serviço considerado no ar"""
+        resposta = resposta_http(400)
+        resposta.json.side_effect = requests.JSONDecodeError('Expecting value', '<html>', 0)
+        with self.assertRaises(ValueError) as contexto:
+            self.disjuntor.chamar_json(MagicMock(return_value=resposta), 'url')
+        self.assertNotIsInstance(contexto.exception, ServicoIndisponivel)
+        self.assertEqual(self.disjuntor.resumo()['falhas_seguidas'], 0)
+
+    def test_meio_aberto_fecha_com_sucesso_ou_reabre_com_falha(self):
+        """Teste para a chamada de teste após o tempo aberto decidir o estado do disjuntor"""
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                self.disjuntor.chamar(self.chamada, 'url')
+
+        depois = time.time() + 31
+        with patch('app.disjuntor.time.time', return_value=depois):
+            self.assertEqual(self.disjuntor.estado(), MEIO_ABERTO)
+            with self.assertRaises(requests.ConnectionError):
+                self.disjuntor.chamar(self.chamada, 'url')
+            self.assertEqual(self.disjuntor.estado(), ABERTO)
+
+        with patch('app.disjuntor.time.time', return_value=depois + 31):
+            self.disjuntor.chamar(MagicMock(return_value=resposta_http(200)), 'url')
+            self.assertEqual(self.disjuntor.estado(), FECHADO)
+
+    def test_consulta_responde_503_com_disjuntor_aberto(self):
+        """Teste para a consulta de CEP responder 503 sem chamar a ViaCEP com o disjuntor aberto"""
+        self.client.force_authenticate(user=User.objects.create_user(username='teste', password='x'))
+        disjuntor = obter_disjuntor('viacep')
+        for _ in range(disjuntor.limite_falhas):
+            disjuntor.registrar_falha()
+
+        with patch('cliente.services.cep_service.requests.get') as mock_get:
+            response = self.client.get('/cliente/consulta/cep/01001000/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        mock_get.assert_not_called()
+
+
+    def test_consulta_cnpj_responde_503_com_receitaws_fora_do_ar(self):
+        """Teste para a consulta de CNPJ responder 503 quando a ReceitaWS responde 503"""
+        limpar_caches()
+        self.client.force_authenticate(user=User.objects.create_user(username='teste', password='x'))
+        with SimuladorUpstream(taxa_erro=1.0) as simulador, override_settings(**simulador.urls):
+            response = self.client.get('/cliente/consulta/cnpj/11222333000181/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(obter_disjuntor('receitaws').resumo()['falhas_seguidas'], 1)
+
+
+class SaudeTestCase(APITestCase):
+    """Testes para as sondagens de saúde /health/"""
+
+    def setUp(self):
+        cache.clear()
+        limpar_sondagens()
+
+    def test_live_nao_consulta_nada(self):
+        """Teste para responder liveness sem autenticação e sem consultas"""
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/live')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'ok')
+
+    def test_ready_verifica_e_reaproveita_resultado(self):
+        """Teste para verificar banco, cache e migrações e reaproveitar o resultado"""
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['verificacoes']), {'banco', 'cache', 'migracoes'})
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/health/ready/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_ready_503_com_migracoes_pendentes(self):
+        """Teste para responder 503 enquanto houver migrações pendentes"""
+        with patch('app.saude.MigrationExecutor.migration_plan', return_value=[('migracao', False)]):
+            response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data['verificacoes']['migracoes'], {'ok': False, 'pendentes': 1})
+
+    def test_deps_mostra_disjuntores(self):
+        """Teste para mostrar o estado dos disjuntores da ReceitaWS, ViaCEP e IBGE"""
+        disjuntor = obter_disjuntor('ibge')
+        for _ in range(disjuntor.limite_falhas):
+            disjuntor.registrar_falha()
+
+        response = self.client.get('/health/deps')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'degradado')
+        self.assertEqual(set(response.data['servicos']), {'receitaws', 'viacep', 'ibge'})
+        self.assertEqual(response.data['servicos']['ibge']['estado'], ABERTO)
+        self.assertEqual(response.data['servicos']['viacep']['estado'], FECHADO)
+
+
+TAXAS_TESTE = {'usuario': '100/min', 'consulta': '2/min', 'login': '1/min', 'listagem': '2/min', 'escrita': None}
+
+
+@patch.object(SimpleRateThrottle, 'THROTTLE_RATES', TAXAS_TESTE)
+class LimiteTaxaTestCase(APITestCase):
+    """Testes para os limites de taxa por usuário e por endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.usuario = User.objects.create_user(username='teste', password='senha-teste')
+        self.client.force_authenticate(user=self.usuario)
+
+    @patch('cliente.views.consultar_cep', return_value={'cidade': 'São Paulo'})
+    def test_consulta_responde_429_com_retry_after(self, mock_consultar):
+        """Teste para responder 429 com Retry-After ao exceder o limite de consultas"""
+        for cep in ('01001000', '01001001'):
+            self.assertEqual(self.client.get(f'/cliente/consulta/cep/{cep}/').status_code, status.HTTP_200_OK)
+
+        response = self.client.get('/cliente/consulta/cep/01001002/')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+        self.assertEqual(mock_consultar.call_count, 2)
+
+    @patch('cliente.views.consultar_cep', return_value={'cidade': 'São Paulo'})
+    def test_limite_contado_por_usuario(self, mock_consultar):
+        """Teste para contar o limite de cada usuário separadamente"""
+        for _ in range(3):
+            self.client.get('/cliente/consulta/cep/01001000/')
+
+        self.client.force_authenticate(user=User.objects.create_user(username='outro', password='x'))
+        self.assertEqual(self.client.get('/cliente/consulta/cep/01001000/').status_code, status.HTTP_200_OK)
+
+    def test_listagem_limitada_e_detalhe_nao(self):
+        """Teste para limitar a listagem sem contar as leituras de detalhe no mesmo escopo"""
+        self.usuario.is_staff = True
+        self.usuario.save()
+        for _ in range(2):
+            self.assertEqual(self.client.get('/usuario/users/').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get('/usuario/users/').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get(f'/usuario/users/{self.usuario.pk}/').status_code, status.HTTP_200_OK)
+
+    def test_login_limitado_por_ip(self):
+        """Teste para limitar as tentativas de login em /token/"""
+        self.client.force_authenticate(user=None)
+        dados = {'username': 'teste', 'password': 'errada'}
+        self.assertEqual(self.client.post('/token/', dados).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post('/token/', dados)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_sondagens_de_saude_nao_sao_limitadas(self):
+        """Teste para as sondagens de saúde ficarem fora dos limites de taxa"""
+        with patch.dict(TAXAS_TESTE, usuario='1/min'):
+            for _ in range(3):
+                self.assertEqual(self.client.get('/health/live').status_code, status.HTTP_200_OK)
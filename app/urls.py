@@ -14,11 +14,13 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.urls import path, include
+from django.conf import settings
+from django.conf.urls.static import static
+from django.urls import path, re_path, include
 from django.contrib import admin
-from usuario.views import UserProfileView
+from usuario.views import TokenLoginView, UserProfileView
+from .views import MetricasCacheView, SaudeVivoView, SaudeProntoView, SaudeDependenciasView
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
@@ -27,7 +29,7 @@ from rest_framework_simplejwt.views import (
 urlpatterns = [
     path('admin/', admin.site.urls),
     # Obtendo token para o usuario
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/', TokenLoginView.as_view(), name='token_obtain_pair'),
     # Obtendo refresh token para o usuario
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     # Verificando se o token é valido
@@ -40,4 +42,13 @@ urlpatterns = [
     path('cliente/', include('cliente.urls')),
     #chamando a rota de urls de empresa
     path('empresa/', include('empresa.urls')),
+    # Métricas do cache em duas camadas (somente staff)
+    path('cache/metricas/', MetricasCacheView.as_view(), name='cache-metricas'),
+    # Sondagens de saúde (sem autenticação), com ou sem barra final
+    re_path(r'^health/live/?$', SaudeVivoView.as_view(), name='health-live'),
+    re_path(r'^health/ready/?$', SaudeProntoView.as_view(), name='health-ready'),
+    re_path(r'^health/deps/?$', SaudeDependenciasView.as_view(), name='health-deps'),
 ]
+
+# Servir arquivos enviados (logos) em desenvolvimento
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
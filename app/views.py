@@ -0,0 +1,66 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from usuario.permissions import IsStaffUser
+from .cache import obter_metricas
+from .saude import dependencias, dependencias_ok, prontidao
+
+
+class MetricasCacheView(APIView):
+    """
+    Acertos e falhas de cada camada (L1 do processo e L2 compartilhado) por
+    namespace de cache. Os contadores são do worker que atendeu a requisição.
+    """
+    permission_classes = [IsAuthenticated, IsStaffUser]
+
+    def get(self, request):
+        return Response(obter_metricas())
+
+
+class SaudeView(APIView):
+    """
+    Base das sondagens de saúde: sem autenticação (nenhum token a validar) e
+    fora dos limites de taxa, para serem baratas e sempre respondidas.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = []
+
+
+class SaudeVivoView(SaudeView):
+    """
+    Liveness: o processo está de pé e atende requisições. Não consulta nada.
+    """
+
+    def get(self, request):
+        return Response({'status': 'ok'})
+
+
+class SaudeProntoView(SaudeView):
+    """
+    Readiness: banco, cache e migrações. Responde 503 enquanto a instância não
+    deve receber tráfego.
+    """
+
+    def get(self, request):
+        pronto, verificacoes = prontidao()
+        return Response(
+            {'status': 'ok' if pronto else 'indisponivel', 'verificacoes': verificacoes},
+            status=status.HTTP_200_OK if pronto else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
+class SaudeDependenciasView(SaudeView):
+    """
+    Estado dos disjuntores das APIs externas. Sempre 200: uma API externa fora
+    do ar degrada as consultas mas não tira a instância do balanceador.
+    """
+
+    def get(self, request):
+        servicos = dependencias()
+        return Response({
+            'status': 'ok' if dependencias_ok(servicos) else 'degradado',
+            'servicos': servicos,
+        })
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_wsgi_application()
+
+# Aquece URLs, caches e catálogo de permissões antes do worker aceitar requisições
+from django.conf import settings  # noqa: E402
+
+if settings.AQUECIMENTO_NA_INICIALIZACAO:
+    from app.aquecimento import aquecer
+
+    aquecer()
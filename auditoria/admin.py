@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import RegistroAuditoria
+
+
+@admin.register(RegistroAuditoria)
+class RegistroAuditoriaAdmin(admin.ModelAdmin):
+    list_display = ['data', 'modelo', 'objeto_id', 'acao', 'campo', 'usuario']
+    list_filter = ['acao', 'modelo', 'mes']
+    search_fields = ['objeto_id', 'campo']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,70 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class BufferAuditoria:
+    """
+    Acumula registros de auditoria em memória e grava em lote (bulk_create),
+    ao fim de cada requisição ou a cada intervalo, o que vier primeiro
+    """
+
+    def __init__(self):
+        self._registros = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def intervalo(self):
+        return getattr(settings, 'AUDITORIA_INTERVALO_DESCARGA', 5)
+
+    @property
+    def tamanho_maximo(self):
+        return getattr(settings, 'AUDITORIA_TAMANHO_MAXIMO_BUFFER', 500)
+
+    def adicionar(self, registros):
+        with self._lock:
+            self._registros.extend(registros)
+            cheio = len(self._registros) >= self.tamanho_maximo
+            if not cheio and self._timer is None:
+                self._timer = threading.Timer(self.intervalo, self._descarregar_em_segundo_plano)
+                self._timer.daemon = True
+                self._timer.start()
+        if cheio:
+            self.descarregar()
+
+    def pendentes(self):
+        return len(self._registros)
+
+    def descarregar(self):
+        """
+        Grava os registros acumulados e retorna a quantidade gravada
+        """
+        from .models import RegistroAuditoria
+
+        with self._lock:
+            registros, self._registros = self._registros, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if registros:
+            try:
+                RegistroAuditoria.objects.bulk_create(registros, batch_size=self.tamanho_maximo)
+            except Exception:
+                logger.exception("Erro ao gravar %s registro(s) de auditoria", len(registros))
+        return len(registros)
+
+    def _descarregar_em_segundo_plano(self):
+        try:
+            self.descarregar()
+        finally:
+            connection.close()
+
+
+buffer_auditoria = BufferAuditoria()
+atexit.register(buffer_auditoria.descarregar)
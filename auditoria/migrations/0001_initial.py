@@ -0,0 +1,38 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroAuditoria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.PositiveIntegerField()),
+                ('data', models.DateTimeField()),
+                ('modelo', models.CharField(max_length=100)),
+                ('objeto_id', models.CharField(max_length=64)),
+                ('acao', models.CharField(choices=[('criacao', 'Criação'), ('alteracao', 'Alteração'), ('exclusao', 'Exclusão')], max_length=10)),
+                ('campo', models.CharField(blank=True, default='', max_length=100)),
+                ('valor_anterior', models.JSONField(blank=True, null=True)),
+                ('valor_novo', models.JSONField(blank=True, null=True)),
+                ('usuario', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='registros_auditoria', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Registro de Auditoria',
+                'verbose_name_plural': 'Registros de Auditoria',
+                'db_table': 'auditoria_registros',
+                'indexes': [models.Index(fields=['mes'], name='auditoria_mes_idx'), models.Index(fields=['modelo', 'objeto_id', 'data'], name='auditoria_objeto_data_idx')],
+            },
+        ),
+    ]
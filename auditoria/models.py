@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class RegistroAuditoria(models.Model):
+    """
+    Alteração de um campo feita pela API. A tabela é somente de inserção e
+    particionada logicamente por mês (`mes` no formato AAAAMM), o que permite
+    arquivar ou remover meses antigos com uma consulta por índice.
+    """
+
+    CRIACAO = 'criacao'
+    ALTERACAO = 'alteracao'
+    EXCLUSAO = 'exclusao'
+    ACAO_CHOICES = [
+        (CRIACAO, 'Criação'),
+        (ALTERACAO, 'Alteração'),
+        (EXCLUSAO, 'Exclusão'),
+    ]
+
+    mes = models.PositiveIntegerField()
+    data = models.DateTimeField()
+    modelo = models.CharField(max_length=100)  # ex.: cliente.cliente
+    objeto_id = models.CharField(max_length=64)
+    acao = models.CharField(max_length=10, choices=ACAO_CHOICES)
+    campo = models.CharField(max_length=100, blank=True, default='')
+    valor_anterior = models.JSONField(null=True, blank=True)
+    valor_novo = models.JSONField(null=True, blank=True)
+    usuario = models.ForeignKey(
+        User,
+        related_name='registros_auditoria',
+        on_delete=models.SET_NULL,
+        null=True,
+        db_constraint=False,
+    )
+
+    def __str__(self):
+        return f"{self.modelo}#{self.objeto_id} {self.acao} {self.campo}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Registros de auditoria não podem ser alterados")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Registros de auditoria não podem ser removidos")
+
+    class Meta:
+        verbose_name = "Registro de Auditoria"
+        verbose_name_plural = "Registros de Auditoria"
+        db_table = 'auditoria_registros'
+        indexes = [
+            models.Index(fields=['mes'], name='auditoria_mes_idx'),
+            models.Index(fields=['modelo', 'objeto_id', 'data'], name='auditoria_objeto_data_idx'),
+        ]
@@ -0,0 +1,85 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .buffer import buffer_auditoria
+from .models import RegistroAuditoria
+
+# Campos que não geram registro por mudarem em toda gravação
+CAMPOS_IGNORADOS = {'data_atualizacao', 'atualizado_por_id', 'versao'}
+
+
+def _normalizar(valor):
+    # Converte datas, Decimals e arquivos em valores aceitos pelo JSONField
+    if hasattr(valor, 'name') and not isinstance(valor, str):
+        valor = valor.name or None
+    return json.loads(json.dumps(valor, cls=DjangoJSONEncoder))
+
+
+def capturar_estado(instancia):
+    """
+    Retorna os valores atuais dos campos concretos da instância
+    """
+    if instancia is None:
+        return {}
+    return {
+        campo.attname: _normalizar(getattr(instancia, campo.attname))
+        for campo in instancia._meta.concrete_fields
+        if campo.attname not in CAMPOS_IGNORADOS
+    }
+
+
+def _montar_registros(modelo, objeto_id, antes, depois, usuario, acao, agora):
+    base = {
+        'mes': agora.year * 100 + agora.month,
+        'data': agora,
+        'modelo': modelo,
+        'objeto_id': str(objeto_id),
+        'acao': acao,
+        'usuario_id': getattr(usuario, 'pk', None),
+    }
+    if acao == RegistroAuditoria.EXCLUSAO:
+        return [RegistroAuditoria(valor_anterior=antes, **base)]
+    return [
+        RegistroAuditoria(campo=campo, valor_anterior=antes.get(campo), valor_novo=valor, **base)
+        for campo, valor in depois.items()
+        if campo != 'id' and antes.get(campo) != valor
+    ]
+
+
+def _enfileirar_registros(registros):
+    if registros:
+        transaction.on_commit(lambda: buffer_auditoria.adicionar(registros))
+    return registros
+
+
+def registrar_alteracoes(instancia, antes, usuario, acao=RegistroAuditoria.ALTERACAO):
+    """
+    Compara o estado anterior com o atual e enfileira um registro por campo
+    alterado. Os registros só entram no buffer após o commit da transação.
+    """
+    depois = capturar_estado(instancia) if acao != RegistroAuditoria.EXCLUSAO else {}
+    registros = _montar_registros(
+        instancia._meta.label_lower, antes.get('id') or instancia.pk,
+        antes, depois, usuario, acao, timezone.now(),
+    )
+    return _enfileirar_registros(registros)
+
+
+def registrar_alteracoes_em_lote(modelo, alteracoes, usuario, acao=RegistroAuditoria.ALTERACAO):
+    """
+    Versão em lote de `registrar_alteracoes` para gravações feitas com
+    UPDATE/DELETE em massa, sem instâncias carregadas.
+    `alteracoes` é uma lista de (objeto_id, antes, depois) com valores por attname.
+    """
+    agora = timezone.now()
+    registros = []
+    for objeto_id, antes, depois in alteracoes:
+        antes = {campo: _normalizar(valor) for campo, valor in antes.items() if campo not in CAMPOS_IGNORADOS}
+        depois = {campo: _normalizar(valor) for campo, valor in depois.items() if campo not in CAMPOS_IGNORADOS}
+        registros.extend(_montar_registros(
+            modelo._meta.label_lower, objeto_id, antes, depois, usuario, acao, agora
+        ))
+    return _enfileirar_registros(registros)
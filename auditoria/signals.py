@@ -0,0 +1,11 @@
+from django.core.signals import request_finished
+from django.dispatch import receiver
+
+from .buffer import buffer_auditoria
+
+
+@receiver(request_finished)
+def descarregar_auditoria(sender, **kwargs):
+    """Grava os registros da requisição depois que a resposta foi enviada"""
+    if buffer_auditoria.pendentes():
+        buffer_auditoria.descarregar()
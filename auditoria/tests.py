@@ -0,0 +1,102 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from cliente.models import Cliente
+from .buffer import buffer_auditoria
+from .models import RegistroAuditoria
+
+
+@override_settings(AUDITORIA_INTERVALO_DESCARGA=3600)
+class AuditoriaTestCase(APITestCase):
+    """Testes para o registro de alterações feitas pela API"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.cliente = Cliente.objects.create(
+            cnpj="11.222.333/0001-81",
+            razao_social="Empresa Teste LTDA",
+            nome_fantasia="Empresa Teste",
+            endereco="Rua Teste, 123",
+            cep="01234-567",
+            cidade_id=3550308,
+            cidade_nome="São Paulo",
+            estado_id=35,
+            estado_sigla="SP",
+            responsavel_cpf="529.982.247-25",
+            responsavel_rg="12.345.678-9",
+            responsavel_nome="João da Silva",
+            responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado",
+            responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+        self.url = f'/cliente/clientes/{self.cliente.id}/'
+    
+    def tearDown(self):
+        buffer_auditoria.descarregar()
+    
+    def test_alteracao_registrada_por_campo(self):
+        """Teste para registrar valor anterior e novo de cada campo alterado"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, {'email_financeiro': 'novo@empresa.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.assertEqual(buffer_auditoria.descarregar(), 1)
+        registro = RegistroAuditoria.objects.get()
+        self.assertEqual(registro.modelo, 'cliente.cliente')
+        self.assertEqual(registro.objeto_id, str(self.cliente.id))
+        self.assertEqual(registro.campo, 'email_financeiro')
+        self.assertEqual(registro.valor_anterior, 'financeiro@empresa.com')
+        self.assertEqual(registro.valor_novo, 'novo@empresa.com')
+        self.assertEqual(registro.usuario, self.user)
+    
+    def test_gravacao_em_lote(self):
+        """Teste para gravar os registros acumulados com uma única consulta"""
+        with self.captureOnCommitCallbacks(execute=True):
+            for email in ('a@empresa.com', 'b@empresa.com', 'c@empresa.com'):
+                self.client.patch(self.url, {'email_financeiro': email}, format='json')
+        
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer_auditoria.descarregar(), 3)
+    
+    def test_exclusao_registrada(self):
+        """Teste para registrar a exclusão com o estado anterior do cliente"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(self.url)
+        buffer_auditoria.descarregar()
+        
+        registro = RegistroAuditoria.objects.get(acao=RegistroAuditoria.EXCLUSAO)
+        self.assertEqual(registro.valor_anterior['cnpj'], "11.222.333/0001-81")
+    
+    def test_alteracao_em_lote_registrada(self):
+        """Teste para registrar as alterações feitas pelo endpoint de lote"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                '/cliente/clientes/lote/',
+                {'ids': [self.cliente.id], 'dados': {'email_financeiro': 'lote@empresa.com'}},
+                format='json'
+            )
+        buffer_auditoria.descarregar()
+        
+        registro = RegistroAuditoria.objects.get()
+        self.assertEqual(registro.campo, 'email_financeiro')
+        self.assertEqual(registro.valor_anterior, 'financeiro@empresa.com')
+        self.assertEqual(registro.valor_novo, 'lote@empresa.com')
+        self.assertEqual(registro.usuario, self.user)
+    
+    def test_somente_insercao(self):
+        """Teste para impedir alteração e remoção de registros de auditoria"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {'nome_fantasia': 'Outro'}, format='json')
+        buffer_auditoria.descarregar()
+        
+        registro = RegistroAuditoria.objects.get()
+        with self.assertRaises(ValueError):
+            registro.save()
+        with self.assertRaises(ValueError):
+            registro.delete()
@@ -0,0 +1,99 @@
+"""
+Microbenchmarks dos principais endpoints da API, executados pelo cliente de
+testes do DRF (sem rede), para comparar o custo de cada rota entre versões.
+"""
+import pytest
+from django.core.cache import cache
+
+from cliente.models import Cliente
+from empresa.models import ConfiguracaoEmpresa
+
+pytestmark = pytest.mark.django_db
+
+NOVO_CLIENTE = {
+    "razao_social": "Empresa Benchmark LTDA",
+    "nome_fantasia": "Empresa Benchmark",
+    "endereco": "Rua Teste, 123",
+    "cep": "01234567",
+    "cidade_id": 3550308,
+    "estado_id": 35,
+    "responsavel_cpf": "52998224725",
+    "responsavel_rg": "123456789",
+    "responsavel_nome": "João da Silva",
+    "responsavel_data_nascimento": "1980-01-01",
+    "responsavel_estado_civil": "casado",
+    "responsavel_email": "joao@empresa.com",
+    "email_financeiro": "financeiro@empresa.com",
+}
+
+
+def _assert_status(response, esperado=200):
+    assert response.status_code == esperado, getattr(response, 'data', response.content)
+    return response
+
+
+def test_token(benchmark, client, usuario):
+    benchmark(lambda: _assert_status(client.post(
+        '/token/', {'username': 'bench', 'password': 'bench-senha'}, content_type='application/json'
+    )))
+
+
+def test_clientes_list(benchmark, api_client, clientes):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/clientes/')))
+
+
+def test_clientes_list_pagina_profunda(benchmark, api_client, clientes):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/clientes/?page=40')))
+
+
+def test_clientes_search(benchmark, api_client, clientes):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/clientes/?search=Tecnologia')))
+
+
+def test_clientes_create(benchmark, api_client):
+    from validate_docbr import CNPJ
+    gerador = CNPJ()
+
+    def criar():
+        _assert_status(api_client.post(
+            '/cliente/clientes/', dict(NOVO_CLIENTE, cnpj=gerador.generate()), format='json'
+        ), 201)
+
+    benchmark(criar)
+    assert Cliente.objects.exists()
+
+
+def test_consulta_cnpj(benchmark, api_client, upstream):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/consulta/cnpj/11222333000181/')))
+
+
+def test_consulta_cep(benchmark, api_client, upstream):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/consulta/cep/01001000/')))
+
+
+def test_consulta_ufs(benchmark, api_client, upstream):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/consulta/ufs/')))
+
+
+def test_consulta_municipios(benchmark, api_client, upstream):
+    benchmark(lambda: _assert_status(api_client.get('/cliente/consulta/municipios/MG/')))
+
+
+def test_configuracao_atual(benchmark, api_client, usuario):
+    ConfiguracaoEmpresa.objects.create(
+        razao_social="Prestadora LTDA",
+        nome_fantasia="Prestadora",
+        cnpj="11.222.333/0001-81",
+        endereco="Rua Teste, 123",
+        cep="01234-567",
+        cidade_id=3550308,
+        cidade_nome="São Paulo",
+        estado_id=35,
+        estado_sigla="SP",
+        email="contato@prestadora.com",
+        representante_nome="Maria Souza",
+        representante_cargo="Diretora",
+        representante_cpf="529.982.247-25",
+    )
+    cache.clear()
+    benchmark(lambda: _assert_status(api_client.get('/empresa/configuracao/atual/')))
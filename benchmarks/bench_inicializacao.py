@@ -0,0 +1,36 @@
+"""
+Tempo de inicialização de um worker (interpretador novo importando app.wsgi)
+e custo do aquecimento executado antes de aceitar requisições.
+A meta pode ser ajustada por BENCH_TEMPO_MAXIMO_INICIALIZACAO (segundos).
+"""
+import os
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+
+from app.aquecimento import aquecer
+from app.importacao import medir_importacao
+from empresa.configuracao import invalidar_configuracao
+
+TEMPO_MAXIMO_INICIALIZACAO_S = float(os.environ.get('BENCH_TEMPO_MAXIMO_INICIALIZACAO', 1.5))
+
+
+def test_inicializacao_worker(benchmark):
+    def iniciar():
+        importacoes, duracao = medir_importacao('app.wsgi')
+        return duracao
+
+    benchmark.pedantic(iniciar, rounds=5, iterations=1)
+    benchmark.extra_info['meta_s'] = TEMPO_MAXIMO_INICIALIZACAO_S
+    assert benchmark.stats['mean'] < TEMPO_MAXIMO_INICIALIZACAO_S
+
+
+@pytest.mark.django_db
+def test_aquecimento(benchmark):
+    def caches_frios():
+        cache.clear()
+        invalidar_configuracao()
+        ContentType.objects.clear_cache()
+
+    benchmark.pedantic(aquecer, setup=caches_frios, rounds=10, iterations=1)
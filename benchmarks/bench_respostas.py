@@ -0,0 +1,66 @@
+"""
+Custo de renderização JSON (DRF JSONRenderer x orjson) e bytes enviados por
+resposta com e sem compressão nas listagens maiores. O tamanho de cada
+resposta fica em extra_info['bytes'] no relatório do pytest-benchmark.
+"""
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from app import middleware
+from app.renderers import ORJSONRenderer
+from cliente.models import Cliente
+from cliente.serializers import ClienteSerializer
+from cliente.views import ClienteViewSet
+
+pytestmark = pytest.mark.django_db
+
+RENDERERS = {'drf': JSONRenderer, 'orjson': ORJSONRenderer}
+CODIFICACOES = ['identity', 'gzip'] + (['br'] if middleware.brotli else [])
+
+
+@pytest.fixture
+def clientes_serializados(clientes):
+    return ClienteSerializer(Cliente.objects.all(), many=True).data
+
+
+@pytest.fixture
+def municipios():
+    return [{'id': 3100000 + indice, 'nome': f'Município {indice}', 'uf': 'MG'} for indice in range(850)]
+
+
+@pytest.mark.parametrize('renderer', sorted(RENDERERS))
+def test_render_clientes(benchmark, renderer, clientes_serializados):
+    conteudo = benchmark(RENDERERS[renderer]().render, clientes_serializados)
+    benchmark.extra_info['bytes'] = len(conteudo)
+
+
+@pytest.mark.parametrize('renderer', sorted(RENDERERS))
+def test_render_municipios(benchmark, renderer, municipios):
+    conteudo = benchmark(RENDERERS[renderer]().render, municipios)
+    benchmark.extra_info['bytes'] = len(conteudo)
+
+
+@pytest.mark.parametrize('codificacao', CODIFICACOES)
+def test_bytes_lista_clientes(benchmark, codificacao, api_client, clientes, monkeypatch):
+    # Sem paginação, como uma exportação completa dos 500 clientes
+    monkeypatch.setattr(ClienteViewSet, 'pagination_class', None)
+    def listar():
+        response = api_client.get('/cliente/clientes/', HTTP_ACCEPT_ENCODING=codificacao)
+        assert response.status_code == 200
+        return response
+
+    response = benchmark(listar)
+    benchmark.extra_info['bytes'] = len(response.content)
+    benchmark.extra_info['content_encoding'] = response.get('Content-Encoding', 'identity')
+
+
+@pytest.mark.parametrize('codificacao', CODIFICACOES)
+def test_bytes_municipios(benchmark, codificacao, api_client, upstream):
+    def listar():
+        response = api_client.get('/cliente/consulta/municipios/MG/', HTTP_ACCEPT_ENCODING=codificacao)
+        assert response.status_code == 200
+        return response
+
+    response = benchmark(listar)
+    benchmark.extra_info['bytes'] = len(response.content)
+    benchmark.extra_info['content_encoding'] = response.get('Content-Encoding', 'identity')
@@ -0,0 +1,274 @@
+"""
+Gerador de carga (no estilo do Locust) contra um servidor local da API.
+Cada usuário virtual obtém um token em /token/ e executa cenários sorteados
+por peso, com uma pausa entre requisições. O token de acesso é renovado em
+/token/refresh/ antes de expirar (e após um 401), então a duração do teste
+pode passar da validade do token. No final imprime p50/p95/p99 e RPS por
+cenário, além das falhas de autenticação, e pode gravar o relatório em JSON
+para comparar versões.
+
+    python manage.py simular_upstream --latencia lognormal --latencia-ms 120 --desvio-ms 60
+    RECEITAWS_URL=... VIACEP_URL=... IBGE_URL=... python manage.py runserver --noreload
+    # para medir capacidade sem os limites de taxa (app/limites.py), suba o servidor com
+    # LIMITE_USUARIO= LIMITE_CONSULTA= LIMITE_LOGIN= LIMITE_LISTAGEM= LIMITE_ESCRITA=
+    python manage.py popular_clientes --quantidade 5000   # e cadastre a configuração da empresa
+    python -m benchmarks.carga --usuario admin --senha admin --usuarios 20 --duracao 60 \\
+        --saida relatorio.json --comparar relatorio_anterior.json
+"""
+import argparse
+import base64
+import json
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from validate_docbr import CNPJ
+
+NOVO_CLIENTE = {
+    "razao_social": "Empresa Carga LTDA",
+    "nome_fantasia": "Empresa Carga",
+    "endereco": "Rua Teste, 123",
+    "cep": "01234567",
+    "cidade_id": 3550308,
+    "estado_id": 35,
+    "responsavel_cpf": "52998224725",
+    "responsavel_rg": "123456789",
+    "responsavel_nome": "João da Silva",
+    "responsavel_data_nascimento": "1980-01-01",
+    "responsavel_estado_civil": "casado",
+    "responsavel_email": "joao@empresa.com",
+    "email_financeiro": "financeiro@empresa.com",
+}
+
+
+def _novo_cliente():
+    return dict(NOVO_CLIENTE, cnpj=CNPJ().generate())
+
+
+# nome: (peso, método, caminho, corpo)
+CENARIOS = {
+    'clientes_list': (30, 'GET', '/cliente/clientes/', None),
+    'clientes_search': (15, 'GET', '/cliente/clientes/?search=Tecnologia', None),
+    'clientes_create': (5, 'POST', '/cliente/clientes/', _novo_cliente),
+    'consulta_cnpj': (8, 'GET', '/cliente/consulta/cnpj/11222333000181/', None),
+    'consulta_cep': (8, 'GET', '/cliente/consulta/cep/01001000/', None),
+    'consulta_ufs': (8, 'GET', '/cliente/consulta/ufs/', None),
+    'consulta_municipios': (8, 'GET', '/cliente/consulta/municipios/MG/', None),
+    'configuracao_atual': (15, 'GET', '/empresa/configuracao/atual/', None),
+    'token': (3, 'POST', '/token/', 'credenciais'),
+}
+
+
+# Segundos antes da expiração do token de acesso em que ele é renovado
+MARGEM_RENOVACAO = 30
+
+
+def expiracao_token(token):
+    """
+    Instante (time.time()) em que o JWT expira, lido do payload sem validar a assinatura
+    """
+    payload = token.split('.')[1]
+    payload += '=' * (-len(payload) % 4)
+    return json.loads(base64.urlsafe_b64decode(payload))['exp']
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+class UsuarioVirtual(threading.Thread):
+    def __init__(self, args, cenarios, resultados, lock, fim, falhas_autenticacao):
+        super().__init__(daemon=True)
+        self.args = args
+        self.cenarios = cenarios
+        self.resultados = resultados
+        self.lock = lock
+        self.fim = fim
+        self.falhas_autenticacao = falhas_autenticacao
+        self.session = requests.Session()
+        self.credenciais = {'username': args.usuario, 'password': args.senha}
+        self.refresh = None
+        self.renovar_em = 0.0
+
+    def _usar_token(self, access):
+        self.session.headers['Authorization'] = f"Bearer {access}"
+        self.renovar_em = expiracao_token(access) - MARGEM_RENOVACAO
+
+    def autenticar(self):
+        self.session.headers.pop('Authorization', None)
+        response = self.session.post(f'{self.args.url}/token/', json=self.credenciais, timeout=30)
+        response.raise_for_status()
+        tokens = response.json()
+        self.refresh = tokens['refresh']
+        self._usar_token(tokens['access'])
+
+    def renovar(self):
+        """
+        Troca o refresh token por um novo token de acesso; se o refresh também
+        expirou ou foi recusado, faz login de novo
+        """
+        try:
+            self.session.headers.pop('Authorization', None)
+            response = self.session.post(f'{self.args.url}/token/refresh/', json={'refresh': self.refresh}, timeout=30)
+            response.raise_for_status()
+            tokens = response.json()
+            self.refresh = tokens.get('refresh', self.refresh)
+            self._usar_token(tokens['access'])
+        except (requests.RequestException, KeyError, ValueError):
+            self.autenticar()
+
+    def _garantir_autenticado(self, forcar=False):
+        if not forcar and time.time() < self.renovar_em:
+            return True
+        try:
+            if self.refresh:
+                self.renovar()
+            else:
+                self.autenticar()
+            return True
+        except (requests.RequestException, KeyError, ValueError) as e:
+            with self.lock:
+                self.falhas_autenticacao['total'] += 1
+                self.falhas_autenticacao['ultimo_erro'] = f"{type(e).__name__}: {e}"
+            return False
+
+    def executar(self, nome):
+        _, metodo, caminho, corpo = CENARIOS[nome]
+        if corpo == 'credenciais':
+            corpo = self.credenciais
+        elif callable(corpo):
+            corpo = corpo()
+
+        inicio = time.perf_counter()
+        try:
+            response = self.session.request(metodo, f'{self.args.url}{caminho}', json=corpo, timeout=30)
+            if response.status_code == 401 and self._garantir_autenticado(forcar=True):
+                # Token recusado antes da hora (ex.: relógio adiantado): renova e repete uma vez
+                inicio = time.perf_counter()
+                response = self.session.request(metodo, f'{self.args.url}{caminho}', json=corpo, timeout=30)
+            erro = response.status_code >= 400
+        except requests.RequestException:
+            erro = True
+        duracao = (time.perf_counter() - inicio) * 1000
+
+        with self.lock:
+            self.resultados[nome]['latencias'].append(duracao)
+            self.resultados[nome]['erros'] += int(erro)
+
+    def run(self):
+        nomes = list(self.cenarios)
+        pesos = [CENARIOS[nome][0] for nome in nomes]
+        while time.monotonic() < self.fim:
+            if not self._garantir_autenticado():
+                # Sem token as requisições só medem 401; tenta de novo após uma pausa
+                time.sleep(1)
+                continue
+            self.executar(random.choices(nomes, pesos)[0])
+            if self.args.pausa_ms:
+                time.sleep(random.uniform(0, self.args.pausa_ms) / 1000)
+
+
+def gerar_relatorio(resultados, duracao, falhas_autenticacao=None):
+    relatorio = {'duracao_s': duracao, 'cenarios': {}}
+    todas = []
+    for nome, dados in sorted(resultados.items()):
+        latencias = dados['latencias']
+        todas.extend(latencias)
+        relatorio['cenarios'][nome] = {
+            'requisicoes': len(latencias),
+            'erros': dados['erros'],
+            'rps': round(len(latencias) / duracao, 2),
+            'p50_ms': round(percentil(latencias, 50), 2),
+            'p95_ms': round(percentil(latencias, 95), 2),
+            'p99_ms': round(percentil(latencias, 99), 2),
+            'media_ms': round(statistics.fmean(latencias), 2) if latencias else 0.0,
+        }
+    relatorio['total'] = {
+        'requisicoes': len(todas),
+        'erros': sum(dados['erros'] for dados in resultados.values()),
+        'rps': round(len(todas) / duracao, 2),
+        'p50_ms': round(percentil(todas, 50), 2),
+        'p95_ms': round(percentil(todas, 95), 2),
+        'p99_ms': round(percentil(todas, 99), 2),
+    }
+    relatorio['falhas_autenticacao'] = dict(falhas_autenticacao or {'total': 0, 'ultimo_erro': None})
+    return relatorio
+
+
+def _variacao(atual, anterior):
+    if not anterior:
+        return ''
+    return f' ({(atual - anterior) / anterior * 100:+.1f}%)'
+
+
+def imprimir_relatorio(relatorio, anterior=None):
+    anterior = anterior or {'cenarios': {}, 'total': {}}
+    cabecalho = f"{'cenário':<22}{'req':>8}{'erros':>7}{'rps':>18}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}"
+    print(cabecalho)
+    print('-' * len(cabecalho))
+    linhas = list(relatorio['cenarios'].items()) + [('TOTAL', relatorio['total'])]
+    for nome, dados in linhas:
+        base = anterior['total'] if nome == 'TOTAL' else anterior['cenarios'].get(nome, {})
+        colunas = [
+            f"{dados[campo]}{_variacao(dados[campo], base.get(campo))}"
+            for campo in ('rps', 'p50_ms', 'p95_ms', 'p99_ms')
+        ]
+        print(f"{nome:<22}{dados['requisicoes']:>8}{dados['erros']:>7}"
+              f"{colunas[0]:>18}{colunas[1]:>20}{colunas[2]:>20}{colunas[3]:>20}")
+
+    falhas = relatorio.get('falhas_autenticacao', {})
+    if falhas.get('total'):
+        print(f"\nFalhas de autenticação: {falhas['total']} (último erro: {falhas['ultimo_erro']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--usuario', required=True)
+    parser.add_argument('--senha', required=True)
+    parser.add_argument('--usuarios', type=int, default=10, help='Usuários virtuais simultâneos')
+    parser.add_argument('--duracao', type=float, default=30, help='Duração do teste em segundos')
+    parser.add_argument('--pausa-ms', type=float, default=0, help='Pausa máxima entre requisições')
+    parser.add_argument('--cenarios', nargs='+', choices=sorted(CENARIOS), default=sorted(CENARIOS))
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--saida', help='Arquivo JSON para gravar o relatório')
+    parser.add_argument('--comparar', help='Relatório JSON anterior para comparação')
+    args = parser.parse_args()
+
+    random.seed(args.semente)
+    resultados = defaultdict(lambda: {'latencias': [], 'erros': 0})
+    lock = threading.Lock()
+    falhas_autenticacao = {'total': 0, 'ultimo_erro': None}
+    inicio = time.monotonic()
+    fim = inicio + args.duracao
+
+    usuarios = [
+        UsuarioVirtual(args, args.cenarios, resultados, lock, fim, falhas_autenticacao)
+        for _ in range(args.usuarios)
+    ]
+    for usuario in usuarios:
+        usuario.start()
+    for usuario in usuarios:
+        usuario.join()
+
+    relatorio = gerar_relatorio(resultados, time.monotonic() - inicio, falhas_autenticacao)
+    anterior = None
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            anterior = json.load(arquivo)
+    imprimir_relatorio(relatorio, anterior)
+
+    if args.saida:
+        with open(args.saida, 'w') as arquivo:
+            json.dump(relatorio, arquivo, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Fixtures compartilhadas pelos microbenchmarks (pytest-benchmark + pytest-django).
+
+    pip install -r benchmarks/requirements.txt
+    pytest -c benchmarks/pytest.ini benchmarks --benchmark-json=bench.json
+    pytest-benchmark compare bench_anterior.json bench.json
+"""
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from simulador.servidor import SimuladorUpstream
+
+pytest_plugins = ['simulador.pytest_plugin']
+
+# Latência simulada das APIs externas nos benchmarks de /cliente/consulta/
+LATENCIA_UPSTREAM_MS = 50
+
+
+@pytest.fixture(autouse=True)
+def limites_de_taxa_altos(monkeypatch):
+    # Os benchmarks repetem a mesma requisição milhares de vezes: os contadores
+    # continuam sendo incrementados (e medidos), mas nunca bloqueiam
+    monkeypatch.setattr(
+        SimpleRateThrottle, 'THROTTLE_RATES',
+        dict.fromkeys(SimpleRateThrottle.THROTTLE_RATES, '1000000/s'),
+    )
+
+
+@pytest.fixture
+def usuario(django_user_model):
+    return django_user_model.objects.create_user(username='bench', password='bench-senha', is_staff=True)
+
+
+@pytest.fixture
+def api_client(usuario):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client
+
+
+@pytest.fixture
+def clientes(usuario):
+    call_command('popular_clientes', quantidade=500, stdout=open('/dev/null', 'w'))
+
+
+@pytest.fixture(scope='session')
+def simulador_upstream():
+    with SimuladorUpstream(latencia_ms=LATENCIA_UPSTREAM_MS, semente=42, completar_municipios=850) as simulador:
+        yield simulador
@@ -0,0 +1,46 @@
+from django.db import transaction
+
+from .models import Cliente, ClienteArquivado
+
+# Clientes movidos por transação
+TAMANHO_LOTE_PADRAO = 1000
+
+
+def _campos():
+    # Mesmas colunas nas duas tabelas; data_arquivamento é preenchida na inclusão
+    return [
+        campo.attname for campo in ClienteArquivado._meta.concrete_fields
+        if campo.attname != 'data_arquivamento'
+    ]
+
+
+def arquivar_lote(limite, tamanho_lote=TAMANHO_LOTE_PADRAO):
+    """
+    Move para a tabela de arquivados, em uma transação, até `tamanho_lote`
+    clientes excluídos até `limite`. Retorna quantos foram movidos.
+    """
+    with transaction.atomic():
+        linhas = list(
+            Cliente.todos.filter(data_exclusao__lte=limite)
+            .select_for_update()
+            .order_by('pk')
+            .values(*_campos())[:tamanho_lote]
+        )
+        if linhas:
+            ClienteArquivado.objects.bulk_create([ClienteArquivado(**linha) for linha in linhas])
+            Cliente.todos.filter(pk__in=[linha['id'] for linha in linhas]).delete()
+    return len(linhas)
+
+
+def arquivar_excluidos(limite, tamanho_lote=TAMANHO_LOTE_PADRAO):
+    """
+    Arquiva em lotes todos os clientes excluídos até `limite`, gerando a
+    quantidade movida em cada lote. Cada lote é confirmado separadamente,
+    sem manter bloqueios longos na tabela de clientes.
+    """
+    while True:
+        movidos = arquivar_lote(limite, tamanho_lote)
+        if movidos:
+            yield movidos
+        if movidos < tamanho_lote:
+            return
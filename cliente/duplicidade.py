@@ -0,0 +1,186 @@
+from collections import deque, namedtuple
+from difflib import SequenceMatcher
+
+from django.db.models import Q
+
+from .models import Cliente
+
+# Pontuação mínima para considerar dois clientes possíveis duplicados
+LIMIAR_PADRAO = 0.5
+# Peso de cada sinal na pontuação (somam 1)
+PESO_NOME = 0.5
+PESO_RAIZ_CNPJ = 0.3
+PESO_CPF_RESPONSAVEL = 0.2
+# Similaridade de nome a partir da qual o nome entra nos motivos
+SIMILARIDADE_NOME_MINIMA = 0.85
+
+# Candidatos avaliados na verificação antes do cadastro
+MAX_CANDIDATOS = 200
+# Na verificação, vizinhos de cada lado da chave de nome (em ordem alfabética) avaliados
+VIZINHOS_NOME = 10
+# No relatório, cada cliente é comparado com os próximos N do mesmo bloco (vizinhança ordenada)
+JANELA_PADRAO = 20
+
+CAMPOS_REGISTRO = (
+    'id', 'organizacao_id', 'cnpj', 'razao_social', 'cnpj_digits', 'chave_nome', 'responsavel_cpf_digits',
+)
+Registro = namedtuple('Registro', CAMPOS_REGISTRO)
+
+# Chaves de bloqueio: (nome, ordenação coberta por índice, função que extrai o bloco do registro).
+# Clientes de organizações diferentes nunca são comparados: a organização abre a
+# ordenação e faz parte do bloco; o segundo campo da ordenação é o da chave.
+# Raiz do CNPJ e CPF só comparam valores iguais. O nome usa vizinhança ordenada:
+# o bloco é a organização inteira e a janela desliza pelas chaves de nome em
+# ordem alfabética, alcançando nomes parecidos (erro de digitação, palavra a
+# mais) que a similaridade pontua.
+CHAVES_BLOQUEIO = [
+    ('raiz_cnpj', ('organizacao_id', 'cnpj_raiz', 'cnpj_digits'),
+     lambda registro: (registro.organizacao_id, registro.cnpj_digits[:8])),
+    ('nome', ('organizacao_id', 'chave_nome', 'id'),
+     lambda registro: registro.organizacao_id),
+    ('cpf_responsavel', ('organizacao_id', 'responsavel_cpf_digits', 'id'),
+     lambda registro: (registro.organizacao_id, registro.responsavel_cpf_digits)),
+]
+
+
+def similaridade_nome(a, b):
+    """
+    Similaridade (0 a 1) entre duas chaves de nome normalizadas. Abaixo de
+    SIMILARIDADE_NOME_MINIMA o nome não conta (0); quick_ratio é um limite
+    superior barato e evita o cálculo completo nesses casos.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < SIMILARIDADE_NOME_MINIMA or matcher.quick_ratio() < SIMILARIDADE_NOME_MINIMA:
+        return 0.0
+    razao = matcher.ratio()
+    return razao if razao >= SIMILARIDADE_NOME_MINIMA else 0.0
+
+
+def pontuar(a, b):
+    """
+    Retorna (pontuação, motivos) para um par de registros
+    """
+    if a.cnpj_digits and a.cnpj_digits == b.cnpj_digits:
+        return 1.0, ['cnpj']
+
+    motivos = []
+    nome = similaridade_nome(a.chave_nome, b.chave_nome)
+    if nome >= SIMILARIDADE_NOME_MINIMA:
+        motivos.append('nome')
+    mesma_raiz = len(a.cnpj_digits) == 14 and a.cnpj_digits[:8] == b.cnpj_digits[:8]
+    if mesma_raiz:
+        motivos.append('raiz_cnpj')
+    mesmo_cpf = bool(a.responsavel_cpf_digits) and a.responsavel_cpf_digits == b.responsavel_cpf_digits
+    if mesmo_cpf:
+        motivos.append('cpf_responsavel')
+
+    pontuacao = PESO_NOME * nome + PESO_RAIZ_CNPJ * mesma_raiz + PESO_CPF_RESPONSAVEL * mesmo_cpf
+    return round(pontuacao, 3), motivos
+
+
+def _registro_dos_dados(dados, organizacao_id):
+    valores = {campo: dados.get(campo) or '' for campo in ('cnpj', 'razao_social', 'responsavel_cpf')}
+    derivados = Cliente.calcular_derivados(valores)
+    return Registro(
+        id=None, organizacao_id=organizacao_id, cnpj=valores['cnpj'], razao_social=valores['razao_social'],
+        cnpj_digits=derivados['cnpj_digits'], chave_nome=derivados['chave_nome'],
+        responsavel_cpf_digits=derivados['responsavel_cpf_digits'],
+    )
+
+
+def buscar_candidatos(registro, excluir_id=None):
+    """
+    Busca pelos índices das chaves de bloqueio os clientes da mesma organização
+    que compartilham raiz do CNPJ, chave de nome ou CPF do responsável, mais os
+    VIZINHOS_NOME clientes de cada lado da chave de nome em ordem alfabética
+    """
+    filtro = Q()
+    raiz = registro.cnpj_digits[:8]
+    if len(raiz) == 8:
+        filtro |= Q(cnpj_raiz=raiz)
+    if registro.chave_nome:
+        filtro |= Q(chave_nome=registro.chave_nome)
+    if registro.responsavel_cpf_digits:
+        filtro |= Q(responsavel_cpf_digits=registro.responsavel_cpf_digits)
+    if not filtro:
+        return []
+
+    queryset = Cliente.objects.da_organizacao(registro.organizacao_id)
+    if excluir_id is not None:
+        queryset = queryset.exclude(pk=excluir_id)
+    consultas = [queryset.filter(filtro)[:MAX_CANDIDATOS]]
+    if registro.chave_nome:
+        # Duas faixas do índice (organizacao, chave_nome), uma para cada lado
+        consultas.append(queryset.filter(chave_nome__gt=registro.chave_nome).order_by('chave_nome')[:VIZINHOS_NOME])
+        consultas.append(
+            queryset.filter(chave_nome__lt=registro.chave_nome).exclude(chave_nome='')
+            .order_by('-chave_nome')[:VIZINHOS_NOME]
+        )
+
+    candidatos = {}
+    for consulta in consultas:
+        for linha in consulta.values_list(*CAMPOS_REGISTRO):
+            candidatos.setdefault(linha[0], Registro(*linha))
+    return list(candidatos.values())
+
+
+def verificar_duplicidade(dados, limiar=LIMIAR_PADRAO, excluir_id=None, organizacao_id=None):
+    """
+    Lista os clientes da organização que podem ser duplicados dos dados
+    informados (cnpj, razao_social e responsavel_cpf), da maior para a menor pontuação
+    """
+    registro = _registro_dos_dados(dados, organizacao_id)
+    resultado = []
+    for candidato in buscar_candidatos(registro, excluir_id):
+        pontuacao, motivos = pontuar(registro, candidato)
+        if pontuacao >= limiar:
+            resultado.append({
+                'id': candidato.id,
+                'cnpj': candidato.cnpj,
+                'razao_social': candidato.razao_social,
+                'pontuacao': pontuacao,
+                'motivos': motivos,
+            })
+    return sorted(resultado, key=lambda item: (-item['pontuacao'], item['id']))
+
+
+def gerar_pares_duplicados(limiar=LIMIAR_PADRAO, janela=JANELA_PADRAO, tamanho_lote=5000):
+    """
+    Percorre a tabela uma vez por chave de bloqueio, em ordem do índice, e
+    compara cada cliente com os `janela` anteriores do mesmo bloco, sem
+    guardar o bloco inteiro em memória. Gera (registro_a, registro_b,
+    pontuação, motivos) sem repetir pares.
+
+    Um par pode ser comparado de novo numa passada seguinte; só os pares
+    gerados (acima do limiar) são guardados para não repeti-los, e a memória
+    acompanha o tamanho do relatório, não o número de comparações.
+    """
+    gerados = set()
+    for _, ordenacao, extrair_bloco in CHAVES_BLOQUEIO:
+        linhas = (
+            Cliente.objects.exclude(**{ordenacao[1]: ''})
+            .order_by(*ordenacao)
+            .values_list(*CAMPOS_REGISTRO)
+            .iterator(chunk_size=tamanho_lote)
+        )
+        anteriores = deque(maxlen=janela)
+        bloco_atual = object()
+        for b in (Registro(*linha) for linha in linhas):
+            bloco = extrair_bloco(b)
+            if bloco != bloco_atual:
+                anteriores.clear()
+                bloco_atual = bloco
+            for a in anteriores:
+                pontuacao, motivos = pontuar(a, b)
+                if pontuacao < limiar:
+                    continue
+                par = (min(a.id, b.id), max(a.id, b.id))
+                if par in gerados:
+                    continue
+                gerados.add(par)
+                yield (a, b, pontuacao, motivos) if a.id < b.id else (b, a, pontuacao, motivos)
+            anteriores.append(b)
@@ -0,0 +1,117 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F
+from django.db.models.functions import TruncMonth
+
+from .models import Cliente, ResumoCliente
+
+# Campos de Cliente que mudam a chave do resumo (o mês vem de data_criacao, que não muda)
+CAMPOS_RESUMO = {'estado_sigla', 'cidade_nome'}
+
+
+def _agrupar(queryset):
+    return (
+        queryset.annotate(mes=TruncMonth('data_criacao', output_field=DateField()))
+        .values('organizacao_id', 'estado_sigla', 'cidade_nome', 'mes')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+
+
+def contar(ids):
+    """
+    Retorna um Counter {(organizacao_id, estado_sigla, cidade_nome, mes): total} dos clientes informados
+    """
+    if not ids:
+        return Counter()
+    return Counter({
+        (linha['organizacao_id'], linha['estado_sigla'], linha['cidade_nome'], linha['mes']): linha['total']
+        for linha in _agrupar(Cliente.objects.filter(pk__in=ids))
+    })
+
+
+def aplicar_diferenca(antes, depois):
+    """
+    Aplica no resumo a diferença entre duas contagens com UPDATE ... total = total + n,
+    criando as linhas que ainda não existem
+    """
+    diferencas = {chave: depois.get(chave, 0) - antes.get(chave, 0) for chave in antes.keys() | depois.keys()}
+    diferencas = {chave: delta for chave, delta in diferencas.items() if delta}
+    if not diferencas:
+        return
+
+    with transaction.atomic():
+        for (organizacao_id, estado_sigla, cidade_nome, mes), delta in diferencas.items():
+            filtro = {
+                'organizacao_id': organizacao_id, 'estado_sigla': estado_sigla, 'cidade_nome': cidade_nome, 'mes': mes,
+            }
+            if ResumoCliente.objects.filter(**filtro).update(total=F('total') + delta):
+                continue
+            try:
+                with transaction.atomic():
+                    ResumoCliente.objects.create(total=delta, **filtro)
+            except IntegrityError:
+                # Outra gravação criou a linha ao mesmo tempo
+                ResumoCliente.objects.filter(**filtro).update(total=F('total') + delta)
+        if any(delta < 0 for delta in diferencas.values()):
+            ResumoCliente.objects.filter(total__lte=0).delete()
+
+
+def incluir(ids):
+    """Soma ao resumo os clientes recém-criados"""
+    aplicar_diferenca(Counter(), contar(ids))
+
+
+@contextmanager
+def acompanhar(ids):
+    """
+    Conta os clientes antes e depois do bloco e aplica a diferença no resumo.
+    Para exclusões a contagem final é vazia.
+    """
+    antes = contar(ids)
+    yield
+    aplicar_diferenca(antes, contar(ids))
+
+
+def recalcular():
+    """
+    Reconstrói o resumo inteiro a partir da tabela de clientes
+    """
+    with transaction.atomic():
+        ResumoCliente.objects.all().delete()
+        ResumoCliente.objects.bulk_create(
+            [ResumoCliente(**linha) for linha in _agrupar(Cliente.objects.all())],
+            batch_size=1000,
+        )
+
+
+def obter_estatisticas(organizacao_id=None):
+    """
+    Lê o resumo da organização com uma única consulta e agrupa por UF, município e mês
+    """
+    por_estado = defaultdict(int)
+    por_cidade = defaultdict(int)
+    por_mes = defaultdict(int)
+    total = 0
+    for estado_sigla, cidade_nome, mes, quantidade in ResumoCliente.objects.da_organizacao(organizacao_id).values_list(
+        'estado_sigla', 'cidade_nome', 'mes', 'total'
+    ):
+        total += quantidade
+        por_estado[estado_sigla] += quantidade
+        por_cidade[(estado_sigla, cidade_nome)] += quantidade
+        por_mes[mes.strftime('%Y-%m')] += quantidade
+
+    return {
+        'total': total,
+        'por_estado': [
+            {'estado_sigla': sigla, 'total': quantidade}
+            for sigla, quantidade in sorted(por_estado.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'por_cidade': [
+            {'estado_sigla': sigla, 'cidade_nome': cidade, 'total': quantidade}
+            for (sigla, cidade), quantidade in sorted(por_cidade.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        'por_mes': [{'mes': mes, 'total': quantidade} for mes, quantidade in sorted(por_mes.items())],
+    }
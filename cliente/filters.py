@@ -0,0 +1,89 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import filters, serializers
+
+from .models import Cliente
+
+
+def _lista(valor):
+    return [item.strip() for item in valor.split(',') if item.strip()]
+
+
+def _inteiros(parametro, valor):
+    try:
+        return [int(item) for item in _lista(valor)]
+    except ValueError:
+        raise serializers.ValidationError({parametro: ['Informe números inteiros separados por vírgula.']})
+
+
+def _data(parametro, valor, fim=False):
+    """
+    Aceita data (AAAA-MM-DD) ou data e hora ISO 8601. Uma data sem hora
+    vale o dia inteiro: início do dia em `_de` e fim do dia em `_ate`.
+    """
+    data_hora = parse_datetime(valor)
+    if data_hora is None:
+        try:
+            data = parse_date(valor)
+        except ValueError:
+            data = None
+        if data is None:
+            raise serializers.ValidationError({parametro: ['Data inválida, use AAAA-MM-DD ou ISO 8601.']})
+        data_hora = datetime.combine(data, time.max if fim else time.min)
+    if timezone.is_naive(data_hora):
+        data_hora = timezone.make_aware(data_hora)
+    return data_hora
+
+
+class ClienteFilterBackend(filters.BaseFilterBackend):
+    """
+    Filtros da listagem de clientes:
+    ?estado_sigla=SP,RJ  ?cidade_id=3550308  ?responsavel_estado_civil=casado
+    ?criado_por=1  ?data_criacao_de=  ?data_criacao_ate=  ?data_atualizacao_de=  ?data_atualizacao_ate=
+    Todos usam índices de Cliente, exceto responsavel_estado_civil: com poucos
+    valores possíveis um índice não seria seletivo, e ele é aplicado sobre as
+    linhas já restritas pela organização e pelos demais filtros.
+    """
+    CAMPOS_DATA = ('data_criacao', 'data_atualizacao')
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if params.get('estado_sigla'):
+            queryset = queryset.filter(estado_sigla__in=[sigla.upper() for sigla in _lista(params['estado_sigla'])])
+        if params.get('cidade_id'):
+            queryset = queryset.filter(cidade_id__in=_inteiros('cidade_id', params['cidade_id']))
+        if params.get('criado_por'):
+            queryset = queryset.filter(criado_por_id__in=_inteiros('criado_por', params['criado_por']))
+        if params.get('responsavel_estado_civil'):
+            estados_civis = _lista(params['responsavel_estado_civil'])
+            validos = dict(Cliente.ESTADO_CIVIL_CHOICES)
+            invalidos = [valor for valor in estados_civis if valor not in validos]
+            if invalidos:
+                raise serializers.ValidationError({
+                    'responsavel_estado_civil': [f"Valor inválido: {', '.join(invalidos)}."]
+                })
+            queryset = queryset.filter(responsavel_estado_civil__in=estados_civis)
+
+        for campo in self.CAMPOS_DATA:
+            if params.get(f'{campo}_de'):
+                queryset = queryset.filter(**{f'{campo}__gte': _data(f'{campo}_de', params[f'{campo}_de'])})
+            if params.get(f'{campo}_ate'):
+                queryset = queryset.filter(**{f'{campo}__lte': _data(f'{campo}_ate', params[f'{campo}_ate'], fim=True)})
+        return queryset
+
+
+class OrdenacaoEstavelFilter(filters.OrderingFilter):
+    """
+    OrderingFilter que sempre desempata por id: ordenar por colunas não únicas
+    (estado_sigla, cidade_id, datas) deixaria as fronteiras das páginas
+    indeterminadas
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering is None or any(campo.lstrip('-') in ('id', 'pk') for campo in ordering):
+            return ordering
+        return [*ordering, 'id']
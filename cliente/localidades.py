@@ -0,0 +1,42 @@
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from app.cache import CacheDuasCamadas
+
+from .models import Estado, Cidade
+
+# Chave da versão (snapshot) dos dados de localidades no cache
+CHAVE_VERSAO_LOCALIDADES = 'localidades:versao'
+
+# Respostas das listagens de estados e cidades, invalidadas junto com o snapshot
+cache_localidades = CacheDuasCamadas('localidades', timeout=3600)
+
+
+def _calcular_versao_inicial():
+    """
+    Calcula uma versão a partir do conteúdo atual das tabelas de Estado e Cidade
+    """
+    estados = Estado.objects.aggregate(total=Count('id'), maximo=Max('id'))
+    cidades = Cidade.objects.aggregate(total=Count('id'), maximo=Max('id'))
+    return f"{estados['total']}.{estados['maximo']}.{cidades['total']}.{cidades['maximo']}"
+
+
+def obter_versao_localidades():
+    """
+    Retorna a versão atual do snapshot de localidades (estados e cidades)
+    """
+    versao = cache.get(CHAVE_VERSAO_LOCALIDADES)
+    if versao is None:
+        versao = _calcular_versao_inicial()
+        cache.add(CHAVE_VERSAO_LOCALIDADES, versao, None)
+    return versao
+
+
+def invalidar_versao_localidades():
+    """
+    Gera uma nova versão do snapshot; chamada quando Estado ou Cidade mudam
+    """
+    cache.set(CHAVE_VERSAO_LOCALIDADES, uuid.uuid4().hex, None)
+    cache_localidades.invalidar()
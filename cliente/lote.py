@@ -0,0 +1,237 @@
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import serializers
+
+from auditoria.models import RegistroAuditoria
+from auditoria.registro import CAMPOS_IGNORADOS, registrar_alteracoes_em_lote
+from .models import Cliente
+from .serializers import ClienteSerializer
+from . import estatisticas
+from .sincronizacao import marcar_alterados, marcar_removidos
+from .tarefas import agendar_validacao_localidade
+from .validators.localidade_validator import validar_localidade
+
+# Limite de clientes por requisição de lote
+MAX_ITENS_LOTE = 1000
+# Registros por UPDATE ao usar bulk_update para alterações diferentes por cliente
+TAMANHO_LOTE_BULK_UPDATE = 500
+
+# O CNPJ é único e os campos de auditoria são definidos pelo servidor
+CAMPOS_NAO_EDITAVEIS = {'id', 'cnpj', 'criado_por', 'atualizado_por'}
+# Nomes antigos aceitos pelo ClienteSerializer
+CAMPOS_LEGADOS = {'cidade': 'cidade_id', 'estado': 'estado_id'}
+CAMPOS_LOCALIDADE = {'cidade_id', 'estado_id'}
+
+ATUALIZADO = 'atualizado'
+REMOVIDO = 'removido'
+NAO_ENCONTRADO = 'nao_encontrado'
+INVALIDO = 'invalido'
+
+
+def ler_ids(valores):
+    """
+    Valida a lista de ids do lote, removendo repetidos e mantendo a ordem
+    """
+    if not isinstance(valores, list) or not valores:
+        raise serializers.ValidationError({'ids': ['Informe uma lista de ids.']})
+    if len(valores) > MAX_ITENS_LOTE:
+        raise serializers.ValidationError({'ids': [f'Máximo de {MAX_ITENS_LOTE} clientes por lote.']})
+    try:
+        return list(dict.fromkeys(int(valor) for valor in valores))
+    except (TypeError, ValueError):
+        raise serializers.ValidationError({'ids': ['Os ids devem ser inteiros.']})
+
+
+def ler_itens(dados):
+    """
+    Normaliza o corpo do PATCH em {id: {campo: valor}}. Aceita
+    {"clientes": [{"id": 1, ...}, ...]} ou {"ids": [...], "dados": {...}}
+    """
+    if not isinstance(dados, dict):
+        raise serializers.ValidationError({'non_field_errors': ['Corpo da requisição inválido.']})
+
+    if 'clientes' in dados:
+        clientes = dados['clientes']
+        if not isinstance(clientes, list) or not all(isinstance(item, dict) for item in clientes):
+            raise serializers.ValidationError({'clientes': ['Informe uma lista de objetos com id.']})
+        ids = ler_ids([item.get('id') for item in clientes])
+        itens = {}
+        for id_, item in zip((int(item['id']) for item in clientes), clientes):
+            itens.setdefault(id_, {}).update({campo: valor for campo, valor in item.items() if campo != 'id'})
+        return {id_: itens[id_] for id_ in ids}
+
+    alteracoes = dados.get('dados')
+    if not isinstance(alteracoes, dict) or not alteracoes:
+        raise serializers.ValidationError({'dados': ['Informe os campos a alterar.']})
+    return {id_: dict(alteracoes) for id_ in ler_ids(dados.get('ids'))}
+
+
+def _chave(valor):
+    return json.dumps(valor, sort_keys=True, default=str)
+
+
+class ValidadorLote:
+    """
+    Valida cada valor distinto uma única vez com os mesmos campos e métodos
+    validate_<campo> do ClienteSerializer, e cada combinação distinta de
+    valores uma única vez com o ClienteSerializer.validate
+    """
+
+    def __init__(self):
+        self.serializer = ClienteSerializer(partial=True)
+        self.campos = self.serializer.fields
+        self.resultados = {}
+        self.combinacoes = {}
+
+    def validar_combinacao(self, alteracoes):
+        chave = _chave(alteracoes)
+        if chave not in self.combinacoes:
+            try:
+                self.combinacoes[chave] = self.serializer.validate(dict(alteracoes)), None
+            except serializers.ValidationError as e:
+                self.combinacoes[chave] = None, e.detail
+        return self.combinacoes[chave]
+
+    def validar(self, campo, valor):
+        chave = (campo, _chave(valor))
+        if chave not in self.resultados:
+            self.resultados[chave] = self._validar(campo, valor)
+        return self.resultados[chave]
+
+    def _validar(self, campo, valor):
+        nome = CAMPOS_LEGADOS.get(campo, campo)
+        field = self.campos.get(nome)
+        if nome in CAMPOS_NAO_EDITAVEIS or field is None or field.read_only:
+            return None, ['Campo não pode ser alterado em lote.']
+        try:
+            valor = field.run_validation(valor)
+            validador = getattr(self.serializer, f'validate_{nome}', None)
+            if validador is not None:
+                valor = validador(valor)
+        except serializers.ValidationError as e:
+            return None, e.detail
+        return valor, None
+
+
+def atualizar_em_lote(itens, usuario, organizacao_id=None):
+    """
+    Aplica as alterações em uma transação. Clientes com as mesmas alterações
+    recebem um único UPDATE; alterações diferentes por cliente usam bulk_update.
+    Clientes de outra organização contam como não encontrados.
+    Retorna (resultados por id, erros por id).
+    """
+    validador = ValidadorLote()
+    resultados = {}
+    erros = {}
+    validos = {}
+    for id_, campos in itens.items():
+        if not campos:
+            resultados[id_] = INVALIDO
+            erros[id_] = {'non_field_errors': ['Nenhum campo informado.']}
+            continue
+        alteracoes = {}
+        for campo, valor in campos.items():
+            valor, erro = validador.validar(campo, valor)
+            if erro:
+                erros.setdefault(id_, {})[campo] = erro
+            else:
+                alteracoes[CAMPOS_LEGADOS.get(campo, campo)] = valor
+        if id_ not in erros:
+            alteracoes, erro = validador.validar_combinacao(alteracoes)
+            if erro:
+                erros[id_] = erro
+        if id_ in erros:
+            resultados[id_] = INVALIDO
+        else:
+            validos[id_] = alteracoes
+
+    if not validos:
+        return resultados, erros
+
+    campos_lidos = {campo for alteracoes in validos.values() for campo in alteracoes}
+    if CAMPOS_LOCALIDADE & campos_lidos:
+        # Quem altera só o estado ou só o município é conferido com o valor atual do outro
+        campos_lidos |= CAMPOS_LOCALIDADE
+    agora = timezone.now()
+    with transaction.atomic():
+        clientes = Cliente.objects.da_organizacao(organizacao_id).filter(pk__in=validos)
+        antes = {linha['id']: linha for linha in clientes.values('id', *sorted(campos_lidos))}
+        grupos = defaultdict(list)
+        for id_, alteracoes in validos.items():
+            if id_ not in antes:
+                resultados[id_] = NAO_ENCONTRADO
+                continue
+            if len(CAMPOS_LOCALIDADE & alteracoes.keys()) == 1:
+                try:
+                    validar_localidade(
+                        alteracoes.get('estado_id', antes[id_]['estado_id']),
+                        alteracoes.get('cidade_id', antes[id_]['cidade_id']),
+                    )
+                except ValueError as e:
+                    resultados[id_] = INVALIDO
+                    erros[id_] = {'cidade_id': [str(e)]}
+                    continue
+            resultados[id_] = ATUALIZADO
+            grupos[tuple(sorted((campo, _chave(valor)) for campo, valor in alteracoes.items()))].append(id_)
+
+        # Só recalcula o resumo quando UF ou município mudam
+        afetam_resumo = [
+            id_ for ids in grupos.values() for id_ in ids if estatisticas.CAMPOS_RESUMO & validos[id_].keys()
+        ]
+        resumo_antes = estatisticas.contar(afetam_resumo)
+
+        individuais = defaultdict(list)
+        for ids in grupos.values():
+            alteracoes = dict(
+                validos[ids[0]], **Cliente.calcular_derivados(validos[ids[0]]),
+                atualizado_por=usuario, data_atualizacao=agora, versao=F('versao') + 1,
+            )
+            if CAMPOS_LOCALIDADE & alteracoes.keys():
+                alteracoes['status_validacao'] = Cliente.VALIDACAO_PENDENTE
+            if len(ids) > 1:
+                Cliente.objects.filter(pk__in=ids).update(**alteracoes)
+            else:
+                individuais[tuple(sorted(alteracoes))].append(Cliente(pk=ids[0], **alteracoes))
+        for campos, clientes in individuais.items():
+            Cliente.objects.bulk_update(clientes, campos, batch_size=TAMANHO_LOTE_BULK_UPDATE)
+        estatisticas.aplicar_diferenca(resumo_antes, estatisticas.contar(afetam_resumo))
+
+        atualizados = [id_ for id_, resultado in resultados.items() if resultado == ATUALIZADO]
+        registrar_alteracoes_em_lote(
+            Cliente, [(id_, antes[id_], dict(validos[id_], id=id_)) for id_ in atualizados], usuario
+        )
+        marcar_alterados(atualizados, organizacao_id)
+        for id_ in atualizados:
+            if CAMPOS_LOCALIDADE & validos[id_].keys():
+                agendar_validacao_localidade(Cliente(pk=id_, data_atualizacao=agora))
+
+    return resultados, erros
+
+
+def remover_em_lote(ids, usuario, organizacao_id=None):
+    """
+    Exclui (logicamente) os clientes da organização com um único UPDATE,
+    registrando o estado anterior na auditoria
+    """
+    campos = [
+        campo.attname for campo in Cliente._meta.concrete_fields
+        if campo.attname not in CAMPOS_IGNORADOS
+    ]
+    with transaction.atomic():
+        antes = {
+            linha['id']: linha
+            for linha in Cliente.objects.da_organizacao(organizacao_id).filter(pk__in=ids).values(*campos)
+        }
+        if antes:
+            with estatisticas.acompanhar(list(antes)):
+                Cliente.objects.filter(pk__in=antes).excluir()
+            marcar_removidos(list(antes), organizacao_id)
+            registrar_alteracoes_em_lote(
+                Cliente, [(id_, linha, {}) for id_, linha in antes.items()],
+                usuario, RegistroAuditoria.EXCLUSAO,
+            )
+    return {id_: REMOVIDO if id_ in antes else NAO_ENCONTRADO for id_ in ids}
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cliente.arquivamento import TAMANHO_LOTE_PADRAO, arquivar_excluidos
+
+
+class Command(BaseCommand):
+    help = 'Move os clientes excluídos para a tabela de arquivados (consultada em /cliente/arquivados/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=0,
+                            help='Arquiva só as exclusões feitas há pelo menos N dias')
+        parser.add_argument('--lote', type=int, default=TAMANHO_LOTE_PADRAO, help='Clientes movidos por transação')
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options['dias'])
+        total = 0
+        for movidos in arquivar_excluidos(limite, options['lote']):
+            total += movidos
+            self.stdout.write(f'{total} cliente(s) arquivado(s)...')
+        self.stdout.write(self.style.SUCCESS(f'{total} cliente(s) arquivado(s)'))
@@ -0,0 +1,86 @@
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from validate_docbr import CNPJ, CPF
+
+from cliente.models import Cliente
+from cliente import estatisticas
+from cliente.sincronizacao import marcar_alterados
+from empresa.models import Organizacao
+
+ESTADOS = [
+    (35, 'SP', [(3550308, 'São Paulo'), (3509502, 'Campinas'), (3548708, 'São Bernardo do Campo')]),
+    (33, 'RJ', [(3304557, 'Rio de Janeiro'), (3303302, 'Niterói')]),
+    (31, 'MG', [(3106200, 'Belo Horizonte'), (3170206, 'Uberlândia')]),
+    (41, 'PR', [(4106902, 'Curitiba'), (4113700, 'Londrina')]),
+    (43, 'RS', [(4314902, 'Porto Alegre')]),
+]
+PALAVRAS = ['Alfa', 'Beta', 'Comercial', 'Serviços', 'Tecnologia', 'Transportes', 'Alimentos', 'Brasil', 'Norte', 'Sul']
+
+
+class Command(BaseCommand):
+    help = 'Cria clientes fictícios (com CNPJ/CPF válidos) para testes de carga e benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quantidade', type=int, default=1000)
+        parser.add_argument('--lote', type=int, default=1000, help='Tamanho de cada bulk_create')
+        parser.add_argument('--semente', type=int, default=42, help='Semente para gerar dados reprodutíveis')
+        parser.add_argument('--organizacao', help='Slug da organização dos clientes (padrão: sem organização)')
+
+    def handle(self, *args, **options):
+        random.seed(options['semente'])
+        gerador_cnpj, gerador_cpf = CNPJ(), CPF()
+        usuario = User.objects.filter(is_staff=True).first()
+        organizacao_id = None
+        if options['organizacao']:
+            organizacao_id = (
+                Organizacao.objects.filter(slug=options['organizacao']).values_list('id', flat=True).first()
+            )
+            if organizacao_id is None:
+                raise CommandError(f"Organização {options['organizacao']} não encontrada")
+        existentes = set(Cliente.objects.values_list('cnpj', flat=True))
+
+        criados = 0
+        while criados < options['quantidade']:
+            lote = []
+            while len(lote) < min(options['lote'], options['quantidade'] - criados):
+                cnpj = gerador_cnpj.generate(mask=True)
+                if cnpj in existentes:
+                    continue
+                existentes.add(cnpj)
+                estado_id, sigla, cidades = random.choice(ESTADOS)
+                cidade_id, cidade_nome = random.choice(cidades)
+                nome = ' '.join(random.sample(PALAVRAS, 2))
+                dados = dict(
+                    cnpj=cnpj,
+                    razao_social=f"{nome} LTDA",
+                    nome_fantasia=nome,
+                    endereco=f"Rua {random.choice(PALAVRAS)}, {random.randint(1, 9999)}",
+                    cep=f"{random.randint(10000, 99999)}-{random.randint(0, 999):03d}",
+                    cidade_id=cidade_id,
+                    cidade_nome=cidade_nome,
+                    estado_id=estado_id,
+                    estado_sigla=sigla,
+                    responsavel_cpf=gerador_cpf.generate(mask=True),
+                    responsavel_rg=str(random.randint(10000000, 99999999)),
+                    responsavel_nome=f"Responsável {random.randint(1, 100000)}",
+                    responsavel_data_nascimento=date(1960, 1, 1) + timedelta(days=random.randint(0, 15000)),
+                    responsavel_estado_civil=random.choice(Cliente.ESTADO_CIVIL_CHOICES)[0],
+                    responsavel_email="responsavel@exemplo.com",
+                    email_financeiro="financeiro@exemplo.com",
+                    status_validacao=Cliente.VALIDACAO_VALIDA,
+                    organizacao_id=organizacao_id,
+                    criado_por=usuario,
+                    atualizado_por=usuario,
+                )
+                # bulk_create não chama save(), que preenche cnpj_digits e as chaves de duplicidade
+                lote.append(Cliente(**dados, **Cliente.calcular_derivados(dados)))
+            criados_lote = Cliente.objects.bulk_create(lote)
+            ids = [cliente.pk for cliente in criados_lote]
+            marcar_alterados(ids, organizacao_id)
+            estatisticas.incluir(ids)
+            criados += len(lote)
+
+        self.stdout.write(self.style.SUCCESS(f'{criados} cliente(s) criado(s)'))
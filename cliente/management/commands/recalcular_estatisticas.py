@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from cliente.estatisticas import recalcular
+from cliente.models import ResumoCliente
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o resumo de clientes por UF, município e mês usado em /cliente/clientes/estatisticas/'
+
+    def handle(self, *args, **options):
+        recalcular()
+        self.stdout.write(self.style.SUCCESS(f'{ResumoCliente.objects.count()} linha(s) de resumo recalculada(s)'))
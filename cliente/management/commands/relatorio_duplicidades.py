@@ -0,0 +1,38 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from cliente.duplicidade import JANELA_PADRAO, LIMIAR_PADRAO, gerar_pares_duplicados
+
+COLUNAS = [
+    'id_a', 'id_b', 'pontuacao', 'motivos', 'cnpj_a', 'cnpj_b', 'razao_social_a', 'razao_social_b', 'organizacao_id',
+]
+
+
+class Command(BaseCommand):
+    help = ('Lista em CSV os pares de clientes possivelmente duplicados na mesma organização '
+            '(mesma raiz de CNPJ, nome ou CPF do responsável)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limiar', type=float, default=LIMIAR_PADRAO, help='Pontuação mínima (0 a 1)')
+        parser.add_argument('--janela', type=int, default=JANELA_PADRAO,
+                            help='Vizinhos comparados com cada cliente dentro de um bloco')
+        parser.add_argument('--lote', type=int, default=5000, help='Linhas lidas do banco por vez')
+        parser.add_argument('--saida', help='Arquivo CSV de saída (padrão: saída padrão)')
+
+    def handle(self, *args, **options):
+        arquivo = open(options['saida'], 'w', newline='', encoding='utf-8') if options['saida'] else None
+        try:
+            escritor = csv.writer(arquivo or self.stdout)
+            escritor.writerow(COLUNAS)
+            total = 0
+            for a, b, pontuacao, motivos in gerar_pares_duplicados(
+                limiar=options['limiar'], janela=options['janela'], tamanho_lote=options['lote'],
+            ):
+                escritor.writerow([a.id, b.id, pontuacao, '|'.join(motivos), a.cnpj, b.cnpj,
+                                   a.razao_social, b.razao_social, a.organizacao_id or ''])
+                total += 1
+        finally:
+            if arquivo:
+                arquivo.close()
+        self.stderr.write(self.style.SUCCESS(f'{total} par(es) de possíveis duplicados encontrado(s)'))
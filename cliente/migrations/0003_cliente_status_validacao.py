@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:25
+
+from django.db import migrations, models
+
+
+def marcar_existentes_como_validos(apps, schema_editor):
+    # Clientes já cadastrados foram validados de forma síncrona no IBGE
+    Cliente = apps.get_model('cliente', 'Cliente')
+    Cliente.objects.update(status_validacao='valido')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0002_cliente_atualizado_por_cliente_criado_por_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='erro_validacao',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='status_validacao',
+            field=models.CharField(choices=[('pendente', 'Pendente'), ('valido', 'Válido'), ('invalido', 'Inválido'), ('erro', 'Erro na validação')], default='pendente', max_length=10),
+        ),
+        migrations.RunPython(marcar_existentes_como_validos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:37
+
+from django.db import migrations, models
+
+
+def registrar_clientes_existentes(apps, schema_editor):
+    # Clientes já cadastrados entram na sequência para a primeira sincronização completa
+    Cliente = apps.get_model('cliente', 'Cliente')
+    AlteracaoCliente = apps.get_model('cliente', 'AlteracaoCliente')
+    ids = Cliente.objects.order_by('id').values_list('id', flat=True)
+    AlteracaoCliente.objects.bulk_create(
+        (AlteracaoCliente(cliente_id=cliente_id, operacao='alteracao') for cliente_id in ids.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0003_cliente_status_validacao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlteracaoCliente',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('cliente_id', models.IntegerField(db_index=True)),
+                ('operacao', models.CharField(choices=[('alteracao', 'Criação/alteração'), ('exclusao', 'Exclusão')], default='alteracao', max_length=10)),
+                ('data', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'cliente_alteracoes',
+            },
+        ),
+        migrations.RunPython(registrar_clientes_existentes, migrations.RunPython.noop),
+    ]
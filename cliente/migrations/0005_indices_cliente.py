@@ -0,0 +1,59 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def preencher_cnpj_digits(apps, schema_editor):
+    Cliente = apps.get_model('cliente', 'Cliente')
+    clientes = []
+    for cliente in Cliente.objects.only('id', 'cnpj').iterator(chunk_size=1000):
+        cliente.cnpj_digits = ''.join(filter(str.isdigit, cliente.cnpj))
+        clientes.append(cliente)
+        if len(clientes) >= 1000:
+            Cliente.objects.bulk_update(clientes, ['cnpj_digits'])
+            clientes = []
+    Cliente.objects.bulk_update(clientes, ['cnpj_digits'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0004_alteracao_cliente'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # A coluna é criada como opcional, preenchida e só então recebe a restrição única
+        migrations.AddField(
+            model_name='cliente',
+            name='cnpj_digits',
+            field=models.CharField(editable=False, max_length=14, null=True),
+        ),
+        migrations.RunPython(preencher_cnpj_digits, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='cliente',
+            name='cnpj_digits',
+            field=models.CharField(editable=False, max_length=14, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['estado_sigla', 'cidade_id'], name='cliente_uf_cidade_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['cidade_id'], name='cliente_cidade_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['criado_por', 'data_criacao'], name='cliente_criado_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['data_criacao'], name='cliente_data_criacao_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['data_atualizacao'], name='cliente_data_atual_idx'),
+        ),
+    ]
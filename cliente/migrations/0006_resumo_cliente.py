@@ -0,0 +1,42 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:43
+
+from django.db import migrations, models
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncMonth
+
+
+def montar_resumo(apps, schema_editor):
+    Cliente = apps.get_model('cliente', 'Cliente')
+    ResumoCliente = apps.get_model('cliente', 'ResumoCliente')
+    linhas = (
+        Cliente.objects.annotate(mes=TruncMonth('data_criacao', output_field=DateField()))
+        .values('estado_sigla', 'cidade_nome', 'mes')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    ResumoCliente.objects.bulk_create([ResumoCliente(**linha) for linha in linhas], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0005_indices_cliente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoCliente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estado_sigla', models.CharField(max_length=2)),
+                ('cidade_nome', models.CharField(max_length=255)),
+                ('mes', models.DateField()),
+                ('total', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'cliente_resumo',
+                'constraints': [models.UniqueConstraint(fields=('estado_sigla', 'cidade_nome', 'mes'), name='cliente_resumo_unico')],
+            },
+        ),
+        migrations.RunPython(montar_resumo, migrations.RunPython.noop),
+    ]
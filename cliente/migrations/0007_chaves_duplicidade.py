@@ -0,0 +1,45 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:50
+
+from django.db import migrations, models
+
+from cliente.normalizacao import chave_nome, somente_digitos
+
+TAMANHO_LOTE = 1000
+
+
+def preencher_chaves(apps, schema_editor):
+    Cliente = apps.get_model('cliente', 'Cliente')
+    ultimo_id = 0
+    while True:
+        clientes = list(
+            Cliente.objects.filter(id__gt=ultimo_id).order_by('id')
+            .only('id', 'razao_social', 'responsavel_cpf')[:TAMANHO_LOTE]
+        )
+        if not clientes:
+            break
+        for cliente in clientes:
+            cliente.chave_nome = chave_nome(cliente.razao_social)
+            cliente.responsavel_cpf_digits = somente_digitos(cliente.responsavel_cpf)
+        Cliente.objects.bulk_update(clientes, ['chave_nome', 'responsavel_cpf_digits'])
+        ultimo_id = clientes[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0006_resumo_cliente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='chave_nome',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='responsavel_cpf_digits',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=11),
+        ),
+        migrations.RunPython(preencher_chaves, migrations.RunPython.noop),
+    ]
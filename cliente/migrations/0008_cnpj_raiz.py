@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:10
+
+from django.db import migrations, models
+
+from cliente.normalizacao import raiz_cnpj
+
+TAMANHO_LOTE = 1000
+
+
+def preencher_cnpj_raiz(apps, schema_editor):
+    Cliente = apps.get_model('cliente', 'Cliente')
+    ultimo_id = 0
+    while True:
+        clientes = list(
+            Cliente.objects.filter(id__gt=ultimo_id).order_by('id').only('id', 'cnpj')[:TAMANHO_LOTE]
+        )
+        if not clientes:
+            break
+        for cliente in clientes:
+            cliente.cnpj_raiz = raiz_cnpj(cliente.cnpj)
+        Cliente.objects.bulk_update(clientes, ['cnpj_raiz'])
+        ultimo_id = clientes[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0007_chaves_duplicidade'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='cnpj_raiz',
+            field=models.CharField(default='', editable=False, max_length=8),
+        ),
+        migrations.RunPython(preencher_cnpj_raiz, migrations.RunPython.noop),
+        # Índice criado depois do preenchimento para não ser atualizado a cada lote
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['cnpj_raiz', 'cnpj_digits'], name='cliente_cnpj_raiz_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0008_cnpj_raiz'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='versao',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
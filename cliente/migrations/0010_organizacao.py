@@ -0,0 +1,69 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0009_cliente_versao'),
+        ('empresa', '0005_organizacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='resumocliente',
+            name='cliente_resumo_unico',
+        ),
+        migrations.AddField(
+            model_name='cliente',
+            name='organizacao',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='clientes', to='empresa.organizacao'),
+        ),
+        migrations.AddField(
+            model_name='resumocliente',
+            name='organizacao',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='empresa.organizacao'),
+        ),
+        migrations.AlterField(
+            model_name='cliente',
+            name='chave_nome',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='cliente',
+            name='responsavel_cpf_digits',
+            field=models.CharField(default='', editable=False, max_length=11),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['organizacao', 'data_criacao'], name='cliente_org_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['organizacao', 'estado_sigla', 'cidade_id'], name='cliente_org_uf_cidade_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['organizacao', 'cnpj_raiz', 'cnpj_digits'], name='cliente_org_cnpj_raiz_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['organizacao', 'chave_nome'], name='cliente_org_chave_nome_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['organizacao', 'responsavel_cpf_digits'], name='cliente_org_cpf_resp_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumocliente',
+            constraint=models.UniqueConstraint(fields=('organizacao', 'estado_sigla', 'cidade_nome', 'mes'), name='cliente_resumo_unico'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumocliente',
+            constraint=models.UniqueConstraint(condition=models.Q(('organizacao__isnull', True)), fields=('estado_sigla', 'cidade_nome', 'mes'), name='cliente_resumo_sem_org_unico'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0010_organizacao'),
+        ('empresa', '0005_organizacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cliente',
+            name='data_exclusao',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='ClienteArquivado',
+            fields=[
+                ('versao', models.PositiveIntegerField(default=1, editable=False)),
+                ('cnpj_raiz', models.CharField(default='', editable=False, max_length=8)),
+                ('chave_nome', models.CharField(default='', editable=False, max_length=255)),
+                ('responsavel_cpf_digits', models.CharField(default='', editable=False, max_length=11)),
+                ('razao_social', models.CharField(max_length=255)),
+                ('nome_fantasia', models.CharField(max_length=255)),
+                ('endereco', models.CharField(max_length=255)),
+                ('cep', models.CharField(max_length=9)),
+                ('cidade_id', models.IntegerField()),
+                ('cidade_nome', models.CharField(max_length=255)),
+                ('estado_id', models.IntegerField()),
+                ('estado_sigla', models.CharField(max_length=2)),
+                ('responsavel_cpf', models.CharField(max_length=14)),
+                ('responsavel_rg', models.CharField(max_length=20)),
+                ('responsavel_nome', models.CharField(max_length=255)),
+                ('responsavel_data_nascimento', models.DateField()),
+                ('responsavel_estado_civil', models.CharField(choices=[('solteiro', 'Solteiro(a)'), ('casado', 'Casado(a)'), ('divorciado', 'Divorciado(a)'), ('viuvo', 'Viúvo(a)'), ('uniao_estavel', 'União Estável')], max_length=15)),
+                ('responsavel_email', models.EmailField(max_length=254)),
+                ('email_financeiro', models.EmailField(max_length=254)),
+                ('status_validacao', models.CharField(choices=[('pendente', 'Pendente'), ('valido', 'Válido'), ('invalido', 'Inválido'), ('erro', 'Erro na validação')], default='pendente', max_length=10)),
+                ('erro_validacao', models.CharField(blank=True, default='', max_length=255)),
+                ('data_atualizacao', models.DateTimeField(blank=True, null=True)),
+                ('data_exclusao', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cnpj', models.CharField(max_length=18)),
+                ('cnpj_digits', models.CharField(editable=False, max_length=14)),
+                ('data_criacao', models.DateTimeField()),
+                ('data_arquivamento', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('criado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('organizacao', models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='empresa.organizacao')),
+            ],
+            options={
+                'db_table': 'cliente_arquivado',
+                'indexes': [models.Index(fields=['organizacao', 'data_exclusao'], name='cliente_arq_org_exclusao_idx'), models.Index(fields=['organizacao', 'cnpj_digits'], name='cliente_arq_org_cnpj_idx')],
+            },
+        ),
+    ]
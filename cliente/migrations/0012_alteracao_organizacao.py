@@ -0,0 +1,42 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_organizacao(apps, schema_editor):
+    # Alterações já registradas herdam a organização do cliente (ativo, excluído
+    # ou arquivado); marcas de clientes apagados antes da exclusão lógica ficam
+    # sem organização, como a instalação anterior às organizações
+    AlteracaoCliente = apps.get_model('cliente', 'AlteracaoCliente')
+
+    def organizacao_em(nome_modelo):
+        modelo = apps.get_model('cliente', nome_modelo)
+        return Subquery(modelo.objects.filter(pk=OuterRef('cliente_id')).values('organizacao_id')[:1])
+
+    AlteracaoCliente.objects.update(
+        organizacao_id=Coalesce(organizacao_em('Cliente'), organizacao_em('ClienteArquivado'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0011_exclusao_logica'),
+        ('empresa', '0005_organizacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alteracaocliente',
+            name='organizacao',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='empresa.organizacao'),
+        ),
+        migrations.RunPython(preencher_organizacao, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='alteracaocliente',
+            index=models.Index(fields=['organizacao', 'id'], name='cliente_alt_org_id_idx'),
+        ),
+    ]
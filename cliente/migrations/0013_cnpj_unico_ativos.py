@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0012_alteracao_organizacao'),
+        ('empresa', '0005_organizacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cliente',
+            name='cnpj',
+            field=models.CharField(max_length=18),
+        ),
+        migrations.AlterField(
+            model_name='cliente',
+            name='cnpj_digits',
+            field=models.CharField(editable=False, max_length=14),
+        ),
+        migrations.AddIndex(
+            model_name='cliente',
+            index=models.Index(fields=['cnpj_digits'], name='cliente_cnpj_digits_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.UniqueConstraint(condition=models.Q(('data_exclusao__isnull', True)), fields=('cnpj_digits',), name='cliente_cnpj_ativo_unico'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0013_cnpj_unico_ativos'),
+        ('empresa', '0005_organizacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='cliente',
+            name='cliente_cnpj_ativo_unico',
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.UniqueConstraint(condition=models.Q(('data_exclusao__isnull', True)), fields=('organizacao', 'cnpj_digits'), name='cliente_org_cnpj_ativo_unico'),
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.UniqueConstraint(condition=models.Q(('data_exclusao__isnull', True), ('organizacao__isnull', True)), fields=('cnpj_digits',), name='cliente_sem_org_cnpj_ativo_unico'),
+        ),
+    ]
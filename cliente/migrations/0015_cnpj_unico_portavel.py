@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 20:05
+
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cliente', '0014_cnpj_unico_por_organizacao'),
+        ('empresa', '0005_organizacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='cliente',
+            name='cliente_org_cnpj_ativo_unico',
+        ),
+        migrations.RemoveConstraint(
+            model_name='cliente',
+            name='cliente_sem_org_cnpj_ativo_unico',
+        ),
+        migrations.AddConstraint(
+            model_name='cliente',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('organizacao', 0), models.Case(models.When(data_exclusao__isnull=True, then='cnpj_digits')), name='cliente_org_cnpj_ativo_unico'),
+        ),
+    ]
@@ -1,5 +1,17 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Coalesce
 from django.core.validators import RegexValidator
+from django.utils import timezone
+
+from app.concorrencia import ModeloVersionado
+from empresa.models import OrganizacaoQuerySet
+
+from . import normalizacao
+
+# Restrição de CNPJ único entre os clientes ativos de cada organização
+RESTRICAO_CNPJ_UNICO = 'cliente_org_cnpj_ativo_unico'
+
 
 class Estado(models.Model):
     nome = models.CharField(max_length=50)
@@ -15,7 +27,39 @@ class Cidade(models.Model):
     def __str__(self):
         return f"{self.nome} - {self.estado.sigla}"
     
-class Cliente(models.Model):
+class ClienteQuerySet(OrganizacaoQuerySet):
+
+    def excluir(self):
+        """
+        Exclusão lógica: marca data_exclusao com um único UPDATE. Os registros
+        saem das consultas de Cliente.objects e são movidos para a tabela de
+        arquivados pelo comando arquivar_clientes.
+        """
+        return self.update(data_exclusao=timezone.now(), versao=F('versao') + 1)
+
+
+class ClientesAtivosManager(models.Manager.from_queryset(ClienteQuerySet)):
+    """Manager padrão: somente clientes não excluídos"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(data_exclusao__isnull=True)
+
+
+class DadosCliente(ModeloVersionado):
+    """
+    Campos de clientes, comuns à tabela de clientes ativos e à de arquivados
+    """
+    VALIDACAO_PENDENTE = 'pendente'
+    VALIDACAO_VALIDA = 'valido'
+    VALIDACAO_INVALIDA = 'invalido'
+    VALIDACAO_ERRO = 'erro'
+    STATUS_VALIDACAO_CHOICES = [
+        (VALIDACAO_PENDENTE, 'Pendente'),
+        (VALIDACAO_VALIDA, 'Válido'),
+        (VALIDACAO_INVALIDA, 'Inválido'),
+        (VALIDACAO_ERRO, 'Erro na validação'),
+    ]
+
     ESTADO_CIVIL_CHOICES = [
         ('solteiro', 'Solteiro(a)'),
         ('casado', 'Casado(a)'),
@@ -24,7 +68,24 @@ class Cliente(models.Model):
         ('uniao_estavel', 'União Estável'),
     ]
 
-    cnpj = models.CharField(max_length=18, unique=True)
+    # Organização que atende o cliente; as consultas das views começam por ela (índices *_org_*)
+    organizacao = models.ForeignKey(
+        'empresa.Organizacao',
+        related_name='clientes',
+        on_delete=models.PROTECT,
+        null=True,
+        editable=False,
+        db_index=False
+    )
+    # Únicos por organização entre os clientes ativos (restrição RESTRICAO_CNPJ_UNICO de Cliente)
+    cnpj = models.CharField(max_length=18)
+    # CNPJ só com dígitos, para buscas independentes da máscara
+    cnpj_digits = models.CharField(max_length=14, editable=False)
+    # Raiz do CNPJ (8 primeiros dígitos): matriz e filiais da mesma empresa
+    cnpj_raiz = models.CharField(max_length=8, editable=False, default='')
+    # Chaves de bloqueio da detecção de duplicidades (cliente/duplicidade.py)
+    chave_nome = models.CharField(max_length=255, editable=False, default='')
+    responsavel_cpf_digits = models.CharField(max_length=11, editable=False, default='')
     razao_social = models.CharField(max_length=255)
     nome_fantasia = models.CharField(max_length=255)
     endereco = models.CharField(max_length=255)
@@ -47,6 +108,12 @@ class Cliente(models.Model):
     # Email financeiro
     email_financeiro = models.EmailField()
 
+    # Validação de estado/município no IBGE, feita em segundo plano pela fila de tarefas
+    status_validacao = models.CharField(
+        max_length=10, choices=STATUS_VALIDACAO_CHOICES, default=VALIDACAO_PENDENTE
+    )
+    erro_validacao = models.CharField(max_length=255, blank=True, default='')
+
     # Campos para auditoria
     criado_por = models.ForeignKey(
         'auth.User', 
@@ -63,6 +130,177 @@ class Cliente(models.Model):
     
     data_criacao = models.DateTimeField(auto_now_add=True)
     data_atualizacao = models.DateTimeField(null=True, blank=True)
+    # Exclusão lógica; o registro continua na tabela até ser arquivado
+    data_exclusao = models.DateTimeField(null=True, blank=True, editable=False)
     
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.nome_fantasia} ({self.cnpj})"
+
+
+class Cliente(DadosCliente):
+    # Somente clientes ativos; `todos` inclui os excluídos ainda não arquivados
+    objects = ClientesAtivosManager()
+    todos = ClienteQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            # Filtro por UF e por UF + município
+            models.Index(fields=['estado_sigla', 'cidade_id'], name='cliente_uf_cidade_idx'),
+            models.Index(fields=['cidade_id'], name='cliente_cidade_idx'),
+            # Clientes de um usuário ordenados por data de criação
+            models.Index(fields=['criado_por', 'data_criacao'], name='cliente_criado_data_idx'),
+            # Faixas de data e MAX() usados no ETag da listagem
+            models.Index(fields=['data_criacao'], name='cliente_data_criacao_idx'),
+            models.Index(fields=['data_atualizacao'], name='cliente_data_atual_idx'),
+            # Matriz e filiais de uma empresa, já em ordem de CNPJ
+            models.Index(fields=['cnpj_raiz', 'cnpj_digits'], name='cliente_cnpj_raiz_idx'),
+            # Busca por CNPJ só com dígitos, em qualquer organização
+            models.Index(fields=['cnpj_digits'], name='cliente_cnpj_digits_idx'),
+            # Consultas das views, sempre restritas à organização do usuário
+            models.Index(fields=['organizacao', 'data_criacao'], name='cliente_org_data_idx'),
+            models.Index(fields=['organizacao', 'estado_sigla', 'cidade_id'], name='cliente_org_uf_cidade_idx'),
+            models.Index(fields=['organizacao', 'cnpj_raiz', 'cnpj_digits'], name='cliente_org_cnpj_raiz_idx'),
+            # Chaves de bloqueio da detecção de duplicidades, que não cruza organizações
+            models.Index(fields=['organizacao', 'chave_nome'], name='cliente_org_chave_nome_idx'),
+            models.Index(fields=['organizacao', 'responsavel_cpf_digits'], name='cliente_org_cpf_resp_idx'),
+        ]
+        constraints = [
+            # CNPJ único por organização entre os clientes ativos: o de um cliente
+            # excluído (CASE nulo, que não conflita em UNIQUE) pode ser cadastrado de
+            # novo na hora, sem esperar o arquivamento. Índice por expressões e não
+            # restrição condicional, que o MySQL não cria; sem organização vale 0.
+            models.UniqueConstraint(
+                Coalesce('organizacao', 0),
+                models.Case(models.When(data_exclusao__isnull=True, then='cnpj_digits')),
+                name=RESTRICAO_CNPJ_UNICO,
+            ),
+        ]
+
+    # Campos calculados a partir de outros campos: (campo de origem, campo derivado, função)
+    CAMPOS_DERIVADOS = [
+        ('cnpj', 'cnpj_digits', normalizacao.somente_digitos),
+        ('cnpj', 'cnpj_raiz', normalizacao.raiz_cnpj),
+        ('razao_social', 'chave_nome', normalizacao.chave_nome),
+        ('responsavel_cpf', 'responsavel_cpf_digits', normalizacao.somente_digitos),
+    ]
+
+    @classmethod
+    def calcular_derivados(cls, valores):
+        """
+        Retorna os campos derivados dos valores informados, para gravações
+        que não passam pelo save() (update/bulk_create)
+        """
+        return {
+            derivado: funcao(valores[origem])
+            for origem, derivado, funcao in cls.CAMPOS_DERIVADOS
+            if origem in valores
+        }
+
+    def save(self, *args, **kwargs):
+        origens = {origem: getattr(self, origem) for origem, _, _ in self.CAMPOS_DERIVADOS}
+        for campo, valor in self.calcular_derivados(origens).items():
+            setattr(self, campo, valor)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields,
+                *(derivado for origem, derivado, _ in self.CAMPOS_DERIVADOS if origem in update_fields),
+            }
+        super().save(*args, **kwargs)
+
+
+class ClienteArquivado(DadosCliente):
+    """
+    Clientes excluídos, movidos em lotes da tabela de clientes (comando
+    arquivar_clientes) para que ela e os seus índices guardem só os ativos.
+    Mantém o id original e é consultado em /cliente/arquivados/.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    organizacao = models.ForeignKey(
+        'empresa.Organizacao', related_name='+', on_delete=models.PROTECT, null=True, editable=False,
+        db_index=False
+    )
+    criado_por = models.ForeignKey('auth.User', related_name='+', on_delete=models.SET_NULL, null=True)
+    atualizado_por = models.ForeignKey('auth.User', related_name='+', on_delete=models.SET_NULL, null=True)
+    # Copiada do cliente, sem auto_now_add
+    data_criacao = models.DateTimeField()
+    data_arquivamento = models.DateTimeField(auto_now_add=True)
+
+    objects = OrganizacaoQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'cliente_arquivado'
+        indexes = [
+            models.Index(fields=['organizacao', 'data_exclusao'], name='cliente_arq_org_exclusao_idx'),
+            models.Index(fields=['organizacao', 'cnpj_digits'], name='cliente_arq_org_cnpj_idx'),
+        ]
+
+class AlteracaoCliente(models.Model):
+    """
+    Sequência de alterações de clientes usada na sincronização incremental.
+    O id é o token de sincronização; exclusões ficam registradas como marcas
+    (tombstones) para que os consumidores removam o cliente localmente. Cada
+    organização lê só as suas alterações, pela faixa do índice (organizacao, id).
+    """
+    ALTERACAO = 'alteracao'
+    EXCLUSAO = 'exclusao'
+    OPERACAO_CHOICES = [
+        (ALTERACAO, 'Criação/alteração'),
+        (EXCLUSAO, 'Exclusão'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    organizacao = models.ForeignKey(
+        'empresa.Organizacao', on_delete=models.CASCADE, null=True, db_index=False, related_name='+'
+    )
+    cliente_id = models.IntegerField(db_index=True)
+    operacao = models.CharField(max_length=10, choices=OPERACAO_CHOICES, default=ALTERACAO)
+    data = models.DateTimeField(auto_now_add=True)
+
+    objects = OrganizacaoQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'cliente_alteracoes'
+        indexes = [
+            models.Index(fields=['organizacao', 'id'], name='cliente_alt_org_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.operacao} cliente {self.cliente_id}"
+
+
+class ResumoCliente(models.Model):
+    """
+    Contagem materializada de clientes por organização, UF, município e mês
+    de criação, mantida de forma incremental nas gravações (cliente/estatisticas.py) e
+    recalculada pelo comando recalcular_estatisticas
+    """
+    organizacao = models.ForeignKey(
+        'empresa.Organizacao', on_delete=models.CASCADE, null=True, db_index=False
+    )
+    estado_sigla = models.CharField(max_length=2)
+    cidade_nome = models.CharField(max_length=255)
+    mes = models.DateField()
+    total = models.IntegerField(default=0)
+
+    objects = OrganizacaoQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'cliente_resumo'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organizacao', 'estado_sigla', 'cidade_nome', 'mes'], name='cliente_resumo_unico'
+            ),
+            # NULL não conflita em UNIQUE: linhas sem organização têm a sua própria restrição
+            models.UniqueConstraint(
+                fields=['estado_sigla', 'cidade_nome', 'mes'],
+                condition=models.Q(organizacao__isnull=True),
+                name='cliente_resumo_sem_org_unico',
+            ),
+        ]
+
     def __str__(self):
-        return f"{self.nome_fantasia} ({self.cnpj})"
\ No newline at end of file
+        return f"{self.estado_sigla}/{self.cidade_nome} {self.mes:%Y-%m}: {self.total}"
@@ -0,0 +1,36 @@
+import re
+import unicodedata
+
+# Sufixos societários e palavras sem valor para comparar razões sociais
+PALAVRAS_IGNORADAS = {
+    'ltda', 'me', 'epp', 'eireli', 'sa', 's', 'a', 'cia', 'companhia', 'mei', 'slu',
+    'de', 'da', 'do', 'das', 'dos', 'e', 'em',
+}
+RE_NAO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+
+
+def somente_digitos(valor):
+    return ''.join(filter(str.isdigit, valor or ''))
+
+
+def raiz_cnpj(valor):
+    """
+    Oito primeiros dígitos do CNPJ, comuns à matriz e às filiais
+    """
+    return somente_digitos(valor)[:8]
+
+
+def tokens_nome(nome):
+    """
+    Quebra o nome em palavras sem acentos, pontuação, caixa e sufixos societários
+    """
+    texto = unicodedata.normalize('NFKD', nome or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return [token for token in RE_NAO_ALFANUMERICO.split(texto) if token and token not in PALAVRAS_IGNORADAS]
+
+
+def chave_nome(nome):
+    """
+    Chave de bloqueio do nome: palavras normalizadas, sem repetição e em ordem
+    alfabética ("Empresa Teste Ltda." e "TESTE EMPRESA LTDA" geram a mesma chave)
+    """
+    return ' '.join(sorted(set(tokens_nome(nome))))[:255]
@@ -0,0 +1,28 @@
+from functools import partial
+
+from django.db import transaction
+
+from app.cache import CachePorOrganizacao
+
+# Respostas de leitura de clientes (listagem e detalhe), em um namespace por
+# organização. A versão do namespace funciona como contador de geração: toda
+# gravação gera uma nova e, como ela é conferida no L2 a cada leitura, as
+# alterações aparecem na hora em todos os workers que usam o mesmo cache
+# compartilhado (REDIS_URL, exigido fora do DEBUG). Uma resposta montada durante
+# uma gravação é guardada na geração lida antes de consultar o banco e, por
+# isso, descartada (app/cache.py).
+cache_respostas_clientes = CachePorOrganizacao('clientes', timeout=600, intervalo_versao=0)
+
+
+def invalidar_respostas_clientes(organizacao_ids):
+    """
+    Descarta as respostas em cache das organizações informadas. Dentro de uma
+    transação invalida de novo após o commit: uma leitura que começou depois
+    da primeira invalidação ainda vê os dados anteriores ao commit, e a nova
+    geração faz com que a resposta dela seja descartada.
+    """
+    em_transacao = transaction.get_connection().in_atomic_block
+    for organizacao_id in set(organizacao_ids):
+        cache_respostas_clientes.invalidar(organizacao_id)
+        if em_transacao:
+            transaction.on_commit(partial(cache_respostas_clientes.invalidar, organizacao_id))
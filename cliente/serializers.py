@@ -1,9 +1,24 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from .models import Cliente, Estado, Cidade
+
+from app.campos import CamposDinamicosSerializerMixin
+from empresa.organizacao import organizacao_da_requisicao
+from usuario.serializers import UsuarioResumoSerializer
+from .models import RESTRICAO_CNPJ_UNICO, Cliente, ClienteArquivado, Estado, Cidade
+from .normalizacao import somente_digitos
 from .validators.cnpj_validator import validar_cnpj
 from .validators.cpf_validator import validar_cpf
-from .services.cnpj_service import consultar_cnpj
-from .services.ibge_service import consultar_estado_por_id, consultar_municipio_por_id
+from .validators.localidade_validator import validar_localidade
+
+MENSAGEM_CNPJ_DUPLICADO = 'Já existe um cliente com este CNPJ.'
+
+
+def cnpj_duplicado(erro):
+    """
+    Indica se o IntegrityError veio da restrição de CNPJ único, cujo nome
+    aparece na mensagem de erro de todos os bancos suportados
+    """
+    return RESTRICAO_CNPJ_UNICO in str(erro)
 
 class EstadoSerializer(serializers.ModelSerializer):
     class Meta:
@@ -15,27 +30,69 @@ class CidadeSerializer(serializers.ModelSerializer):
         model = Cidade
         fields = ['id', 'nome', 'estado']
 
-class ClienteSerializer(serializers.ModelSerializer):
+class ClienteSerializer(CamposDinamicosSerializerMixin, serializers.ModelSerializer):
     # Adicione campos virtuais para compatibilidade com o formato antigo
     cidade = serializers.IntegerField(required=False, write_only=True)
     estado = serializers.IntegerField(required=False, write_only=True)
+    # Relacionamentos que podem ser expandidos com ?expand=criado_por,atualizado_por
+    expansoes = {'criado_por': UsuarioResumoSerializer, 'atualizado_por': UsuarioResumoSerializer}
     
     class Meta:
         model = Cliente
         fields = '__all__'
-        read_only_fields = ['data_criacao', 'data_atualizacao']
+        read_only_fields = ['data_criacao', 'data_atualizacao', 'status_validacao', 'erro_validacao']
         # Não exigir campos que serão preenchidos no validate
         extra_kwargs = {
             'cidade_nome': {'required': False},
-            'estado_sigla': {'required': False}
+            'estado_sigla': {'required': False},
         }
     
     def validate_cnpj(self, value):
-        return validar_cnpj(value)
+        try:
+            cnpj = validar_cnpj(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        # Compara só os dígitos (com ou sem máscara) e só com os clientes ativos
+        # da mesma organização, como a restrição RESTRICAO_CNPJ_UNICO
+        existentes = Cliente.objects.da_organizacao(self._organizacao_id()).filter(
+            cnpj_digits=somente_digitos(cnpj)
+        )
+        if self.instance is not None:
+            existentes = existentes.exclude(pk=self.instance.pk)
+        if existentes.exists():
+            raise serializers.ValidationError(MENSAGEM_CNPJ_DUPLICADO)
+        return cnpj
     
     def validate_responsavel_cpf(self, value):
-        return validar_cpf(value)
+        try:
+            return validar_cpf(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
         
+    def _organizacao_id(self):
+        # Na atualização vale a organização do cliente; no cadastro, a da requisição
+        if self.instance is not None:
+            return self.instance.organizacao_id
+        request = self.context.get('request')
+        return organizacao_da_requisicao(request) if request is not None else None
+
+    def create(self, validated_data):
+        return self._gravar(super().create, validated_data)
+
+    def update(self, instance, validated_data):
+        return self._gravar(super().update, instance, validated_data)
+
+    def _gravar(self, gravar, *args):
+        # Gravações simultâneas do mesmo CNPJ passam as duas pela validação; a
+        # segunda esbarra na restrição única e vira 400 em vez de 500
+        try:
+            with transaction.atomic():
+                return gravar(*args)
+        except IntegrityError as e:
+            if not cnpj_duplicado(e):
+                raise
+            raise serializers.ValidationError({'cnpj': [MENSAGEM_CNPJ_DUPLICADO]})
+
     def validate(self, data):
         # Mapear campos antigos para novos
         if 'cidade' in data:
@@ -44,22 +101,21 @@ class ClienteSerializer(serializers.ModelSerializer):
         if 'estado' in data:
             data['estado_id'] = data.pop('estado')
         
-        # Validar se o estado existe
-        try:
-            estado_id = data.get('estado_id')
-            if estado_id:
-                estado_data = consultar_estado_por_id(estado_id)
-                data['estado_sigla'] = estado_data["sigla"]
-        except Exception as e:
-            raise serializers.ValidationError({"estado_id": f"Erro ao validar estado: {str(e)}"})
-        
-        # Validar se o município existe
-        try:
-            cidade_id = data.get('cidade_id')
-            if cidade_id:
-                municipio_data = consultar_municipio_por_id(cidade_id)
-                data['cidade_nome'] = municipio_data["nome"]
-        except Exception as e:
-            raise serializers.ValidationError({"cidade_id": f"Erro ao validar município: {str(e)}"})
-            
-        return data
\ No newline at end of file
+        # A existência do estado e do município no IBGE é validada em segundo
+        # plano (cliente/tarefas.py), que também preenche estado_sigla e cidade_nome;
+        # aqui só se confere que o município é do estado, sem consultar o IBGE
+        if 'estado_id' in data or 'cidade_id' in data:
+            try:
+                validar_localidade(
+                    data.get('estado_id', getattr(self.instance, 'estado_id', None)),
+                    data.get('cidade_id', getattr(self.instance, 'cidade_id', None)),
+                )
+            except ValueError as e:
+                raise serializers.ValidationError({'cidade_id': [str(e)]})
+        return data
+
+
+class ClienteArquivadoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ClienteArquivado
+        fields = '__all__'
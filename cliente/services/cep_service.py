@@ -1,12 +1,16 @@
 import requests
+from django.conf import settings
+
+from app.disjuntor import obter_disjuntor
+
+disjuntor = obter_disjuntor('viacep')
 
 def consultar_cep(cep):
     """
     Consulta os dados de um CEP usando API da ViaCEP
     """
     cep_numerico = ''.join(filter(str.isdigit, cep))
-    response = requests.get(f'https://viacep.com.br/ws/{cep_numerico}/json/')
-    data = response.json()
+    data = disjuntor.chamar_json(requests.get, f'{settings.VIACEP_URL}/{cep_numerico}/json/', timeout=settings.APIS_EXTERNAS_TIMEOUT)
 
     if 'erro' in data:
         raise ValueError("CEP não encontrado")
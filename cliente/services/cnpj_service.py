@@ -1,24 +1,28 @@
 import requests
+from django.conf import settings
+
+from app.disjuntor import obter_disjuntor
+
+disjuntor = obter_disjuntor('receitaws')
 
 def consultar_cnpj(cnpj):
     """"
     Consulta os dados de um CNPJ usando API da ReceitaWS
     """
     cpnj_numerico = ''.join(filter(str.isdigit, cnpj))
-    response = requests.get(f'https://www.receitaws.com.br/v1/cnpj/{cpnj_numerico}')
-    data = response.json()
+    data = disjuntor.chamar_json(requests.get, f'{settings.RECEITAWS_URL}/cnpj/{cpnj_numerico}', timeout=settings.APIS_EXTERNAS_TIMEOUT)
 
     if 'status' in data and data['status'] == 'ERROR':
         raise ValueError(data.get('message', 'Erro na consulta do CNPJ'))
 
     empresa_dados = {
         'cnpj': data.get('cnpj', ''),
-        'razao_social' = data.get('nome', ''),
-        'nome_fantasia' = data.get('fantasia', ''),
-        'endereco' = f"{data.get('logradouro', ''), data.get('numero', '')}, {data.get('bairro', '')}, {data.get('complemento', '')}".strip(','),
-        'cep'= data.get('cep', ''),
-        'municipio' = data.get('municipio', ''),
-        'uf' = data.get('uf', ''),
+        'razao_social': data.get('nome', ''),
+        'nome_fantasia': data.get('fantasia', ''),
+        'endereco': f"{data.get('logradouro', '')}, {data.get('numero', '')}, {data.get('bairro', '')}, {data.get('complemento', '')}".strip(','),
+        'cep': data.get('cep', ''),
+        'municipio': data.get('municipio', ''),
+        'uf': data.get('uf', ''),
     }
 
     return empresa_dados
\ No newline at end of file
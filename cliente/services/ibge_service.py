@@ -1,11 +1,15 @@
 import requests
+from django.conf import settings
+
+from app.disjuntor import obter_disjuntor
+
+disjuntor = obter_disjuntor('ibge')
 
 def consultar_estado_por_id(estado_id):
     """
     Consulta os dados de um estado usando API do IBGE
     """
-    response = requests.get(f'https://servicodados.ibge.gov.br/api/v1/localidades/estados/{estado_id}')
-    data = response.get(url)
+    response = disjuntor.chamar(requests.get, f'{settings.IBGE_URL}/localidades/estados/{estado_id}', timeout=settings.APIS_EXTERNAS_TIMEOUT)
 
     if response.status_code == 404:
         raise ValueError("Estado não encontrado")
@@ -21,8 +25,8 @@ def consultar_municipio_por_id(municipio_id):
     """
     Consulta detalhes de um municipio usando o seu ID do IBGE
     """
-    url = f'https://servicodados.ibge.gov.br/api/v1/localidades/municipios/{municipio_id}'
-    response = requests.get(url)
+    url = f'{settings.IBGE_URL}/localidades/municipios/{municipio_id}'
+    response = disjuntor.chamar(requests.get, url, timeout=settings.APIS_EXTERNAS_TIMEOUT)
 
     if response.status_code == 404:
         raise ValueError("Município não encontrado")
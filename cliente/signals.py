@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Estado, Cidade, Cliente
+from .localidades import invalidar_versao_localidades
+from .respostas import invalidar_respostas_clientes
+
+
+@receiver([post_save, post_delete], sender=Estado)
+@receiver([post_save, post_delete], sender=Cidade)
+def atualizar_versao_localidades(sender, **kwargs):
+    """Invalida o snapshot de localidades quando estados ou cidades mudam"""
+    invalidar_versao_localidades()
+
+
+@receiver([post_save, post_delete], sender=Cliente)
+def atualizar_geracao_clientes(sender, instance, **kwargs):
+    """Invalida as respostas em cache da organização do cliente salvo ou removido"""
+    invalidar_respostas_clientes([instance.organizacao_id])
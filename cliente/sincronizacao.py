@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import AlteracaoCliente
+from .respostas import invalidar_respostas_clientes
+
+# Alterações lidas por página do feed de sincronização
+LIMITE_PADRAO = 500
+LIMITE_MAXIMO = 1000
+
+
+def _registrar(ids, operacao, organizacao_id):
+    AlteracaoCliente.objects.bulk_create(
+        [
+            AlteracaoCliente(organizacao_id=organizacao_id, cliente_id=cliente_id, operacao=operacao)
+            for cliente_id in ids
+        ],
+        batch_size=LIMITE_MAXIMO,
+    )
+    # Toda gravação de clientes passa por aqui: renova a geração das respostas em cache da organização
+    invalidar_respostas_clientes([organizacao_id])
+
+
+def marcar_alterados(ids, organizacao_id=None):
+    """
+    Registra na sequência de sincronização os clientes criados ou alterados,
+    todos da organização informada. Deve ser chamado em toda gravação,
+    inclusive UPDATEs em massa.
+    """
+    _registrar(ids, AlteracaoCliente.ALTERACAO, organizacao_id)
+
+
+def marcar_removidos(ids, organizacao_id=None):
+    """
+    Registra as marcas de exclusão dos clientes removidos da organização
+    """
+    _registrar(ids, AlteracaoCliente.EXCLUSAO, organizacao_id)
+
+
+def buscar_alteracoes(token, limite=LIMITE_PADRAO, organizacao_id=None):
+    """
+    Retorna (ids alterados, ids removidos, próximo token, tem_mais) com as
+    alterações da organização posteriores ao token, lendo apenas a faixa do
+    índice (organizacao, id). Um cliente alterado várias vezes aparece uma
+    única vez, com a última operação.
+
+    Os ids são alocados na inserção, mas só ficam visíveis no commit, que pode
+    acontecer fora de ordem (ex.: atualizar_em_lote grava as marcas dentro da
+    sua transação). Para o token não passar de um id menor ainda não
+    confirmado, a página para na primeira marca com menos de
+    SINCRONIZACAO_ATRASO segundos; ela é entregue numa próxima leitura.
+    """
+    limite_recentes = timezone.now() - timedelta(seconds=settings.SINCRONIZACAO_ATRASO)
+    linhas = list(
+        AlteracaoCliente.objects.da_organizacao(organizacao_id).filter(id__gt=token)
+        .order_by('id')
+        .values_list('id', 'cliente_id', 'operacao', 'data')[:limite + 1]
+    )
+    for indice, (_, _, _, data) in enumerate(linhas):
+        if data > limite_recentes:
+            linhas = linhas[:indice]
+            break
+    tem_mais = len(linhas) > limite
+    linhas = linhas[:limite]
+
+    ultima_operacao = {}
+    for _, cliente_id, operacao, _ in linhas:
+        ultima_operacao[cliente_id] = operacao
+    alterados = [cliente_id for cliente_id, operacao in ultima_operacao.items() if operacao == AlteracaoCliente.ALTERACAO]
+    removidos = [cliente_id for cliente_id, operacao in ultima_operacao.items() if operacao == AlteracaoCliente.EXCLUSAO]
+    proximo_token = linhas[-1][0] if linhas else token
+    return alterados, removidos, proximo_token, tem_mais
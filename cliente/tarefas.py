@@ -0,0 +1,72 @@
+from django.db.models import F
+from django.utils import timezone
+
+from fila.registro import tarefa, enfileirar
+from .models import Cliente
+from . import estatisticas
+from .sincronizacao import marcar_alterados
+from .services.ibge_service import consultar_estado_por_id, consultar_municipio_por_id
+
+VALIDAR_LOCALIDADE = 'cliente.validar_localidade'
+
+
+def agendar_validacao_localidade(cliente):
+    """
+    Enfileira a validação de estado/município do cliente no IBGE
+    """
+    referencia = cliente.data_atualizacao or cliente.data_criacao
+    return enfileirar(
+        VALIDAR_LOCALIDADE,
+        {'cliente_id': cliente.pk},
+        prioridade=10,
+        chave_idempotencia=f"{VALIDAR_LOCALIDADE}:{cliente.pk}:{referencia.isoformat()}",
+    )
+
+
+def _registrar_falha(payload, erro):
+    clientes = Cliente.objects.filter(pk=payload['cliente_id'])
+    atualizados = clientes.update(
+        status_validacao=Cliente.VALIDACAO_ERRO,
+        erro_validacao=str(erro)[:255],
+        data_atualizacao=timezone.now(),
+        versao=F('versao') + 1,
+    )
+    if atualizados:
+        marcar_alterados([payload['cliente_id']], clientes.values_list('organizacao_id', flat=True).first())
+
+
+@tarefa(VALIDAR_LOCALIDADE, ao_falhar=_registrar_falha)
+def validar_localidade(cliente_id):
+    """
+    Valida no IBGE se o estado e o município do cliente existem e preenche
+    estado_sigla e cidade_nome. Erros de comunicação geram novas tentativas.
+    """
+    cliente = Cliente.objects.filter(pk=cliente_id).values('organizacao_id', 'estado_id', 'cidade_id').first()
+    if cliente is None:
+        return
+
+    try:
+        estado_data = consultar_estado_por_id(cliente['estado_id'])
+        municipio_data = consultar_municipio_por_id(cliente['cidade_id'])
+    except ValueError as e:
+        atualizados = Cliente.objects.filter(pk=cliente_id).update(
+            status_validacao=Cliente.VALIDACAO_INVALIDA,
+            erro_validacao=str(e),
+            data_atualizacao=timezone.now(),
+            versao=F('versao') + 1,
+        )
+    else:
+        # estado_sigla e cidade_nome mudam a chave do resumo de estatísticas
+        with estatisticas.acompanhar([cliente_id]):
+            atualizados = Cliente.objects.filter(pk=cliente_id).update(
+                estado_sigla=estado_data['sigla'],
+                cidade_nome=municipio_data['nome'],
+                status_validacao=Cliente.VALIDACAO_VALIDA,
+                erro_validacao='',
+                data_atualizacao=timezone.now(),
+                versao=F('versao') + 1,
+            )
+    # Só entra na sequência de sincronização se o cliente ainda existir
+    if atualizados:
+        marcar_alterados([cliente_id], cliente['organizacao_id'])
+
@@ -1,13 +1,41 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth.models import User
 from unittest.mock import patch, MagicMock
-from datetime import date
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+import json
+import random
+import string
+import tracemalloc
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
 
-from .models import Estado, Cidade, Cliente
-from .serializers import EstadoSerializer, CidadeSerializer, ClienteSerializer
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from app.cache import limpar_caches
+from app.concorrencia import ConflitoVersao
+from app.renderers import ORJSONRenderer
+from empresa.models import MembroOrganizacao, Organizacao
+from usuario.serializers import TokenOrganizacaoSerializer
+
+from .duplicidade import gerar_pares_duplicados
+from .estatisticas import obter_estatisticas, recalcular
+from .respostas import cache_respostas_clientes
+from .normalizacao import chave_nome
+from .models import AlteracaoCliente, Estado, Cidade, Cliente, ClienteArquivado, ResumoCliente
+from fila.worker import executar_pendentes
+from .serializers import EstadoSerializer, CidadeSerializer, ClienteSerializer, cnpj_duplicado
+from .sincronizacao import marcar_alterados
+from .views import ClienteViewSet
 
 class ModelTestCase(TestCase):
     """Testes para os modelos Estado, Cidade e Cliente"""
@@ -285,4 +313,1342 @@ class ExternalAPITestCase(APITestCase):
         response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
\ No newline at end of file
+        self.assertEqual(len(response.data), 2)
+
+
+class ConditionalGetTestCase(APITestCase):
+    """Testes para ETag, Last-Modified e respostas 304 das rotas de leitura"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.estado = Estado.objects.create(nome="São Paulo", sigla="SP")
+        self.cidade = Cidade.objects.create(nome="São Paulo", estado=self.estado)
+        self.cliente = Cliente.objects.create(
+            cnpj="61.364.012/0001-06",
+            razao_social="Empresa Teste LTDA",
+            nome_fantasia="Empresa Teste",
+            endereco="Rua Teste, 123",
+            cep="01234-567",
+            cidade_id=3550308,
+            cidade_nome="São Paulo",
+            estado_id=35,
+            estado_sigla="SP",
+            responsavel_cpf="529.982.247-25",
+            responsavel_rg="12.345.678-9",
+            responsavel_nome="João da Silva",
+            responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado",
+            responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+    
+    def test_estado_list_not_modified(self):
+        """Teste para retornar 304 quando o ETag de estados não mudou"""
+        url = reverse('estado-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('max-age=3600', response['Cache-Control'])
+        etag = response['ETag']
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_estado_etag_muda_apos_alteracao(self):
+        """Teste para invalidar o snapshot de localidades ao alterar um estado"""
+        url = reverse('cidade-list')
+        etag = self.client.get(url)['ETag']
+        
+        self.estado.nome = "Estado de São Paulo"
+        self.estado.save()
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_cliente_retrieve_not_modified(self):
+        """Teste para ETag e Last-Modified no detalhe do cliente"""
+        url = reverse('cliente-detail', args=[self.cliente.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('Last-Modified', response)
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cliente_retrieve_pk_invalido(self):
+        """Teste para responder 404 (e não 500) a um id não numérico no detalhe"""
+        response = self.client.get('/cliente/clientes/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cliente_list_etag_muda_apos_atualizacao(self):
+        """Teste para invalidar o ETag da listagem quando um cliente é atualizado"""
+        url = reverse('cliente-list')
+        etag = self.client.get(url)['ETag']
+        
+        response = self.client.patch(
+            reverse('cliente-detail', args=[self.cliente.id]),
+            {'nome_fantasia': 'Outro Nome'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ValidacaoAssincronaTestCase(APITestCase):
+    """Testes para a validação de estado/município em segundo plano"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.cliente_data = {
+            "cnpj": "11222333000181",
+            "razao_social": "Empresa Teste LTDA",
+            "nome_fantasia": "Empresa Teste",
+            "endereco": "Rua Teste, 123",
+            "cep": "01234567",
+            "cidade_id": 3550308,
+            "estado_id": 35,
+            "responsavel_cpf": "52998224725",
+            "responsavel_rg": "123456789",
+            "responsavel_nome": "João da Silva",
+            "responsavel_data_nascimento": "1980-01-01",
+            "responsavel_estado_civil": "casado",
+            "responsavel_email": "joao@empresa.com",
+            "email_financeiro": "financeiro@empresa.com"
+        }
+    
+    @patch('cliente.tarefas.consultar_municipio_por_id')
+    @patch('cliente.tarefas.consultar_estado_por_id')
+    def test_cliente_create_valida_em_segundo_plano(self, mock_estado, mock_municipio):
+        """Teste para criar o cliente sem consultar o IBGE na requisição"""
+        mock_estado.return_value = {'id': 35, 'sigla': 'SP', 'nome': 'São Paulo'}
+        mock_municipio.return_value = {'id': 3550308, 'nome': 'São Paulo'}
+        
+        response = self.client.post(reverse('cliente-list'), self.cliente_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status_validacao'], Cliente.VALIDACAO_PENDENTE)
+        mock_estado.assert_not_called()
+        
+        executar_pendentes()
+        cliente = Cliente.objects.get(pk=response.data['id'])
+        self.assertEqual(cliente.status_validacao, Cliente.VALIDACAO_VALIDA)
+        self.assertEqual(cliente.estado_sigla, 'SP')
+        self.assertEqual(cliente.cidade_nome, 'São Paulo')
+    
+    @patch('cliente.tarefas.consultar_municipio_por_id')
+    @patch('cliente.tarefas.consultar_estado_por_id')
+    def test_cliente_municipio_inexistente(self, mock_estado, mock_municipio):
+        """Teste para marcar o cliente como inválido quando o município não existe"""
+        mock_estado.return_value = {'id': 35, 'sigla': 'SP', 'nome': 'São Paulo'}
+        mock_municipio.side_effect = ValueError("Município não encontrado")
+        
+        response = self.client.post(reverse('cliente-list'), self.cliente_data, format='json')
+        executar_pendentes()
+        cliente = Cliente.objects.get(pk=response.data['id'])
+        self.assertEqual(cliente.status_validacao, Cliente.VALIDACAO_INVALIDA)
+        self.assertEqual(cliente.erro_validacao, "Município não encontrado")
+
+
+class LoteClienteTestCase(APITestCase):
+    """Testes para alteração e remoção de clientes em lote"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('cliente-lote')
+        self.clientes = [
+            Cliente.objects.create(
+                cnpj=cnpj,
+                razao_social="Empresa Teste LTDA",
+                nome_fantasia="Empresa Teste",
+                endereco="Rua Teste, 123",
+                cep="01234-567",
+                cidade_id=3550308,
+                cidade_nome="São Paulo",
+                estado_id=35,
+                estado_sigla="SP",
+                status_validacao=Cliente.VALIDACAO_VALIDA,
+                responsavel_cpf="529.982.247-25",
+                responsavel_rg="12.345.678-9",
+                responsavel_nome="João da Silva",
+                responsavel_data_nascimento=date(1980, 1, 1),
+                responsavel_estado_civil="casado",
+                responsavel_email="joao@empresa.com",
+                email_financeiro="financeiro@empresa.com"
+            )
+            for cnpj in ("11.222.333/0001-81", "11.444.777/0001-61", "45.723.174/0001-10")
+        ]
+        self.ids = [cliente.id for cliente in self.clientes]
+    
+    def test_atualizacao_em_massa_com_um_update(self):
+        """Teste para aplicar o mesmo valor a vários clientes com um único UPDATE"""
+        dados = {'ids': self.ids, 'dados': {'email_financeiro': 'novo@empresa.com'}}
+        with self.assertNumQueries(5):  # SAVEPOINT, SELECT, UPDATE, sequência de sincronização, RELEASE
+            response = self.client.patch(self.url, dados, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['atualizados'], 3)
+        for cliente in Cliente.objects.all():
+            self.assertEqual(cliente.email_financeiro, 'novo@empresa.com')
+            self.assertEqual(cliente.atualizado_por, self.user)
+            self.assertIsNotNone(cliente.data_atualizacao)
+    
+    def test_valores_diferentes_por_cliente(self):
+        """Teste para alterar valores diferentes por cliente e informar ids inexistentes"""
+        dados = {'clientes': [
+            {'id': self.ids[0], 'cidade_id': 3304557, 'estado_id': 33},
+            {'id': self.ids[1], 'nome_fantasia': 'Outro Nome'},
+            {'id': 999999, 'nome_fantasia': 'Outro Nome'},
+        ]}
+        response = self.client.patch(self.url, dados, format='json')
+        
+        self.assertEqual(response.data['resultados'], {
+            self.ids[0]: 'atualizado', self.ids[1]: 'atualizado', 999999: 'nao_encontrado',
+        })
+        primeiro = Cliente.objects.get(pk=self.ids[0])
+        self.assertEqual(primeiro.cidade_id, 3304557)
+        self.assertEqual(primeiro.status_validacao, Cliente.VALIDACAO_PENDENTE)
+        self.assertEqual(Cliente.objects.get(pk=self.ids[1]).nome_fantasia, 'Outro Nome')
+        self.assertEqual(Cliente.objects.get(pk=self.ids[2]).status_validacao, Cliente.VALIDACAO_VALIDA)
+    
+    @patch('cliente.lote.ClienteSerializer.validate_responsavel_cpf', autospec=True)
+    def test_valor_repetido_validado_uma_vez(self, mock_validar):
+        """Teste para validar uma única vez cada valor distinto e rejeitar valores inválidos"""
+        mock_validar.side_effect = lambda serializer, valor: valor
+        dados = {'clientes': [
+            {'id': self.ids[0], 'responsavel_cpf': '52998224725', 'email_financeiro': 'invalido'},
+            {'id': self.ids[1], 'responsavel_cpf': '52998224725'},
+            {'id': self.ids[2], 'responsavel_cpf': '52998224725'},
+        ]}
+        response = self.client.patch(self.url, dados, format='json')
+        
+        self.assertEqual(mock_validar.call_count, 1)
+        self.assertEqual(response.data['atualizados'], 2)
+        self.assertEqual(response.data['resultados'][self.ids[0]], 'invalido')
+        self.assertIn('email_financeiro', response.data['erros'][self.ids[0]])
+        self.assertEqual(
+            Cliente.objects.get(pk=self.ids[0]).responsavel_cpf, "529.982.247-25"
+        )
+    
+    def test_municipio_de_outro_estado_recusado_em_lote(self):
+        """Teste para recusar em lote, como no PUT, o município que não é do estado"""
+        dados = {'clientes': [
+            {'id': self.ids[0], 'cidade_id': 3304557, 'estado_id': 35},
+            {'id': self.ids[1], 'cidade_id': 3304557},
+            {'id': self.ids[2], 'cidade_id': 3550309},
+        ]}
+        response = self.client.patch(self.url, dados, format='json')
+        
+        self.assertEqual(response.data['resultados'], {
+            self.ids[0]: 'invalido', self.ids[1]: 'invalido', self.ids[2]: 'atualizado',
+        })
+        self.assertIn('cidade_id', response.data['erros'][self.ids[0]])
+        self.assertIn('cidade_id', response.data['erros'][self.ids[1]])
+        self.assertEqual(Cliente.objects.get(pk=self.ids[1]).cidade_id, 3550308)
+        
+        response = self.client.put(
+            reverse('cliente-detail', args=[self.ids[0]]),
+            dict(ClienteSerializer(self.clientes[0]).data, cidade_id=3304557, estado_id=35), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('cidade_id', response.data)
+    
+    @patch('cliente.lote.ClienteSerializer.validate', autospec=True)
+    def test_combinacao_repetida_validada_uma_vez(self, mock_validar):
+        """Teste para executar a validação do objeto uma vez por combinação distinta de valores"""
+        mock_validar.side_effect = lambda serializer, dados: dados
+        dados = {'ids': self.ids, 'dados': {'cidade_id': 3304557, 'estado_id': 33}}
+        response = self.client.patch(self.url, dados, format='json')
+        
+        self.assertEqual(response.data['atualizados'], 3)
+        self.assertEqual(mock_validar.call_count, 1)
+    
+    def test_cnpj_nao_editavel_em_lote(self):
+        """Teste para impedir a alteração do CNPJ em lote"""
+        dados = {'ids': self.ids[:1], 'dados': {'cnpj': '11222333000181'}}
+        response = self.client.patch(self.url, dados, format='json')
+        self.assertEqual(response.data['resultados'][self.ids[0]], 'invalido')
+    
+    def test_remocao_em_lote(self):
+        """Teste para remover vários clientes com um único DELETE"""
+        response = self.client.delete(self.url, {'ids': self.ids[:2] + [999999]}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['removidos'], 2)
+        self.assertEqual(response.data['resultados'][999999], 'nao_encontrado')
+        self.assertEqual(list(Cliente.objects.values_list('id', flat=True)), self.ids[2:])
+    
+    def test_lote_sem_ids(self):
+        """Teste para rejeitar lotes sem lista de ids"""
+        response = self.client.patch(self.url, {'dados': {'nome_fantasia': 'X'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SINCRONIZACAO_ATRASO=0)
+class SincronizacaoTestCase(APITestCase):
+    """Testes para o feed incremental de alterações de clientes"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('cliente-alteracoes')
+        self.cliente_data = {
+            "cnpj": "11222333000181",
+            "razao_social": "Empresa Teste LTDA",
+            "nome_fantasia": "Empresa Teste",
+            "endereco": "Rua Teste, 123",
+            "cep": "01234567",
+            "cidade_id": 3550308,
+            "estado_id": 35,
+            "responsavel_cpf": "52998224725",
+            "responsavel_rg": "123456789",
+            "responsavel_nome": "João da Silva",
+            "responsavel_data_nascimento": "1980-01-01",
+            "responsavel_estado_civil": "casado",
+            "responsavel_email": "joao@empresa.com",
+            "email_financeiro": "financeiro@empresa.com"
+        }
+    
+    def _criar(self, cnpj):
+        response = self.client.post(reverse('cliente-list'), dict(self.cliente_data, cnpj=cnpj), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+    
+    def test_retorna_somente_alteracoes_apos_token(self):
+        """Teste para retornar apenas os clientes alterados depois do token"""
+        primeiro = self._criar("11222333000181")
+        token = self.client.get(self.url).data['token']
+        segundo = self._criar("11444777000161")
+        self.client.patch(reverse('cliente-detail', args=[primeiro]), {'nome_fantasia': 'A'}, format='json')
+        self.client.patch(reverse('cliente-detail', args=[primeiro]), {'nome_fantasia': 'B'}, format='json')
+        
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cliente['id'] for cliente in response.data['alterados']], [primeiro, segundo])
+        self.assertEqual(response.data['alterados'][0]['nome_fantasia'], 'B')
+        self.assertEqual(response.data['removidos'], [])
+        
+        response = self.client.get(self.url, {'since': response.data['token']})
+        self.assertEqual(response.data['alterados'], [])
+    
+    @override_settings(SINCRONIZACAO_ATRASO=5)
+    def test_token_nao_pula_transacao_confirmada_fora_de_ordem(self):
+        """Teste para não pular a alteração de uma transação confirmada depois de outra com id maior"""
+        token = self.client.get(self.url).data['token']
+        inicio = timezone.now()
+        # Transação 1 aloca o id menor e continua aberta; a 2 aloca o seguinte e confirma
+        pendente = AlteracaoCliente.objects.create(cliente_id=1)
+        AlteracaoCliente.objects.filter(pk=pendente.pk).delete()
+        AlteracaoCliente.objects.create(cliente_id=2, operacao=AlteracaoCliente.EXCLUSAO)
+        
+        with patch('cliente.sincronizacao.timezone.now', return_value=inicio + timedelta(seconds=1)):
+            response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.data['removidos'], [])
+        self.assertEqual(response.data['token'], token)
+        
+        # A transação 1 confirma com o id alocado antes
+        AlteracaoCliente.objects.create(pk=pendente.pk, cliente_id=1, operacao=AlteracaoCliente.EXCLUSAO)
+        with patch('cliente.sincronizacao.timezone.now', return_value=inicio + timedelta(seconds=10)):
+            response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.data['removidos'], [1, 2])
+    
+    def test_exclusao_gera_marca(self):
+        """Teste para informar os clientes removidos, inclusive em lote"""
+        primeiro = self._criar("11222333000181")
+        segundo = self._criar("11444777000161")
+        token = self.client.get(self.url).data['token']
+        
+        self.client.delete(reverse('cliente-detail', args=[primeiro]))
+        self.client.delete(reverse('cliente-lote'), {'ids': [segundo]}, format='json')
+        
+        response = self.client.get(self.url, {'since': token})
+        self.assertEqual(response.data['alterados'], [])
+        self.assertEqual(response.data['removidos'], [primeiro, segundo])
+    
+    def test_paginacao_por_token(self):
+        """Teste para ler a sequência em páginas usando o token retornado"""
+        ids = [self._criar(cnpj) for cnpj in ("11222333000181", "11444777000161", "45723174000110")]
+        
+        response = self.client.get(self.url, {'limite': 2})
+        self.assertTrue(response.data['tem_mais'])
+        self.assertEqual([cliente['id'] for cliente in response.data['alterados']], ids[:2])
+        
+        response = self.client.get(self.url, {'since': response.data['token'], 'limite': 2})
+        self.assertFalse(response.data['tem_mais'])
+        self.assertEqual([cliente['id'] for cliente in response.data['alterados']], ids[2:])
+    
+    def test_token_invalido(self):
+        """Teste para rejeitar tokens que não são inteiros"""
+        response = self.client.get(self.url, {'since': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor in ('sqlite', 'mysql'), 'Planos de execução verificados apenas em SQLite e MySQL')
+class PlanoConsultaTestCase(TestCase):
+    """Testes para garantir que filtros e buscas de clientes usam índices"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='testuser', password='testpass')
+        ufs = [(35, 'SP', 3550308), (33, 'RJ', 3304557), (31, 'MG', 3106200), (41, 'PR', 4106902)]
+        clientes = []
+        for indice in range(80):
+            estado_id, sigla, cidade_id = ufs[indice % len(ufs)]
+            cnpj = f"{indice:08d}000100"
+            clientes.append(Cliente(
+                cnpj=cnpj, cnpj_digits=cnpj, cnpj_raiz=cnpj[:8], razao_social="Empresa", nome_fantasia="Empresa",
+                endereco="Rua Teste, 123", cep="01234-567",
+                cidade_id=cidade_id + indice, cidade_nome="Cidade", estado_id=estado_id, estado_sigla=sigla,
+                responsavel_cpf="529.982.247-25", responsavel_rg="123", responsavel_nome="João",
+                responsavel_data_nascimento=date(1980, 1, 1), responsavel_estado_civil="casado",
+                responsavel_email="joao@empresa.com", email_financeiro="financeiro@empresa.com",
+                criado_por=cls.user if indice % 10 == 0 else None,
+            ))
+        Cliente.objects.bulk_create(clientes)
+    
+    def assertUsaIndice(self, queryset, indice):
+        plano = queryset.explain()
+        self.assertIn(indice, plano)
+        # Ordenação resolvida pelo índice, sem ordenar em memória
+        self.assertNotIn('TEMP B-TREE' if connection.vendor == 'sqlite' else 'Using filesort', plano)
+    
+    def test_filtro_por_uf(self):
+        """Teste para filtrar por UF usando o índice UF + município"""
+        self.assertUsaIndice(Cliente.objects.filter(estado_sigla='SP'), 'cliente_uf_cidade_idx')
+    
+    def test_filtro_por_uf_e_municipio(self):
+        """Teste para filtrar por UF e município usando o índice composto"""
+        self.assertUsaIndice(
+            Cliente.objects.filter(estado_sigla='SP', cidade_id=3550308), 'cliente_uf_cidade_idx'
+        )
+    
+    def test_filtro_por_municipio(self):
+        """Teste para filtrar apenas pelo município"""
+        self.assertUsaIndice(Cliente.objects.filter(cidade_id=3550308), 'cliente_cidade_idx')
+    
+    def test_clientes_do_usuario_ordenados(self):
+        """Teste para listar clientes de um usuário ordenados por data sem ordenação extra"""
+        self.assertUsaIndice(
+            Cliente.objects.filter(criado_por=self.user).order_by('-data_criacao'), 'cliente_criado_data_idx'
+        )
+    
+    def test_faixa_de_data_de_criacao(self):
+        """Teste para filtrar por faixa de data de criação"""
+        inicio = datetime(2099, 1, 1, tzinfo=dt_timezone.utc)
+        self.assertUsaIndice(Cliente.objects.filter(data_criacao__gte=inicio), 'cliente_data_criacao_idx')
+    
+    def test_ultimas_atualizacoes(self):
+        """Teste para ordenar pela data de atualização usando índice"""
+        self.assertUsaIndice(Cliente.objects.order_by('-data_atualizacao')[:10], 'cliente_data_atual_idx')
+    
+    def test_busca_por_cnpj_sem_mascara(self):
+        """Teste para buscar o CNPJ só com dígitos por índice"""
+        self.assertUsaIndice(Cliente.objects.filter(cnpj_digits='00000001000100'), 'cliente_cnpj_digits_idx')
+    
+    def test_filiais_pela_raiz_do_cnpj(self):
+        """Teste para buscar matriz e filiais pela raiz do CNPJ já em ordem de CNPJ"""
+        self.assertUsaIndice(
+            Cliente.objects.filter(cnpj_raiz='00000001').order_by('cnpj_digits'), 'cliente_cnpj_raiz_idx'
+        )
+    
+    def test_agrupamento_por_raiz_do_cnpj(self):
+        """Teste para agrupar empresas pela raiz do CNPJ percorrendo o índice"""
+        self.assertUsaIndice(
+            Cliente.objects.values('cnpj_raiz').annotate(total=Count('id')).order_by('cnpj_raiz'),
+            'cliente_cnpj_raiz_idx'
+        )
+
+
+class CnpjDigitsTestCase(TestCase):
+    """Testes para a normalização do CNPJ em cnpj_digits"""
+    
+    def test_cnpj_digits_preenchido_ao_salvar(self):
+        """Teste para preencher cnpj_digits a partir do CNPJ com máscara"""
+        cliente = Cliente.objects.create(
+            cnpj="11.222.333/0001-81", razao_social="Empresa", nome_fantasia="Empresa",
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25", responsavel_rg="123",
+            responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+        self.assertEqual(cliente.cnpj_digits, "11222333000181")
+        self.assertEqual(Cliente.objects.get(cnpj_digits="11222333000181"), cliente)
+    
+    def test_banco_garante_cnpj_unico_entre_ativos(self):
+        """Teste para o próprio banco recusar CNPJ repetido entre ativos da mesma organização"""
+        dados = dict(
+            cnpj="11.222.333/0001-81", razao_social="Empresa", nome_fantasia="Empresa",
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25", responsavel_rg="123",
+            responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+        organizacao = Organizacao.objects.create(nome='Prestadora', slug='prestadora')
+        Cliente.objects.create(**dados)
+        Cliente.objects.create(organizacao=organizacao, **dados)
+        for extras in ({}, {'organizacao': organizacao}):
+            with self.assertRaises(IntegrityError) as contexto, transaction.atomic():
+                Cliente.objects.create(**dados, **extras)
+            self.assertTrue(cnpj_duplicado(contexto.exception))
+        
+        Cliente.objects.filter(organizacao=organizacao).excluir()
+        Cliente.objects.create(organizacao=organizacao, **dados)
+        self.assertEqual(Cliente.todos.filter(cnpj_digits="11222333000181").count(), 3)
+
+
+class FiltroClienteTestCase(APITestCase):
+    """Testes para os filtros e a ordenação da listagem de clientes"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.outro = User.objects.create_user(username='outro', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('cliente-list')
+        dados = [
+            ("11.222.333/0001-81", 35, "SP", 3550308, "casado", self.user),
+            ("11.444.777/0001-61", 35, "SP", 3509502, "solteiro", self.outro),
+            ("45.723.174/0001-10", 33, "RJ", 3304557, "casado", self.user),
+        ]
+        self.clientes = [
+            Cliente.objects.create(
+                cnpj=cnpj, razao_social="Empresa Teste LTDA", nome_fantasia="Empresa Teste",
+                endereco="Rua Teste, 123", cep="01234-567", cidade_id=cidade_id, cidade_nome="Cidade",
+                estado_id=estado_id, estado_sigla=sigla, responsavel_cpf="529.982.247-25",
+                responsavel_rg="12.345.678-9", responsavel_nome="João da Silva",
+                responsavel_data_nascimento=date(1980, 1, 1), responsavel_estado_civil=estado_civil,
+                responsavel_email="joao@empresa.com", email_financeiro="financeiro@empresa.com",
+                criado_por=usuario,
+            )
+            for cnpj, estado_id, sigla, cidade_id, estado_civil, usuario in dados
+        ]
+        Cliente.objects.filter(pk=self.clientes[0].pk).update(data_criacao=datetime(2024, 1, 10, tzinfo=dt_timezone.utc))
+        Cliente.objects.filter(pk=self.clientes[1].pk).update(data_criacao=datetime(2024, 2, 10, tzinfo=dt_timezone.utc))
+        Cliente.objects.filter(pk=self.clientes[2].pk).update(data_criacao=datetime(2024, 3, 10, tzinfo=dt_timezone.utc))
+    
+    def _ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [cliente['id'] for cliente in response.data['results']]
+    
+    def test_filtro_por_uf_e_municipio(self):
+        """Teste para filtrar por UF (uma ou várias) e por município"""
+        ids = [cliente.id for cliente in self.clientes]
+        self.assertEqual(self._ids(estado_sigla='sp'), ids[:2])
+        self.assertEqual(self._ids(estado_sigla='SP,RJ'), ids)
+        self.assertEqual(self._ids(cidade_id='3304557'), ids[2:])
+    
+    def test_filtro_por_estado_civil_e_criador(self):
+        """Teste para filtrar por estado civil do responsável e por usuário criador"""
+        ids = [cliente.id for cliente in self.clientes]
+        self.assertEqual(self._ids(responsavel_estado_civil='casado', criado_por=self.user.id), [ids[0], ids[2]])
+        self.assertEqual(self._ids(criado_por=self.outro.id), [ids[1]])
+    
+    def test_filtro_por_faixa_de_data(self):
+        """Teste para filtrar por faixa de data de criação, com dia final inclusivo"""
+        ids = [cliente.id for cliente in self.clientes]
+        self.assertEqual(self._ids(data_criacao_de='2024-02-01', data_criacao_ate='2024-03-10'), ids[1:])
+        self.assertEqual(self._ids(data_criacao_ate='2024-01-10'), ids[:1])
+    
+    def test_ordenacao_em_colunas_indexadas(self):
+        """Teste para ordenar por coluna indexada e ignorar colunas não indexadas"""
+        ids = [cliente.id for cliente in self.clientes]
+        self.assertEqual(self._ids(ordering='-data_criacao'), ids[::-1])
+        self.assertEqual(self._ids(ordering='razao_social'), ids)
+
+    def test_ordenacao_desempata_por_id(self):
+        """Teste para desempatar por id a ordenação por colunas não únicas"""
+        ids = [cliente.id for cliente in self.clientes]
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(self._ids(ordering='-estado_sigla'), ids)
+        listagem = next(c['sql'] for c in consultas.captured_queries if 'LIMIT' in c['sql'])
+        self.assertRegex(listagem.split('ORDER BY')[-1], r'"estado_sigla" DESC, .*"id" ASC')
+    
+    def test_parametros_invalidos(self):
+        """Teste para rejeitar valores inválidos nos filtros"""
+        for params in ({'cidade_id': 'abc'}, {'data_criacao_de': '10/01/2024'}, {'responsavel_estado_civil': 'outro'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EstatisticasTestCase(APITestCase):
+    """Testes para o resumo materializado de estatísticas de clientes"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('cliente-estatisticas')
+        self.cliente_data = {
+            "cnpj": "11222333000181",
+            "razao_social": "Empresa Teste LTDA",
+            "nome_fantasia": "Empresa Teste",
+            "endereco": "Rua Teste, 123",
+            "cep": "01234567",
+            "cidade_id": 3550308,
+            "estado_id": 35,
+            "responsavel_cpf": "52998224725",
+            "responsavel_rg": "123456789",
+            "responsavel_nome": "João da Silva",
+            "responsavel_data_nascimento": "1980-01-01",
+            "responsavel_estado_civil": "casado",
+            "responsavel_email": "joao@empresa.com",
+            "email_financeiro": "financeiro@empresa.com"
+        }
+    
+    @patch('cliente.tarefas.consultar_municipio_por_id')
+    @patch('cliente.tarefas.consultar_estado_por_id')
+    def _criar_validados(self, cnpjs, mock_estado, mock_municipio):
+        mock_estado.return_value = {'id': 35, 'sigla': 'SP', 'nome': 'São Paulo'}
+        mock_municipio.return_value = {'id': 3550308, 'nome': 'São Paulo'}
+        ids = [
+            self.client.post(reverse('cliente-list'), dict(self.cliente_data, cnpj=cnpj), format='json').data['id']
+            for cnpj in cnpjs
+        ]
+        executar_pendentes()
+        return ids
+    
+    def _recalculado(self):
+        incremental = obter_estatisticas()
+        recalcular()
+        self.assertEqual(incremental, obter_estatisticas())
+        return incremental
+    
+    def test_estatisticas_em_uma_consulta(self):
+        """Teste para servir as contagens por UF, município e mês com uma consulta"""
+        self._criar_validados(["11222333000181", "11444777000161"])
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['por_estado'], [{'estado_sigla': 'SP', 'total': 2}])
+        self.assertEqual(
+            response.data['por_cidade'], [{'estado_sigla': 'SP', 'cidade_nome': 'São Paulo', 'total': 2}]
+        )
+        self.assertEqual(response.data['por_mes'][0]['total'], 2)
+    
+    def test_resumo_acompanha_alteracoes_e_exclusoes(self):
+        """Teste para manter o resumo igual ao recálculo completo após alterações e exclusões"""
+        ids = self._criar_validados(["11222333000181", "11444777000161", "45723174000110"])
+        
+        self.client.patch(reverse('cliente-detail', args=[ids[0]]), {'cidade_nome': 'Campinas'}, format='json')
+        self.client.patch(
+            reverse('cliente-lote'), {'ids': [ids[1]], 'dados': {'estado_sigla': 'RJ', 'cidade_nome': 'Niterói'}},
+            format='json'
+        )
+        self.client.delete(reverse('cliente-detail', args=[ids[2]]))
+        
+        estatisticas = self._recalculado()
+        self.assertEqual(estatisticas['total'], 2)
+        self.assertEqual(
+            {(cidade['estado_sigla'], cidade['cidade_nome']) for cidade in estatisticas['por_cidade']},
+            {('SP', 'Campinas'), ('RJ', 'Niterói')}
+        )
+        
+        self.client.delete(reverse('cliente-lote'), {'ids': ids[:2]}, format='json')
+        self.assertEqual(self._recalculado()['total'], 0)
+    
+    def test_comando_recalcular(self):
+        """Teste para reconstruir o resumo pelo comando de gerenciamento"""
+        self._criar_validados(["11222333000181"])
+        ResumoCliente.objects.all().delete()
+        
+        call_command('recalcular_estatisticas', stdout=StringIO())
+        self.assertEqual(self.client.get(self.url).data['total'], 1)
+
+
+@override_settings(COMPRESSAO_TAMANHO_MINIMO=200)
+class RespostaJsonTestCase(APITestCase):
+    """Testes para o renderer/parser orjson e a compressão das respostas"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        estado = Estado.objects.create(nome="São Paulo", sigla="SP")
+        Cidade.objects.bulk_create([Cidade(nome=f"Cidade {indice}", estado=estado) for indice in range(10)])
+    
+    def test_renderer_compativel_com_json_padrao(self):
+        """Teste para renderizar os mesmos dados que o JSONRenderer do DRF"""
+        dados = {'valor': Decimal('10.50'), 'data': date(2024, 1, 2), 'texto': gettext_lazy('Ação'), 'ids': {1: 'ok'}}
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(dados)),
+            json.loads(JSONRenderer().render(dados))
+        )
+    
+    def test_parser_json_invalido(self):
+        """Teste para responder 400 quando o corpo não é JSON válido"""
+        response = self.client.generic(
+            'PATCH', reverse('cliente-lote'), '{"ids": [1', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_resposta_grande_comprimida_com_gzip(self):
+        """Teste para comprimir com gzip respostas acima do tamanho mínimo"""
+        response = self.client.get(reverse('cidade-list'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/'))
+        
+        response = self.client.get(
+            reverse('cidade-list'), HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_resposta_pequena_sem_compressao(self):
+        """Teste para não comprimir respostas abaixo do tamanho mínimo"""
+        response = self.client.get(reverse('cliente-estatisticas'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+    
+    @patch('app.middleware.brotli')
+    def test_brotli_quando_disponivel(self, mock_brotli):
+        """Teste para preferir brotli quando o pacote está instalado e o cliente aceita"""
+        mock_brotli.compress.return_value = b'comprimido'
+        response = self.client.get(reverse('cidade-list'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response.content, b'comprimido')
+
+
+class DuplicidadeTestCase(APITestCase):
+    """Testes para a detecção de clientes duplicados"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('cliente-verificar-duplicidade')
+        self.cliente = self._criar("11.222.333/0001-81", "Comércio de Alimentos Silva LTDA", "529.982.247-25")
+        self.outro = self._criar("45.723.174/0001-10", "Transportes Norte S.A.", "123.456.789-09")
+    
+    def _criar(self, cnpj, razao_social, responsavel_cpf):
+        return Cliente.objects.create(
+            cnpj=cnpj, razao_social=razao_social, nome_fantasia=razao_social,
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", responsavel_cpf=responsavel_cpf, responsavel_rg="123",
+            responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+    
+    def test_chave_nome_normalizada(self):
+        """Teste para ignorar acentos, pontuação, ordem das palavras e sufixos societários"""
+        self.assertEqual(chave_nome("Comércio de Alimentos Silva LTDA"), chave_nome("SILVA - comercio alimentos ltda."))
+        self.assertEqual(self.cliente.chave_nome, "alimentos comercio silva")
+        self.assertEqual(self.cliente.responsavel_cpf_digits, "52998224725")
+    
+    def test_mesmo_nome_com_pontuacao_diferente(self):
+        """Teste para apontar cliente com a mesma razão social escrita de outra forma"""
+        response = self.client.post(self.url, {'razao_social': 'Silva Comercio de Alimentos Ltda.'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['duplicado'])
+        self.assertEqual([candidato['id'] for candidato in response.data['candidatos']], [self.cliente.id])
+        self.assertEqual(response.data['candidatos'][0]['motivos'], ['nome'])
+    
+    def test_nome_parecido_com_erro_de_digitacao(self):
+        """Teste para apontar cliente com nome parecido (erro de digitação), não só com a mesma chave"""
+        response = self.client.post(
+            self.url + '?limiar=0.4', {'razao_social': 'Comercio de Alimentos Silvaa'}, format='json'
+        )
+        candidato, = response.data['candidatos']
+        self.assertEqual(candidato['id'], self.cliente.id)
+        self.assertEqual(candidato['motivos'], ['nome'])
+        self.assertLess(candidato['pontuacao'], 0.5)
+
+    def test_filial_com_mesmo_responsavel(self):
+        """Teste para apontar filial (mesma raiz de CNPJ) com o mesmo CPF de responsável"""
+        response = self.client.post(self.url, {
+            'cnpj': '11.222.333/0002-62', 'razao_social': 'Outro Nome', 'responsavel_cpf': '52998224725',
+        }, format='json')
+        candidato, = response.data['candidatos']
+        self.assertEqual(candidato['id'], self.cliente.id)
+        self.assertEqual(candidato['motivos'], ['raiz_cnpj', 'cpf_responsavel'])
+        self.assertEqual(candidato['pontuacao'], 0.5)
+    
+    def test_cnpj_igual_e_exclusao_do_proprio_cliente(self):
+        """Teste para pontuar 1 o mesmo CNPJ e ignorar o id informado"""
+        response = self.client.post(self.url, {'cnpj': '11222333000181'}, format='json')
+        self.assertEqual(response.data['candidatos'][0]['pontuacao'], 1.0)
+        
+        response = self.client.post(self.url, {'cnpj': '11222333000181', 'id': self.cliente.id}, format='json')
+        self.assertFalse(response.data['duplicado'])
+    
+    def test_sem_dados_para_comparar(self):
+        """Teste para rejeitar a verificação sem cnpj, razão social ou CPF"""
+        response = self.client.post(self.url, {'nome_fantasia': 'Teste'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_relatorio_de_duplicidades(self):
+        """Teste para listar cada par de possíveis duplicados uma única vez"""
+        filial = self._criar("11.222.333/0002-62", "Silva Comércio Alimentos", "529.982.247-25")
+        saida = StringIO()
+        call_command('relatorio_duplicidades', stdout=saida, stderr=StringIO())
+        linhas = saida.getvalue().strip().splitlines()
+        self.assertEqual(len(linhas), 2)
+        id_a, id_b, pontuacao, motivos = linhas[1].split(',')[:4]
+        self.assertEqual((int(id_a), int(id_b)), (self.cliente.id, filial.id))
+        self.assertEqual(float(pontuacao), 1.0)
+        self.assertEqual(motivos, 'nome|raiz_cnpj|cpf_responsavel')
+
+    def test_relatorio_compara_nomes_vizinhos(self):
+        """Teste para o relatório comparar nomes parecidos vizinhos em ordem alfabética, sem outra chave em comum"""
+        parecido = self._criar("11.444.777/0001-61", "Comércio de Alimentos Silva e Filhos", "111.444.777-35")
+        saida = StringIO()
+        call_command('relatorio_duplicidades', '--limiar', '0.4', stdout=saida, stderr=StringIO())
+        linhas = saida.getvalue().strip().splitlines()
+        self.assertEqual(len(linhas), 2)
+        id_a, id_b, _, motivos = linhas[1].split(',')[:4]
+        self.assertEqual((int(id_a), int(id_b)), (self.cliente.id, parecido.id))
+        self.assertEqual(motivos, 'nome')
+
+    def test_relatorio_com_memoria_limitada(self):
+        """Teste para a memória do relatório não crescer com o número de pares comparados"""
+        rng = random.Random(1)
+        clientes = []
+        for indice in range(1500):
+            razao_social = ' '.join(''.join(rng.choices(string.ascii_uppercase, k=8)) for _ in range(3))
+            cliente = Cliente(
+                cnpj=f"{indice:08d}000100", razao_social=razao_social, nome_fantasia="Empresa",
+                endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+                estado_id=35, estado_sigla="SP", responsavel_cpf=f"{indice:011d}", responsavel_rg="123",
+                responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+                responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+                email_financeiro="financeiro@empresa.com",
+                **Cliente.calcular_derivados({
+                    'cnpj': f"{indice:08d}000100", 'razao_social': razao_social,
+                    'responsavel_cpf': f"{indice:011d}",
+                }),
+            )
+            clientes.append(cliente)
+        Cliente.objects.bulk_create(clientes)
+
+        # ~90 mil comparações; guardar cada par comparado passaria de 3 MiB
+        tracemalloc.start()
+        try:
+            pares = list(gerar_pares_duplicados(tamanho_lote=100))
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(len(pares), 0)
+        self.assertLess(pico, 1024 * 1024)
+
+
+class GrupoEmpresaTestCase(APITestCase):
+    """Testes para o agrupamento de matriz e filiais pela raiz do CNPJ"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.filial = self._criar("11.222.333/0002-62")
+        self.matriz = self._criar("11.222.333/0001-81")
+        self.outra = self._criar("45.723.174/0001-10")
+    
+    def _criar(self, cnpj):
+        return Cliente.objects.create(
+            cnpj=cnpj, razao_social="Empresa Teste LTDA", nome_fantasia="Empresa Teste",
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25", responsavel_rg="123",
+            responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+    
+    def test_cnpj_raiz_preenchido_ao_salvar(self):
+        """Teste para preencher a raiz do CNPJ a partir do CNPJ com máscara"""
+        self.assertEqual(self.filial.cnpj_raiz, "11222333")
+        self.filial.cnpj = "45.723.174/0002-00"
+        self.filial.save(update_fields=['cnpj'])
+        self.filial.refresh_from_db()
+        self.assertEqual(self.filial.cnpj_raiz, "45723174")
+    
+    def test_grupos_com_filiais(self):
+        """Teste para listar apenas empresas com mais de um cliente, com a matriz"""
+        response = self.client.get(reverse('cliente-grupos'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{
+            'cnpj_raiz': '11222333', 'total': 2,
+            'matriz': {'id': self.matriz.id, 'cnpj': self.matriz.cnpj, 'razao_social': self.matriz.razao_social},
+        }])
+        
+        response = self.client.get(reverse('cliente-grupos'), {'minimo': 1, 'cnpj': '45.723.174/0001-10'})
+        self.assertEqual([grupo['total'] for grupo in response.data['results']], [1])
+        
+        response = self.client.get(reverse('cliente-grupos'), {'minimo': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_filiais_do_cliente(self):
+        """Teste para listar matriz e filiais da empresa de um cliente em ordem de CNPJ"""
+        response = self.client.get(reverse('cliente-filiais', args=[self.filial.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cliente['id'] for cliente in response.data['results']], [self.matriz.id, self.filial.id])
+        
+        response = self.client.get(reverse('cliente-filiais', args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CacheConsultasTestCase(APITestCase):
+    """Testes para o cache das consultas externas e das listagens de localidades"""
+    
+    def setUp(self):
+        limpar_caches()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        Estado.objects.create(nome="São Paulo", sigla="SP")
+    
+    @patch('cliente.views.consultar_cnpj')
+    def test_consulta_cnpj_em_cache(self, mock_consultar):
+        """Teste para consultar a API externa uma única vez para o mesmo CNPJ"""
+        mock_consultar.return_value = {'cnpj': '11222333000181', 'razao_social': 'EMPRESA TESTE'}
+        for cnpj in ('11222333000181', '11.222.333-0001-81'):
+            response = self.client.get(f'/cliente/consulta/cnpj/{cnpj}/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['razao_social'], 'EMPRESA TESTE')
+        mock_consultar.assert_called_once()
+    
+    @patch('cliente.views.consultar_cep')
+    def test_erro_de_consulta_nao_guardado(self, mock_consultar):
+        """Teste para não guardar no cache consultas que falharam"""
+        mock_consultar.side_effect = ValueError("CEP não encontrado")
+        self.client.get('/cliente/consulta/cep/01234567/')
+        self.client.get('/cliente/consulta/cep/01234567/')
+        self.assertEqual(mock_consultar.call_count, 2)
+    
+    def test_listagem_de_estados_em_cache(self):
+        """Teste para servir a listagem do cache e refleti-la após alterações"""
+        url = reverse('estado-list')
+        self.assertEqual(self.client.get(url).data['count'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).data['count'], 1)
+        
+        Estado.objects.create(nome="Rio de Janeiro", sigla="RJ")
+        self.assertEqual(self.client.get(url).data['count'], 2)
+
+
+class CacheRespostasClienteTestCase(APITestCase):
+    """Testes para o cache das respostas de listagem e detalhe de clientes"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.cliente = Cliente.objects.create(
+            cnpj="11.222.333/0001-81", razao_social="Empresa Teste LTDA", nome_fantasia="Empresa Teste",
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25", responsavel_rg="123",
+            responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+    
+    def test_listagem_e_detalhe_servidos_do_cache(self):
+        """Teste para repetir a listagem e o detalhe sem consultar o banco"""
+        urls = [reverse('cliente-list'), reverse('cliente-list') + '?estado_sigla=SP',
+                reverse('cliente-detail', args=[self.cliente.id])]
+        primeiras = [self.client.get(url).data for url in urls]
+        with self.assertNumQueries(0):
+            for url, dados in zip(urls, primeiras):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data, dados)
+    
+    def test_gravacoes_visiveis_imediatamente(self):
+        """Teste para renovar a geração do cache em alterações pela API e em lote"""
+        url = reverse('cliente-detail', args=[self.cliente.id])
+        self.client.get(url)
+        self.client.patch(url, {'nome_fantasia': 'Novo Nome'}, format='json')
+        self.assertEqual(self.client.get(url).data['nome_fantasia'], 'Novo Nome')
+        
+        self.client.patch(reverse('cliente-lote'), {'ids': [self.cliente.id], 'dados': {'nome_fantasia': 'Lote'}},
+                          format='json')
+        self.assertEqual(self.client.get(url).data['nome_fantasia'], 'Lote')
+        
+        self.client.delete(url)
+        self.assertEqual(self.client.get(reverse('cliente-list')).data['count'], 0)
+    
+    def test_leitura_concorrente_nao_guarda_dados_anteriores_a_gravacao(self):
+        """Teste para não guardar na nova geração uma resposta lida antes de uma gravação concorrente"""
+        limpar_caches()
+        get_serializer = ClienteViewSet.get_serializer
+        for url, nome in ((reverse('cliente-detail', args=[self.cliente.id]), 'Nome Detalhe'),
+                          (reverse('cliente-list'), 'Nome Listagem')):
+            def serializar_e_gravar(view, *args, nome=nome, **kwargs):
+                serializer = get_serializer(view, *args, **kwargs)
+                # Outro worker grava (e invalida) depois da leitura do banco e antes de guardar a resposta
+                Cliente.objects.filter(pk=self.cliente.pk).update(nome_fantasia=nome, versao=F('versao') + 1)
+                marcar_alterados([self.cliente.pk])
+                return serializer
+
+            with patch.object(ClienteViewSet, 'get_serializer', serializar_e_gravar):
+                self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+            dados = self.client.get(url).data
+            self.assertEqual((dados['results'][0] if 'results' in dados else dados)['nome_fantasia'], nome)
+
+    def test_escopo_de_permissao_na_chave(self):
+        """Teste para separar as respostas em cache por escopo de permissão, não por usuário"""
+        url = reverse('cliente-list')
+        self.client.get(url)
+        
+        self.client.force_authenticate(user=User.objects.create_user(username='outro', password='x'))
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        
+        self.client.force_authenticate(user=User.objects.create_user(username='admin', password='x', is_staff=True))
+        with self.assertNumQueries(2):
+            self.client.get(url)
+
+
+class ConcorrenciaOtimistaTestCase(APITestCase):
+    """Testes para o controle de concorrência otimista na edição de clientes"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.cliente = Cliente.objects.create(
+            cnpj="11.222.333/0001-81", razao_social="Empresa Teste LTDA", nome_fantasia="Empresa Teste",
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25", responsavel_rg="123",
+            responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com"
+        )
+        self.url = reverse('cliente-detail', args=[self.cliente.id])
+    
+    def test_if_match_com_etag_do_detalhe(self):
+        """Teste para gravar com o ETag lido e recusar com 412 um ETag antigo"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'nome_fantasia': 'Primeira'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['versao'], 2)
+        # O novo ETag permite a próxima edição sem reler o cliente
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+        
+        response = self.client.patch(self.url, {'nome_fantasia': 'Segunda'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.cliente.refresh_from_db()
+        self.assertEqual(self.cliente.nome_fantasia, 'Primeira')
+    
+    def test_versao_no_corpo(self):
+        """Teste para aceitar a versão lida no campo versao do corpo"""
+        response = self.client.patch(self.url, {'nome_fantasia': 'Outro', 'versao': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.patch(self.url, {'nome_fantasia': 'Outro', 'versao': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(self.url, {'nome_fantasia': 'Outro', 'versao': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_update_condicional_sem_select_extra(self):
+        """Teste para detectar a gravação concorrente no próprio UPDATE"""
+        cliente = Cliente.objects.get(pk=self.cliente.id)
+        Cliente.objects.filter(pk=cliente.pk).update(versao=F('versao') + 1)
+        cliente.versao_esperada = cliente.versao
+        cliente.nome_fantasia = 'Perdida'
+        with CaptureQueriesContext(connection) as consultas, self.assertRaises(ConflitoVersao):
+            cliente.save()
+        comandos = [consulta['sql'].split()[0] for consulta in consultas.captured_queries]
+        self.assertEqual([comando for comando in comandos if comando in ('SELECT', 'UPDATE')], ['UPDATE'])
+        self.assertEqual(cliente.versao, 1)
+        self.assertEqual(Cliente.objects.get(pk=cliente.pk).nome_fantasia, 'Empresa Teste')
+
+    def test_gravacoes_incondicionais_simultaneas_tem_versoes_distintas(self):
+        """Teste para incrementar a versão do banco em gravações sem If-Match feitas com a mesma versão lida"""
+        primeiro = Cliente.objects.get(pk=self.cliente.id)
+        segundo = Cliente.objects.get(pk=self.cliente.id)
+        primeiro.nome_fantasia = 'Primeiro'
+        primeiro.save()
+        segundo.nome_fantasia = 'Segundo'
+        segundo.save()
+        self.assertEqual(primeiro.versao, 2)
+        self.assertEqual(segundo.versao, 3)
+        self.assertEqual(Cliente.objects.get(pk=self.cliente.id).versao, 3)
+
+        # O ETag devolvido é o da versão gravada, não o da lida mais um
+        response = self.client.patch(self.url, {'nome_fantasia': 'Terceiro'}, format='json')
+        self.assertEqual(response.data['versao'], 4)
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+
+    def test_alteracao_em_lote_incrementa_versao(self):
+        """Teste para mudar a versão (e o ETag) também nas alterações em lote"""
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(reverse('cliente-lote'), {'ids': [self.cliente.id], 'dados': {'nome_fantasia': 'Lote'}},
+                          format='json')
+        self.cliente.refresh_from_db()
+        self.assertEqual(self.cliente.versao, 2)
+        response = self.client.patch(self.url, {'nome_fantasia': 'Outro'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+
+class CamposDinamicosClienteTestCase(APITestCase):
+    """Testes para ?fields= e ?expand= na API de clientes"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass', first_name='Ana')
+        self.client.force_authenticate(user=self.user)
+        for cnpj in ("11.222.333/0001-81", "11.444.777/0001-61", "45.723.174/0001-10"):
+            Cliente.objects.create(
+                cnpj=cnpj, razao_social="Empresa Teste LTDA", nome_fantasia="Empresa Teste",
+                endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+                estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25", responsavel_rg="123",
+                responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+                responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+                email_financeiro="financeiro@empresa.com", criado_por=self.user,
+            )
+        self.url = reverse('cliente-list')
+    
+    def test_fields_reduz_resposta_e_colunas(self):
+        """Teste para devolver e ler do banco apenas os campos pedidos"""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, {'fields': 'id,nome_fantasia,cnpj'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'nome_fantasia', 'cnpj'})
+        select = consultas.captured_queries[-1]['sql']
+        self.assertIn('"nome_fantasia"', select)
+        self.assertNotIn('"razao_social"', select)
+    
+    def test_expand_criado_por_em_um_select(self):
+        """Teste para expandir o usuário criador com select_related, sem consulta por linha"""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, {'fields': 'id,cnpj', 'expand': 'criado_por'})
+        # COUNT da paginação, agregado do ETag e a página com o JOIN
+        self.assertEqual(len(consultas.captured_queries), 3)
+        self.assertIn('JOIN "auth_user"', consultas.captured_queries[-1]['sql'])
+        criado_por = response.data['results'][0]['criado_por']
+        self.assertEqual(criado_por['username'], 'testuser')
+        self.assertEqual(criado_por['first_name'], 'Ana')
+    
+    def test_campos_invalidos(self):
+        """Teste para rejeitar campos inexistentes, somente escrita ou não expansíveis"""
+        for params in ({'fields': 'id,senha'}, {'fields': 'cidade'}, {'expand': 'cnpj'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_sem_parametros_mantem_resposta_completa(self):
+        """Teste para manter todos os campos sem ?fields="""
+        response = self.client.get(self.url)
+        self.assertIn('razao_social', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['criado_por'], self.user.id)
+
+
+class OrganizacaoClienteTestCase(APITestCase):
+    """Testes para o isolamento dos clientes por organização"""
+    
+    def setUp(self):
+        limpar_caches()
+        self.org_a = Organizacao.objects.create(nome='Prestadora A', slug='prestadora-a')
+        self.org_b = Organizacao.objects.create(nome='Prestadora B', slug='prestadora-b')
+        self.usuario_a = self._membro('ana', self.org_a)
+        self.usuario_b = self._membro('bruno', self.org_b)
+        self.cliente_data = {
+            "cnpj": "11222333000181",
+            "razao_social": "Empresa Teste LTDA",
+            "nome_fantasia": "Empresa Teste",
+            "endereco": "Rua Teste, 123",
+            "cep": "01234567",
+            "cidade_id": 3550308,
+            "estado_id": 35,
+            "responsavel_cpf": "52998224725",
+            "responsavel_rg": "123456789",
+            "responsavel_nome": "João da Silva",
+            "responsavel_data_nascimento": "1980-01-01",
+            "responsavel_estado_civil": "casado",
+            "responsavel_email": "joao@empresa.com",
+            "email_financeiro": "financeiro@empresa.com"
+        }
+        self.cliente_b = Cliente.objects.create(
+            organizacao=self.org_b, cnpj="11.444.777/0001-61", razao_social="Empresa Teste LTDA",
+            nome_fantasia="Empresa B", endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308,
+            cidade_nome="São Paulo", estado_id=35, estado_sigla="SP", responsavel_cpf="529.982.247-25",
+            responsavel_rg="123", responsavel_nome="João", responsavel_data_nascimento=date(1980, 1, 1),
+            responsavel_estado_civil="casado", responsavel_email="joao@empresa.com",
+            email_financeiro="financeiro@empresa.com",
+        )
+    
+    def _membro(self, username, organizacao):
+        usuario = User.objects.create_user(username=username, password='testpass')
+        MembroOrganizacao.objects.create(usuario=usuario, organizacao=organizacao)
+        return usuario
+    
+    def _autenticar(self, usuario):
+        token = TokenOrganizacaoSerializer.get_token(usuario).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def _ids_listados(self):
+        return [cliente['id'] for cliente in self.client.get(reverse('cliente-list')).data['results']]
+    
+    def test_criacao_na_organizacao_do_token(self):
+        """Teste para gravar o cliente na organização do token e listá-lo só nela"""
+        self._autenticar(self.usuario_a)
+        response = self.client.post(reverse('cliente-list'), self.cliente_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Cliente.objects.get(pk=response.data['id']).organizacao_id, self.org_a.id)
+        self.assertEqual(self._ids_listados(), [response.data['id']])
+        
+        self._autenticar(self.usuario_b)
+        self.assertEqual(self._ids_listados(), [self.cliente_b.id])
+    
+    def test_cnpj_unico_por_organizacao(self):
+        """Teste para aceitar o mesmo CNPJ em outra organização e recusá-lo na mesma"""
+        dados = dict(self.cliente_data, cnpj=self.cliente_b.cnpj_digits)
+        self._autenticar(self.usuario_a)
+        response = self.client.post(reverse('cliente-list'), dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        self._autenticar(self.usuario_b)
+        response = self.client.post(reverse('cliente-list'), dados, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('cnpj', response.data)
+    
+    @override_settings(SINCRONIZACAO_ATRASO=0)
+    def test_feed_de_alteracoes_por_organizacao(self):
+        """Teste para o feed de sincronização trazer só alterações e remoções da própria organização"""
+        url = reverse('cliente-alteracoes')
+        self._autenticar(self.usuario_b)
+        token_b = self.client.get(url).data['token']
+
+        self._autenticar(self.usuario_a)
+        cliente_id = self.client.post(reverse('cliente-list'), self.cliente_data, format='json').data['id']
+        self.client.delete(reverse('cliente-detail', args=[cliente_id]))
+        response = self.client.get(url)
+        self.assertEqual(response.data['removidos'], [cliente_id])
+
+        self._autenticar(self.usuario_b)
+        response = self.client.get(url, {'since': token_b})
+        self.assertEqual((response.data['alterados'], response.data['removidos']), ([], []))
+        self.assertEqual(response.data['token'], token_b)
+        self.assertFalse(response.data['tem_mais'])
+
+    def test_cliente_de_outra_organizacao(self):
+        """Teste para não ler nem alterar clientes de outra organização"""
+        self._autenticar(self.usuario_a)
+        url = reverse('cliente-detail', args=[self.cliente_b.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.patch(url, {'nome_fantasia': 'X'}, format='json').status_code,
+                         status.HTTP_404_NOT_FOUND)
+        response = self.client.patch(
+            reverse('cliente-lote'), {'ids': [self.cliente_b.id], 'dados': {'nome_fantasia': 'X'}}, format='json'
+        )
+        self.assertEqual(response.data['resultados'], {self.cliente_b.id: 'nao_encontrado'})
+        self.cliente_b.refresh_from_db()
+        self.assertEqual(self.cliente_b.nome_fantasia, 'Empresa B')
+    
+    def test_cache_por_organizacao(self):
+        """Teste para gravações de uma organização não invalidarem o cache das outras"""
+        self._autenticar(self.usuario_a)
+        self._ids_listados()
+        versao_a = cache_respostas_clientes.para(self.org_a.id).versao()
+        versao_b = cache_respostas_clientes.para(self.org_b.id).versao()
+        
+        self._autenticar(self.usuario_b)
+        self.client.patch(reverse('cliente-detail', args=[self.cliente_b.id]), {'nome_fantasia': 'Nova'}, format='json')
+        self.assertEqual(cache_respostas_clientes.para(self.org_a.id).versao(), versao_a)
+        self.assertNotEqual(cache_respostas_clientes.para(self.org_b.id).versao(), versao_b)
+    
+    def test_estatisticas_e_duplicidade_por_organizacao(self):
+        """Teste para estatísticas e duplicidades considerarem só a organização do usuário"""
+        self._autenticar(self.usuario_a)
+        self.client.post(reverse('cliente-list'), self.cliente_data, format='json')
+        self.assertEqual(self.client.get(reverse('cliente-estatisticas')).data['total'], 1)
+        response = self.client.post(
+            reverse('cliente-verificar-duplicidade'), {'cnpj': self.cliente_b.cnpj}, format='json'
+        )
+        self.assertFalse(response.data['duplicado'])
+        
+        self._autenticar(self.usuario_b)
+        self.assertEqual(self.client.get(reverse('cliente-estatisticas')).data['total'], 0)
+
+
+class ExclusaoLogicaTestCase(APITestCase):
+    """Testes para a exclusão lógica e o arquivamento de clientes"""
+    
+    def setUp(self):
+        limpar_caches()
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.cliente_data = {
+            "cnpj": "11222333000181",
+            "razao_social": "Empresa Teste LTDA",
+            "nome_fantasia": "Empresa Teste",
+            "endereco": "Rua Teste, 123",
+            "cep": "01234567",
+            "cidade_id": 3550308,
+            "estado_id": 35,
+            "responsavel_cpf": "52998224725",
+            "responsavel_rg": "123456789",
+            "responsavel_nome": "João da Silva",
+            "responsavel_data_nascimento": "1980-01-01",
+            "responsavel_estado_civil": "casado",
+            "responsavel_email": "joao@empresa.com",
+            "email_financeiro": "financeiro@empresa.com"
+        }
+        self.ids = [
+            self.client.post(reverse('cliente-list'), dict(self.cliente_data, cnpj=cnpj), format='json').data['id']
+            for cnpj in ("11222333000181", "11444777000161", "45723174000110")
+        ]
+    
+    def test_exclusao_logica(self):
+        """Teste para a exclusão manter o registro, fora das consultas de clientes ativos"""
+        url = reverse('cliente-detail', args=[self.ids[0]])
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse('cliente-list')).data['count'], 2)
+        self.assertFalse(Cliente.objects.filter(pk=self.ids[0]).exists())
+        self.assertIsNotNone(Cliente.todos.get(pk=self.ids[0]).data_exclusao)
+    
+    def test_arquivamento_em_lotes(self):
+        """Teste para mover os excluídos para a tabela de arquivados em lotes, mantendo o id"""
+        self.client.delete(reverse('cliente-lote'), {'ids': self.ids}, format='json')
+        data_criacao = Cliente.todos.get(pk=self.ids[0]).data_criacao
+        saida = StringIO()
+        call_command('arquivar_clientes', lote=2, stdout=saida)
+        
+        self.assertIn('3 cliente(s) arquivado(s)', saida.getvalue())
+        self.assertFalse(Cliente.todos.exists())
+        self.assertEqual(sorted(ClienteArquivado.objects.values_list('id', flat=True)), self.ids)
+        self.assertEqual(ClienteArquivado.objects.get(pk=self.ids[0]).data_criacao, data_criacao)
+        
+        response = self.client.get(reverse('cliente-arquivado-list'))
+        self.assertEqual(response.data['count'], 3)
+        response = self.client.get(reverse('cliente-arquivado-detail', args=[self.ids[0]]))
+        self.assertEqual(response.data['cnpj'], '11.222.333/0001-81')
+    
+    def test_arquivamento_respeita_dias(self):
+        """Teste para manter na tabela de clientes as exclusões mais recentes que --dias"""
+        self.client.delete(reverse('cliente-detail', args=[self.ids[0]]))
+        call_command('arquivar_clientes', dias=1, stdout=StringIO())
+        self.assertFalse(ClienteArquivado.objects.exists())
+    
+    def test_cnpj_de_cliente_excluido(self):
+        """Teste para liberar o CNPJ de um cliente excluído sem esperar o arquivamento"""
+        self.client.delete(reverse('cliente-detail', args=[self.ids[0]]))
+        response = self.client.post(reverse('cliente-list'), dict(self.cliente_data, cnpj='11.222.333/0001-81'),
+                                    format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        
+        # Excluídos e arquivados podem repetir o CNPJ
+        self.client.delete(reverse('cliente-detail', args=[response.data['id']]))
+        call_command('arquivar_clientes', stdout=StringIO())
+        self.assertEqual(ClienteArquivado.objects.filter(cnpj_digits='11222333000181').count(), 2)
+    
+    def test_apenas_restricao_de_cnpj_vira_cnpj_duplicado(self):
+        """Teste para traduzir só violações da restrição de CNPJ, e não de FK ou NOT NULL"""
+        self.assertTrue(cnpj_duplicado(IntegrityError(
+            "UNIQUE constraint failed: index 'cliente_org_cnpj_ativo_unico'"
+        )))
+        self.assertTrue(cnpj_duplicado(IntegrityError(
+            'duplicate key value violates unique constraint "cliente_org_cnpj_ativo_unico"'
+        )))
+        self.assertFalse(cnpj_duplicado(IntegrityError('NOT NULL constraint failed: cliente_cliente.razao_social')))
+        self.assertFalse(cnpj_duplicado(IntegrityError('FOREIGN KEY constraint failed')))
+    
+    def test_cnpj_duplicado_sem_mascara(self):
+        """Teste para recusar com 400 um CNPJ já cadastrado, informado com ou sem máscara"""
+        for cnpj in ('11222333000181', '11.222.333/0001-81'):
+            response = self.client.post(reverse('cliente-list'), dict(self.cliente_data, cnpj=cnpj), format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('cnpj', response.data)
+        
+        # Manter o próprio CNPJ numa atualização continua válido
+        response = self.client.patch(reverse('cliente-detail', args=[self.ids[0]]), {'cnpj': '11222333000181'},
+                                     format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
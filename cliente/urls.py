@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ClienteViewSet, EstadoViewSet, CidadeViewSet, ConsultaViewSet
+from .views import ClienteViewSet, ClienteArquivadoViewSet, EstadoViewSet, CidadeViewSet, ConsultaViewSet
 
 router = DefaultRouter()
 router.register(r'clientes', ClienteViewSet)
+router.register(r'arquivados', ClienteArquivadoViewSet, basename='cliente-arquivado')
 router.register(r'estados', EstadoViewSet)
 router.register(r'cidades', CidadeViewSet)
 router.register(r'consulta', ConsultaViewSet, basename='consulta')
@@ -6,6 +6,6 @@ def validar_cnpj(cnpj):
     """
     cnpj_numerico = ''.join(filter(str.isdigit, cnpj))
     validator = CNPJ()
-    if not validator.validade(cnpj_numerico):
+    if not validator.validate(cnpj_numerico):
         raise ValueError("CNPJ inválido")
     return validator.mask(cnpj_numerico)
\ No newline at end of file
@@ -6,6 +6,6 @@ def validar_cpf(cpf):
     """
     cpf_numerico = ''.join(filter(str.isdigit, cpf))
     validator = CPF()
-    if not validator.validade(cpf_numerico):
+    if not validator.validate(cpf_numerico):
         raise ValueError("CPF inválido")
     return validator.mask(cpf_numerico)
\ No newline at end of file
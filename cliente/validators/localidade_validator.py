@@ -0,0 +1,7 @@
+def validar_localidade(estado_id, cidade_id):
+    """
+    Confere se o município pertence ao estado: o código IBGE do município
+    (7 dígitos) começa com o código da UF
+    """
+    if estado_id and cidade_id and int(cidade_id) // 100000 != int(estado_id):
+        raise ValueError("O município não pertence ao estado informado")
@@ -1,16 +1,67 @@
+from contextlib import nullcontext
+from functools import reduce
+from operator import or_
+
+import requests
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ViewSet
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.utils import timezone
-from .models import Cliente, Estado, Cidade
-from .serializers import ClienteSerializer, EstadoSerializer, CidadeSerializer
+from django.db.models import Count, Max, Q
+from app.cache import AUSENTE, CacheDuasCamadas, responder_com_cache
+from app.campos import CamposDinamicosMixin
+from app.concorrencia import ConcorrenciaOtimistaMixin
+from app.conditional import (
+    ConditionalGetMixin, gerar_etag, gerar_etag_conteudo, para_timestamp,
+    verificar_condicional, aplicar_validadores,
+)
+from app.disjuntor import ServicoIndisponivel, obter_disjuntor
+from .models import Cliente, ClienteArquivado, Estado, Cidade
+from .filters import ClienteFilterBackend, OrdenacaoEstavelFilter
+from . import estatisticas as resumo
+from .localidades import cache_localidades, obter_versao_localidades
+from .respostas import cache_respostas_clientes
+from auditoria.models import RegistroAuditoria
+from empresa.organizacao import EscopoOrganizacaoMixin
+from auditoria.registro import capturar_estado, registrar_alteracoes
+from .tarefas import agendar_validacao_localidade
+from .sincronizacao import marcar_alterados, marcar_removidos, buscar_alteracoes, LIMITE_PADRAO, LIMITE_MAXIMO
+from .duplicidade import verificar_duplicidade, LIMIAR_PADRAO
+from .normalizacao import raiz_cnpj, somente_digitos
+from .lote import ler_ids, ler_itens, atualizar_em_lote, remover_em_lote, ATUALIZADO, REMOVIDO
+from .serializers import ClienteSerializer, ClienteArquivadoSerializer, EstadoSerializer, CidadeSerializer
 from .services.cnpj_service import consultar_cnpj
 from .services.cep_service import consultar_cep
 from .services.ibge_service import consultar_estado_por_id, consultar_municipio_por_id
 
-class EstadoViewSet(viewsets.ReadOnlyModelViewSet):
+# Dados de localidades quase nunca mudam: o navegador pode reutilizar por 1 hora
+CACHE_LOCALIDADES = {'private': True, 'max_age': 3600}
+
+# Listagens de UFs e municípios vão direto ao IBGE, pelo mesmo disjuntor dos services
+disjuntor_ibge = obter_disjuntor('ibge')
+
+# Respostas das APIs externas (ReceitaWS, ViaCEP, IBGE); erros não são guardados
+cache_consultas = CacheDuasCamadas('consultas', timeout=settings.CACHE_CONSULTAS_TIMEOUT)
+
+class LocalidadesConditionalMixin(ConditionalGetMixin):
+    """
+    ETag baseado na versão do snapshot de localidades e na URL requisitada
+    """
+    cache_control = CACHE_LOCALIDADES
+
+    def get_validadores(self, request, *args, **kwargs):
+        etag = gerar_etag(self.basename, obter_versao_localidades(), request.get_full_path())
+        return etag, None
+
+    def montar_resposta(self, handler, request, *args, **kwargs):
+        chave = f'{self.basename}:{request.get_full_path()}'
+        return responder_com_cache(cache_localidades, chave, handler, request, *args, **kwargs)
+
+class EstadoViewSet(LocalidadesConditionalMixin, viewsets.ReadOnlyModelViewSet):
     """
     API para visualizar estados brasileiros
     """
@@ -18,7 +69,7 @@ class EstadoViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = EstadoSerializer
     permission_classes = [IsAuthenticated]
 
-class CidadeViewSet(viewsets.ReadOnlyModelViewSet):
+class CidadeViewSet(LocalidadesConditionalMixin, viewsets.ReadOnlyModelViewSet):
     """
     API para visualizar cidades brasileiras, com opção de filtro por estado
     """
@@ -33,42 +84,286 @@ class CidadeViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(estado__sigla=estado)
         return queryset
 
-class ClienteViewSet(viewsets.ModelViewSet):
+class ClienteViewSet(
+    ConcorrenciaOtimistaMixin, EscopoOrganizacaoMixin, CamposDinamicosMixin, ConditionalGetMixin, viewsets.ModelViewSet
+):
     """
-    API para gerenciar clientes (CRUD completo)
+    API para gerenciar clientes (CRUD completo) da organização do usuário.
+    Leituras aceitam ?fields= e ?expand=criado_por,atualizado_por (app/campos.py)
     """
+    prefixo_etag = 'cliente'
     queryset = Cliente.objects.all()
     serializer_class = ClienteSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['nome_fantasia', 'razao_social', 'cnpj']
+    filter_backends = [ClienteFilterBackend, filters.SearchFilter, OrdenacaoEstavelFilter]
+    # cnpj_digits permite buscar o CNPJ com ou sem máscara
+    search_fields = ['nome_fantasia', 'razao_social', 'cnpj', 'cnpj_digits']
+    # Ordenação permitida apenas em colunas indexadas (?ordering=-data_criacao)
+    ordering_fields = ['id', 'data_criacao', 'data_atualizacao', 'estado_sigla', 'cidade_id']
+    ordering = ['id']
+    
+    def escopo_cache(self, request):
+        """
+        Escopo de permissão do usuário: usuários do mesmo escopo veem os mesmos
+        dados e compartilham as respostas em cache da organização
+        """
+        return 'staff' if request.user.is_staff else 'usuario'
+    
+    @property
+    def cache_respostas(self):
+        return cache_respostas_clientes.para(self.organizacao_id)
+    
+    def montar_resposta(self, handler, request, *args, **kwargs):
+        chave = f'{self.escopo_cache(request)}:{request.get_full_path()}'
+        return responder_com_cache(self.cache_respostas, chave, handler, request, *args, **kwargs)
+    
+    def get_validadores(self, request, *args, **kwargs):
+        """
+        Calcula ETag e Last-Modified sem carregar nem serializar os registros:
+        no detalhe o ETag vem da versão (o mesmo aceito no If-Match), na listagem
+        de data_criacao/data_atualizacao. Os valores ficam no cache de respostas
+        da organização e são recalculados a cada nova geração.
+        """
+        clientes = Cliente.objects.da_organizacao(self.organizacao_id)
+        if 'pk' in kwargs:
+            try:
+                pk = Cliente._meta.pk.to_python(kwargs['pk'])
+            except ValidationError:
+                # pk inválido (ex.: /clientes/abc/): o retrieve responde o 404 normal
+                return None, None
+            datas = self.cache_respostas.obter(
+                f'datas:{pk}',
+                lambda: clientes.filter(pk=pk).values_list(
+                    'versao', 'data_criacao', 'data_atualizacao'
+                ).first(),
+            )
+            if datas is None:
+                return None, None
+            versao, criacao, atualizacao = datas
+            modificado = atualizacao or criacao
+            return self.etag_da_versao(pk, versao), para_timestamp(modificado)
+
+        resumo = self.cache_respostas.obter('agregado', lambda: clientes.aggregate(
+            total=Count('id'),
+            ultima_criacao=Max('data_criacao'),
+            ultima_atualizacao=Max('data_atualizacao'),
+        ))
+        modificado = max(
+            (data for data in (resumo['ultima_criacao'], resumo['ultima_atualizacao']) if data),
+            default=None,
+        )
+        etag = gerar_etag(
+            'clientes', resumo['total'], modificado and modificado.isoformat(), request.get_full_path()
+        )
+        return etag, para_timestamp(modificado)
     
     def perform_create(self, serializer):
-        """Salva o usuário atual como criador do registro"""
-        serializer.save(criado_por=self.request.user, atualizado_por=self.request.user)
+        """Salva o cliente na organização e o usuário atual como criador, e agenda a validação no IBGE"""
+        cliente = serializer.save(
+            organizacao_id=self.organizacao_id, criado_por=self.request.user, atualizado_por=self.request.user
+        )
+        registrar_alteracoes(cliente, {}, self.request.user, RegistroAuditoria.CRIACAO)
+        marcar_alterados([cliente.pk], self.organizacao_id)
+        resumo.incluir([cliente.pk])
+        agendar_validacao_localidade(cliente)
     
     def perform_update(self, serializer):
-        """Atualiza o campo 'atualizado_por' e 'data_atualizacao' com valores atuais"""
-        serializer.save(
-            atualizado_por=self.request.user, 
-            data_atualizacao=timezone.now()
+        """
+        Atualiza o campo 'atualizado_por' e 'data_atualizacao' com valores atuais.
+        Com If-Match ou `versao` no corpo, grava só se o cliente não mudou (senão 412).
+        """
+        self.definir_versao_esperada(serializer.instance)
+        localidade_alterada = any(
+            campo in serializer.validated_data for campo in ('cidade_id', 'estado_id')
         )
+        extras = {'status_validacao': Cliente.VALIDACAO_PENDENTE} if localidade_alterada else {}
+        antes = capturar_estado(serializer.instance)
+        altera_resumo = resumo.CAMPOS_RESUMO & serializer.validated_data.keys()
+        with resumo.acompanhar([serializer.instance.pk]) if altera_resumo else nullcontext():
+            cliente = serializer.save(
+                atualizado_por=self.request.user, 
+                data_atualizacao=timezone.now(),
+                **extras
+            )
+        registrar_alteracoes(cliente, antes, self.request.user)
+        marcar_alterados([cliente.pk], self.organizacao_id)
+        if localidade_alterada:
+            agendar_validacao_localidade(cliente)
+    
+    def perform_destroy(self, instance):
+        """Exclusão lógica; o cliente vai para a tabela de arquivados pelo comando arquivar_clientes"""
+        antes = capturar_estado(instance)
+        cliente_id = instance.pk
+        with resumo.acompanhar([cliente_id]):
+            Cliente.objects.filter(pk=cliente_id).excluir()
+        marcar_removidos([cliente_id], self.organizacao_id)
+        registrar_alteracoes(instance, antes, self.request.user, RegistroAuditoria.EXCLUSAO)
+    
+    @action(detail=False, methods=['get'])
+    def estatisticas(self, request):
+        """
+        Totais de clientes por UF, município e mês de criação, lidos do resumo materializado
+        """
+        return Response(resumo.obter_estatisticas(self.organizacao_id))
+    
+    @action(detail=False, methods=['get'], url_path='changes')
+    def alteracoes(self, request):
+        """
+        Sincronização incremental: retorna os clientes criados/alterados e os ids
+        removidos desde o token informado em ?since=. O token devolvido deve ser
+        usado na próxima chamada; sem ?since= a sequência é lida desde o início.
+        Alterações e remoções são só da organização do usuário; os tokens são
+        crescentes, mas não consecutivos. Alterações dos últimos
+        SINCRONIZACAO_ATRASO segundos só aparecem numa leitura seguinte.
+        """
+        try:
+            token = int(request.query_params.get('since', 0))
+            limite = min(int(request.query_params.get('limite', LIMITE_PADRAO)), LIMITE_MAXIMO)
+        except ValueError:
+            return Response({"error": "Parâmetros since e limite devem ser inteiros"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if token < 0 or limite < 1:
+            return Response({"error": "Parâmetros since e limite devem ser positivos"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        alterados, removidos, proximo_token, tem_mais = buscar_alteracoes(token, limite, self.organizacao_id)
+        clientes = Cliente.objects.da_organizacao(self.organizacao_id).filter(pk__in=alterados).order_by('id')
+        return Response({
+            'token': str(proximo_token),
+            'tem_mais': tem_mais,
+            'alterados': self.get_serializer(clientes, many=True).data,
+            'removidos': removidos,
+        })
+    
+    @action(detail=False, methods=['patch', 'delete'], url_path='lote')
+    def lote(self, request):
+        """
+        Altera ou remove vários clientes em uma transação.
+        PATCH: {"ids": [...], "dados": {...}} ou {"clientes": [{"id": 1, ...}, ...]}
+        DELETE: {"ids": [...]} ou ?ids=1,2,3
+        Retorna o resultado de cada id (atualizado/removido, nao_encontrado, invalido).
+        """
+        if request.method == 'DELETE':
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+            if ids is None and request.query_params.get('ids'):
+                ids = request.query_params['ids'].split(',')
+            resultados = remover_em_lote(ler_ids(ids), request.user, self.organizacao_id)
+            return Response({
+                'removidos': sum(resultado == REMOVIDO for resultado in resultados.values()),
+                'resultados': resultados,
+            })
+
+        resultados, erros = atualizar_em_lote(ler_itens(request.data), request.user, self.organizacao_id)
+        return Response({
+            'atualizados': sum(resultado == ATUALIZADO for resultado in resultados.values()),
+            'resultados': resultados,
+            'erros': erros,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def grupos(self, request):
+        """
+        Empresas (raiz do CNPJ) com o total de clientes e a matriz cadastrada.
+        ?minimo=2 quantidade mínima de clientes no grupo (1 lista todas)
+        ?cnpj= CNPJ ou raiz de uma empresa
+        """
+        try:
+            minimo = int(request.query_params.get('minimo', 2))
+        except ValueError:
+            return Response({"error": "Parâmetro minimo deve ser inteiro"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        clientes = Cliente.objects.da_organizacao(self.organizacao_id)
+        grupos = (
+            clientes.exclude(cnpj_raiz='')
+            .values('cnpj_raiz')
+            .annotate(total=Count('id'))
+            .filter(total__gte=minimo)
+            .order_by('cnpj_raiz')
+        )
+        if request.query_params.get('cnpj'):
+            grupos = grupos.filter(cnpj_raiz=raiz_cnpj(request.query_params['cnpj']))
+
+        pagina = self.paginate_queryset(grupos)
+        raizes = [grupo['cnpj_raiz'] for grupo in pagina]
+        matrizes = {}
+        if raizes:
+            # Matriz é o estabelecimento 0001: uma faixa do índice por raiz
+            faixas = reduce(or_, (Q(cnpj_digits__range=(raiz + '000100', raiz + '000199')) for raiz in raizes))
+            for matriz in clientes.filter(faixas).values('id', 'cnpj', 'razao_social', 'cnpj_raiz'):
+                matrizes[matriz.pop('cnpj_raiz')] = matriz
+        for grupo in pagina:
+            grupo['matriz'] = matrizes.get(grupo['cnpj_raiz'])
+        return self.get_paginated_response(pagina)
+    
+    @action(detail=True, methods=['get'])
+    def filiais(self, request, pk=None):
+        """
+        Matriz e filiais da empresa do cliente (mesma raiz de CNPJ), em ordem de CNPJ
+        """
+        cliente = self.get_object()
+        clientes = (
+            Cliente.objects.da_organizacao(self.organizacao_id)
+            .filter(cnpj_raiz=cliente.cnpj_raiz)
+            .order_by('cnpj_digits')
+        )
+        pagina = self.paginate_queryset(clientes)
+        return self.get_paginated_response(self.get_serializer(pagina, many=True).data)
+    
+    @action(detail=False, methods=['post'], url_path='verificar-duplicidade')
+    def verificar_duplicidade(self, request):
+        """
+        Verifica antes do cadastro se já existem clientes parecidos.
+        Corpo: {"cnpj": ..., "razao_social": ..., "responsavel_cpf": ..., "id": opcional, para ignorar o próprio cliente}
+        ?limiar= define a pontuação mínima (0 a 1).
+        """
+        dados = request.data if isinstance(request.data, dict) else {}
+        if not any(dados.get(campo) for campo in ('cnpj', 'razao_social', 'responsavel_cpf')):
+            return Response({"error": "Informe cnpj, razao_social ou responsavel_cpf"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limiar = float(request.query_params.get('limiar', LIMIAR_PADRAO))
+            excluir_id = int(dados['id']) if dados.get('id') is not None else None
+        except (TypeError, ValueError):
+            return Response({"error": "Parâmetros limiar e id inválidos"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        candidatos = verificar_duplicidade(
+            dados, limiar=limiar, excluir_id=excluir_id, organizacao_id=self.organizacao_id
+        )
+        return Response({'duplicado': bool(candidatos), 'candidatos': candidatos})
+
+class ClienteArquivadoViewSet(EscopoOrganizacaoMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Clientes excluídos já movidos para a tabela de arquivados (somente leitura).
+    Excluídos ainda não arquivados aparecem após o comando arquivar_clientes.
+    """
+    queryset = ClienteArquivado.objects.all()
+    serializer_class = ClienteArquivadoSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [filters.SearchFilter, OrdenacaoEstavelFilter]
+    search_fields = ['nome_fantasia', 'razao_social', 'cnpj', 'cnpj_digits']
+    ordering_fields = ['id', 'data_exclusao', 'data_arquivamento']
+    ordering = ['-data_exclusao']
 
 class ConsultaViewSet(ViewSet):
     """
     API para consultar dados externos (CNPJ, CEP, UFs e Municípios)
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'consulta'
     
     def cnpj_por_numero(self, request, cnpj):
         """
         Consulta os dados de um CNPJ usando API externa
         """
         try:
-            empresa_dados = consultar_cnpj(cnpj)
+            empresa_dados = cache_consultas.obter(f'cnpj:{somente_digitos(cnpj)}', lambda: consultar_cnpj(cnpj))
             return Response(empresa_dados)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar CNPJ: {str(e)}"}, 
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -78,10 +373,12 @@ class ConsultaViewSet(ViewSet):
         Consulta os dados de um CEP usando ViaCEP
         """
         try:
-            endereco_dados = consultar_cep(cep)
+            endereco_dados = cache_consultas.obter(f'cep:{somente_digitos(cep)}', lambda: consultar_cep(cep))
             return Response(endereco_dados)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar CEP: {str(e)}"}, 
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -92,22 +389,29 @@ class ConsultaViewSet(ViewSet):
         Consulta todos os estados brasileiros usando a API do IBGE
         """
         try:
-            url = 'https://servicodados.ibge.gov.br/api/v1/localidades/estados'
-            response = requests.get(url)
-            data = response.json()
-            
-            if not data:
-                return Response({"error": "Nenhum estado encontrado"}, status=status.HTTP_404_NOT_FOUND)
+            versao, estados = cache_consultas.buscar_versionado('ufs')
+            if estados is AUSENTE:
+                url = f'{settings.IBGE_URL}/localidades/estados'
+                response = disjuntor_ibge.chamar(requests.get, url, timeout=settings.APIS_EXTERNAS_TIMEOUT)
+                data = response.json()
+                
+                if not data:
+                    return Response({"error": "Nenhum estado encontrado"}, status=status.HTTP_404_NOT_FOUND)
+                
+                # Ordenar os estados por nome
+                estados = sorted([{
+                    "id": estado["id"], 
+                    "sigla": estado["sigla"], 
+                    "nome": estado["nome"]
+                } for estado in data], key=lambda x: x['nome'])
+                cache_consultas.guardar('ufs', estados, versao=versao)
             
-            # Ordenar os estados por nome
-            estados = sorted([{
-                "id": estado["id"], 
-                "sigla": estado["sigla"], 
-                "nome": estado["nome"]
-            } for estado in data], key=lambda x: x['nome'])
-            
-            return Response(estados)
+            etag = gerar_etag_conteudo(estados)
+            response = verificar_condicional(request, etag=etag) or Response(estados)
+            return aplicar_validadores(response, etag, cache_control=CACHE_LOCALIDADES)
             
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar estados: {str(e)}"}, 
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -117,22 +421,27 @@ class ConsultaViewSet(ViewSet):
         Consulta municípios de um estado usando a API do IBGE
         """
         try:
-            url = f'https://servicodados.ibge.gov.br/api/v1/localidades/estados/{uf}/municipios'
-            response = requests.get(url)
-            data = response.json()
-            
-            if not data:
-                return Response({"error": "Nenhum município encontrado"}, status=status.HTTP_404_NOT_FOUND)
-            
-            # Ordenar os municípios por nome
-            municipios = sorted([{
-                "id": municipio["id"], 
-                "nome": municipio["nome"],
-                "uf": uf
-            } for municipio in data], key=lambda x: x['nome'])
+            versao, municipios = cache_consultas.buscar_versionado(f'municipios:{uf}')
+            if municipios is AUSENTE:
+                url = f'{settings.IBGE_URL}/localidades/estados/{uf}/municipios'
+                response = disjuntor_ibge.chamar(requests.get, url, timeout=settings.APIS_EXTERNAS_TIMEOUT)
+                data = response.json()
+                
+                if not data:
+                    return Response({"error": "Nenhum município encontrado"}, status=status.HTTP_404_NOT_FOUND)
+                
+                # Ordenar os municípios por nome
+                municipios = sorted([{
+                    "id": municipio["id"], 
+                    "nome": municipio["nome"],
+                    "uf": uf
+                } for municipio in data], key=lambda x: x['nome'])
+                cache_consultas.guardar(f'municipios:{uf}', municipios, versao=versao)
             
             return Response(municipios)
             
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar municípios: {str(e)}"}, 
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -142,10 +451,12 @@ class ConsultaViewSet(ViewSet):
         Consulta detalhes de um estado usando seu ID do IBGE
         """
         try:
-            estado_data = consultar_estado_por_id(id)
+            estado_data = cache_consultas.obter(f'estado:{id}', lambda: consultar_estado_por_id(id))
             return Response(estado_data)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar estado: {str(e)}"}, 
                           status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -155,10 +466,12 @@ class ConsultaViewSet(ViewSet):
         Consulta detalhes de um município usando seu ID do IBGE
         """
         try:
-            municipio_data = consultar_municipio_por_id(id)
+            municipio_data = cache_consultas.obter(f'municipio:{id}', lambda: consultar_municipio_por_id(id))
             return Response(municipio_data)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar município: {str(e)}"}, 
                           status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,3 +1,16 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import MembroOrganizacao, Organizacao
+
+
+class MembroOrganizacaoInline(admin.TabularInline):
+    model = MembroOrganizacao
+    autocomplete_fields = ['usuario']
+    extra = 0
+
+
+@admin.register(Organizacao)
+class OrganizacaoAdmin(admin.ModelAdmin):
+    list_display = ['nome', 'slug', 'ativa', 'data_criacao']
+    prepopulated_fields = {'slug': ['nome']}
+    inlines = [MembroOrganizacaoInline]
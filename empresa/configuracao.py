@@ -0,0 +1,38 @@
+from app.cache import CachePorOrganizacao
+
+from .models import ConfiguracaoEmpresa
+
+# Configuração compartilhada entre os workers (L2) e mantida na memória de cada um (L1);
+# cada organização tem o seu namespace, renovado a cada alteração da sua configuração
+cache_configuracao = CachePorOrganizacao('configuracao_empresa', timeout=3600)
+
+
+def _carregar_configuracao(organizacao_id):
+    configuracao = ConfiguracaoEmpresa.objects.da_organizacao(organizacao_id).first()
+    if configuracao is not None:
+        # Pré-calcula a URL do logo para não acessar o storage a cada leitura
+        configuracao.logo_url = configuracao.logo.url if configuracao.logo else None
+    return configuracao
+
+
+def obter_configuracao(organizacao_id=None):
+    """
+    Retorna a configuração da organização (ou None) a partir do cache do processo.
+    A instância retornada é compartilhada e não deve ser alterada.
+    """
+    return cache_configuracao.para(organizacao_id).obter('atual', lambda: _carregar_configuracao(organizacao_id))
+
+
+def obter_logo_url(organizacao_id=None):
+    """
+    Retorna a URL do logo da empresa, se houver
+    """
+    configuracao = obter_configuracao(organizacao_id)
+    return configuracao.logo_url if configuracao else None
+
+
+def invalidar_configuracao(organizacao_id=None):
+    """
+    Descarta a configuração da organização em cache em todos os workers
+    """
+    cache_configuracao.invalidar(organizacao_id)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='configuracaoempresa',
+            name='logo_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
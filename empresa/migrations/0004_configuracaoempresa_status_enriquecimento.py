@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0003_configuracaoempresa_versao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='configuracaoempresa',
+            name='status_enriquecimento',
+            field=models.CharField(blank=True, choices=[('pendente', 'Pendente'), ('concluido', 'Concluído'), ('erro', 'Erro')], editable=False, max_length=10, null=True),
+        ),
+    ]
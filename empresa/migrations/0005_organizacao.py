@@ -0,0 +1,49 @@
+# Generated by Django 5.1.1 on 2026-10-19 19:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0004_configuracaoempresa_status_enriquecimento'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Organizacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=255)),
+                ('slug', models.SlugField(unique=True)),
+                ('ativa', models.BooleanField(default=True)),
+                ('data_criacao', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Organização',
+                'verbose_name_plural': 'Organizações',
+                'db_table': 'organizacoes',
+            },
+        ),
+        migrations.CreateModel(
+            name='MembroOrganizacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='membro_organizacao', to=settings.AUTH_USER_MODEL)),
+                ('organizacao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='membros', to='empresa.organizacao')),
+            ],
+            options={
+                'verbose_name': 'Membro da Organização',
+                'verbose_name_plural': 'Membros da Organização',
+                'db_table': 'organizacoes_membros',
+            },
+        ),
+        migrations.AddField(
+            model_name='configuracaoempresa',
+            name='organizacao',
+            field=models.OneToOneField(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='configuracao', to='empresa.organizacao'),
+        ),
+    ]
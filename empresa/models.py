@@ -3,9 +3,70 @@ from django.core.exceptions import ValidationError
 from validate_docbr import CNPJ
 from django.contrib.auth.models import User
 
-class ConfiguracaoEmpresa(models.Model):
+from app.concorrencia import ModeloVersionado
+
+
+class OrganizacaoQuerySet(models.QuerySet):
+    """QuerySet de modelos que pertencem a uma organização (campo `organizacao`)"""
+
+    def da_organizacao(self, organizacao_id):
+        """
+        Registros da organização informada; None seleciona os registros sem
+        organização (instalação de empresa única, anterior às organizações)
+        """
+        return self.filter(organizacao_id=organizacao_id)
+
+
+class Organizacao(models.Model):
+    """Empresa prestadora atendida pela instalação (inquilino)"""
+    nome = models.CharField(max_length=255)
+    slug = models.SlugField(max_length=50, unique=True)
+    ativa = models.BooleanField(default=True)
+    data_criacao = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.nome
+
+    class Meta:
+        verbose_name = "Organização"
+        verbose_name_plural = "Organizações"
+        db_table = 'organizacoes'
+
+
+class MembroOrganizacao(models.Model):
+    """Vínculo do usuário com a organização; vai no token JWT como claim"""
+    usuario = models.OneToOneField(User, related_name='membro_organizacao', on_delete=models.CASCADE)
+    organizacao = models.ForeignKey(Organizacao, related_name='membros', on_delete=models.CASCADE)
+
+    def __str__(self):
+        return f"{self.usuario} - {self.organizacao}"
+
+    class Meta:
+        verbose_name = "Membro da Organização"
+        verbose_name_plural = "Membros da Organização"
+        db_table = 'organizacoes_membros'
+
+
+class ConfiguracaoEmpresa(ModeloVersionado):
     """Modelo para armazenar configurações da empresa prestadora de serviços"""
     
+    ENRIQUECIMENTO_PENDENTE = 'pendente'
+    ENRIQUECIMENTO_CONCLUIDO = 'concluido'
+    ENRIQUECIMENTO_ERRO = 'erro'
+    STATUS_ENRIQUECIMENTO_CHOICES = [
+        (ENRIQUECIMENTO_PENDENTE, 'Pendente'),
+        (ENRIQUECIMENTO_CONCLUIDO, 'Concluído'),
+        (ENRIQUECIMENTO_ERRO, 'Erro'),
+    ]
+    
+    # Uma configuração por organização; sem organização na instalação de empresa única
+    organizacao = models.OneToOneField(
+        Organizacao,
+        related_name='configuracao',
+        on_delete=models.CASCADE,
+        null=True,
+        editable=False
+    )
     razao_social = models.CharField(max_length=255)
     nome_fantasia = models.CharField(max_length=255)
     cnpj = models.CharField(max_length=18, unique=True)
@@ -27,6 +88,13 @@ class ConfiguracaoEmpresa(models.Model):
     
     # Logo da empresa
     logo = models.ImageField(upload_to='empresa/logos/', blank=True, null=True)
+    # Caminhos das versões redimensionadas do logo, geradas em segundo plano
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False)
+    
+    # Preenchimento com dados da ReceitaWS (buscar_dados), feito pela fila de tarefas
+    status_enriquecimento = models.CharField(
+        max_length=10, choices=STATUS_ENRIQUECIMENTO_CHOICES, blank=True, null=True, editable=False
+    )
     
     # Campos para auditoria
     criado_por = models.ForeignKey(
@@ -44,6 +112,8 @@ class ConfiguracaoEmpresa(models.Model):
     data_criacao = models.DateTimeField(auto_now_add=True)
     data_atualizacao = models.DateTimeField(null=True, blank=True)
     
+    objects = OrganizacaoQuerySet.as_manager()
+    
     def __str__(self):
         return self.nome_fantasia
     
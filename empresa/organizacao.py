@@ -0,0 +1,54 @@
+"""
+Organizações (inquilinos): cada usuário pertence a no máximo uma organização,
+que vai no token JWT (claim settings.ORGANIZACAO_CLAIM). As views leem a
+organização do token já validado, sem consulta extra, e filtram os querysets
+por ela.
+"""
+from django.conf import settings
+from django.utils.functional import cached_property
+
+from .models import MembroOrganizacao
+
+
+def organizacao_do_usuario(usuario):
+    """
+    Id da organização do usuário, ou None se ele não pertence a nenhuma
+    """
+    return (
+        MembroOrganizacao.objects.filter(usuario_id=usuario.pk)
+        .values_list('organizacao_id', flat=True)
+        .first()
+    )
+
+
+def organizacao_da_requisicao(request):
+    """
+    Id da organização da requisição, lido do claim do token já validado.
+    Trocas de organização valem a partir do próximo login. Sem o claim
+    (tokens emitidos antes das organizações) a organização é buscada no
+    vínculo do usuário, uma vez por requisição: esses tokens não podem cair
+    nos dados sem organização.
+    """
+    payload = getattr(request.auth, 'payload', None)
+    if payload is None:
+        return None
+    if settings.ORGANIZACAO_CLAIM in payload:
+        return payload[settings.ORGANIZACAO_CLAIM]
+    if not hasattr(request, '_organizacao_do_usuario'):
+        request._organizacao_do_usuario = organizacao_do_usuario(request.user)
+    return request._organizacao_do_usuario
+
+
+class EscopoOrganizacaoMixin:
+    """
+    Mixin de viewsets de modelos com `organizacao`: restringe o queryset à
+    organização da requisição. Quem cria registros grava `organizacao_id`.
+    """
+
+    @cached_property
+    def organizacao_id(self):
+        return organizacao_da_requisicao(self.request)
+
+    def get_queryset(self):
+        return super().get_queryset().da_organizacao(self.organizacao_id)
+
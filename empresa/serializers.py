@@ -1,10 +1,11 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from .models import ConfiguracaoEmpresa
-from .validators.cnpj_validator import validar_cnpj
-from .services.cnpj_service import consultar_cnpj
+from .validators.cnpj_validators import validar_cnpj
 
 class ConfiguracaoEmpresaSerializer(serializers.ModelSerializer):
     buscar_dados = serializers.BooleanField(default=False, write_only=True)
+    logo_renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = ConfiguracaoEmpresa
@@ -15,17 +16,28 @@ class ConfiguracaoEmpresaSerializer(serializers.ModelSerializer):
             'estado_sigla': {'required': False}
         }
         
+    def get_logo_renditions(self, obj):
+        """
+        URLs das versões redimensionadas do logo, por tamanho e formato
+        """
+        request = self.context.get('request')
+        renditions = {}
+        for tamanho, formatos in obj.logo_renditions.items():
+            if tamanho == 'origem':
+                continue
+            renditions[tamanho] = {}
+            for extensao, nome in formatos.items():
+                url = default_storage.url(nome)
+                renditions[tamanho][extensao] = request.build_absolute_uri(url) if request else url
+        return renditions
+        
     def validate_cnpj(self, value):
-        return validar_cnpj(value)
+        try:
+            return validar_cnpj(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
         
     def validate(self, data):
-        if data.pop('buscar_dados', False):
-            cnpj = data.get('cnpj')
-            if cnpj:
-                try:
-                    info = consultar_cnpj(cnpj)
-                    data.update(info)
-                except Exception as e:
-                    print(f"Erro ao consultar CNPJ: {str(e)}")
-                
+        # A consulta à ReceitaWS é feita em segundo plano após salvar (empresa/tarefas.py)
+        self.buscar_dados = data.pop('buscar_dados', False)
         return data
\ No newline at end of file
@@ -1,12 +1,16 @@
 import requests
+from django.conf import settings
+
+from app.disjuntor import obter_disjuntor
+
+disjuntor = obter_disjuntor('receitaws')
 
 def consultar_cnpj(cnpj):
     """
     Consulta os dados de um CNPJ usando API ReceitaWS
     """
     cnpj_numerico = ''.join(filter(str.isdigit, cnpj))
-    response = requests.get(f'https://www.receitaws.com.br/v1/cnpj/{cnpj_numerico}')
-    data = response.json()
+    data = disjuntor.chamar_json(requests.get, f'{settings.RECEITAWS_URL}/cnpj/{cnpj_numerico}', timeout=settings.APIS_EXTERNAS_TIMEOUT)
     
     if 'status' in data and data['status'] == 'ERROR':
         raise ValueError(data.get('message', 'Erro na consulta do CNPJ'))
@@ -0,0 +1,95 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import F
+
+# Tamanhos (maior dimensão, em pixels) e formatos gerados para o logo
+TAMANHOS_LOGO = (64, 128, 256)
+FORMATOS_LOGO = {
+    'webp': {'format': 'WEBP', 'quality': 85, 'method': 6},
+    'png': {'format': 'PNG', 'optimize': True},
+}
+DIRETORIO_RENDITIONS = 'empresa/logos/renditions/'
+
+logger = logging.getLogger(__name__)
+
+# Processamento fora da thread da requisição
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='logo')
+
+
+def _renderizar(imagem, tamanho, opcoes):
+    from PIL import Image
+
+    copia = imagem.copy()
+    copia.thumbnail((tamanho, tamanho), Image.LANCZOS)
+    buffer = BytesIO()
+    copia.save(buffer, **opcoes)
+    return buffer.getvalue()
+
+
+def gerar_renditions(arquivo):
+    """
+    Gera as versões redimensionadas do logo e salva cada uma com nome baseado
+    no hash do conteúdo (seguro para cache imutável). Retorna os caminhos por tamanho e formato.
+    """
+    # Pillow é importado só aqui: o módulo é carregado na inicialização pelos signals da empresa
+    from PIL import Image
+
+    arquivo.open('rb')
+    try:
+        with Image.open(arquivo) as original:
+            imagem = original.convert('RGBA')
+    finally:
+        arquivo.close()
+
+    renditions = {}
+    for tamanho in TAMANHOS_LOGO:
+        renditions[str(tamanho)] = {}
+        for extensao, opcoes in FORMATOS_LOGO.items():
+            conteudo = _renderizar(imagem, tamanho, opcoes)
+            digest = hashlib.sha256(conteudo).hexdigest()[:16]
+            nome = f'{DIRETORIO_RENDITIONS}{digest}_{tamanho}.{extensao}'
+            if not default_storage.exists(nome):
+                nome = default_storage.save(nome, ContentFile(conteudo))
+            renditions[str(tamanho)][extensao] = nome
+    return renditions
+
+
+def processar_logo(configuracao_id):
+    """
+    Gera as renditions do logo atual da configuração e grava no registro
+    """
+    from ..models import ConfiguracaoEmpresa
+    from ..configuracao import invalidar_configuracao
+
+    configuracao = ConfiguracaoEmpresa.objects.filter(pk=configuracao_id).first()
+    if configuracao is None or not configuracao.logo:
+        return
+    renditions = gerar_renditions(configuracao.logo)
+    renditions['origem'] = configuracao.logo.name
+    # update() não dispara post_save, evitando reprocessar o logo; a nova versão muda o ETag
+    ConfiguracaoEmpresa.objects.filter(
+        pk=configuracao_id, logo=configuracao.logo.name
+    ).update(logo_renditions=renditions, versao=F('versao') + 1)
+    invalidar_configuracao(configuracao.organizacao_id)
+
+
+def _processar_em_segundo_plano(configuracao_id):
+    try:
+        processar_logo(configuracao_id)
+    except Exception:
+        logger.exception("Erro ao processar logo da configuração %s", configuracao_id)
+    finally:
+        connection.close()
+
+
+def agendar_processamento_logo(configuracao_id):
+    """
+    Agenda a geração das renditions em segundo plano
+    """
+    return _executor.submit(_processar_em_segundo_plano, configuracao_id)
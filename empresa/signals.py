@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ConfiguracaoEmpresa
+from .configuracao import invalidar_configuracao
+from .services.logo_service import agendar_processamento_logo
+
+
+@receiver([post_save, post_delete], sender=ConfiguracaoEmpresa)
+def atualizar_cache_configuracao(sender, instance, **kwargs):
+    """Invalida a configuração em cache quando ela é salva ou removida"""
+    organizacao_id = instance.organizacao_id
+    invalidar_configuracao(organizacao_id)
+    # Invalida novamente após o commit, para que outros workers não guardem dados antigos
+    transaction.on_commit(lambda: invalidar_configuracao(organizacao_id))
+
+
+@receiver(post_save, sender=ConfiguracaoEmpresa)
+def processar_logo_alterado(sender, instance, **kwargs):
+    """Agenda a geração das renditions quando um novo logo é enviado"""
+    if instance.logo and instance.logo_renditions.get('origem') != instance.logo.name:
+        transaction.on_commit(lambda: agendar_processamento_logo(instance.pk))
@@ -0,0 +1,58 @@
+from django.db.models import F
+from django.utils import timezone
+
+from fila.registro import tarefa, enfileirar, TarefaDefinitiva
+from .models import ConfiguracaoEmpresa
+from .configuracao import invalidar_configuracao
+from .services.cnpj_service import consultar_cnpj
+
+ENRIQUECER_CNPJ = 'empresa.enriquecer_cnpj'
+
+# Campos preenchidos a partir da ReceitaWS, quando vierem com valor
+CAMPOS_ENRIQUECIDOS = ['razao_social', 'nome_fantasia', 'endereco', 'cep', 'telefone', 'email']
+
+
+def agendar_enriquecimento(config):
+    """
+    Enfileira a consulta do CNPJ da empresa na ReceitaWS
+    """
+    return enfileirar(
+        ENRIQUECER_CNPJ,
+        {'configuracao_id': config.pk},
+        chave_idempotencia=f"{ENRIQUECER_CNPJ}:{config.pk}:{config.versao}",
+    )
+
+
+def _atualizar(configuracao_id, **campos):
+    configuracoes = ConfiguracaoEmpresa.objects.filter(pk=configuracao_id)
+    configuracoes.update(versao=F('versao') + 1, data_atualizacao=timezone.now(), **campos)
+    for organizacao_id in configuracoes.values_list('organizacao_id', flat=True):
+        invalidar_configuracao(organizacao_id)
+
+
+def _registrar_falha(payload, erro):
+    _atualizar(payload['configuracao_id'], status_enriquecimento=ConfiguracaoEmpresa.ENRIQUECIMENTO_ERRO)
+
+
+@tarefa(ENRIQUECER_CNPJ, ao_falhar=_registrar_falha)
+def enriquecer_cnpj(configuracao_id):
+    """
+    Preenche a configuração com os dados do CNPJ consultados na ReceitaWS
+    """
+    config = ConfiguracaoEmpresa.objects.filter(pk=configuracao_id).first()
+    if config is None:
+        return
+
+    try:
+        info = consultar_cnpj(config.cnpj)
+    except ValueError as e:
+        raise TarefaDefinitiva(str(e))
+
+    campos = {}
+    for campo in CAMPOS_ENRIQUECIDOS:
+        valor = (info.get(campo) or '').strip()
+        max_length = ConfiguracaoEmpresa._meta.get_field(campo).max_length
+        if valor and len(valor) <= max_length:
+            campos[campo] = valor
+
+    _atualizar(configuracao_id, status_enriquecimento=ConfiguracaoEmpresa.ENRIQUECIMENTO_CONCLUIDO, **campos)
@@ -1,3 +1,315 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import BytesIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from unittest.mock import patch
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.cache import limpar_caches
+from usuario.serializers import TokenOrganizacaoSerializer
+
+from .models import ConfiguracaoEmpresa, MembroOrganizacao, Organizacao
+from .configuracao import obter_configuracao
+from fila.models import Tarefa
+from fila.worker import executar_pendentes
+from simulador.servidor import SimuladorUpstream
+from .services.logo_service import processar_logo, TAMANHOS_LOGO
+from .tarefas import ENRIQUECER_CNPJ
+from .views import ConfiguracaoEmpresaViewSet
+
+
+class ConfiguracaoEmpresaTestCase(APITestCase):
+    """Testes para o viewset ConfiguracaoEmpresaViewSet"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='admin', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        self.config = ConfiguracaoEmpresa.objects.create(
+            razao_social="Prestadora LTDA",
+            nome_fantasia="Prestadora",
+            cnpj="11.222.333/0001-81",
+            endereco="Rua Teste, 123",
+            cep="01234-567",
+            cidade_id=3550308,
+            cidade_nome="São Paulo",
+            estado_id=35,
+            estado_sigla="SP",
+            email="contato@prestadora.com",
+            representante_nome="Maria Souza",
+            representante_cargo="Diretora",
+            representante_cpf="529.982.247-25",
+        )
+        self.url = '/empresa/configuracao/atual/'
+    
+    def test_atual_not_modified(self):
+        """Teste para retornar 304 quando a configuração não mudou"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_atual_sem_consulta_ao_banco(self):
+        """Teste para servir a configuração do cache do processo sem consultar o banco"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            obter_configuracao()
+    
+    def test_cache_invalidado_ao_atualizar(self):
+        """Teste para refletir alterações da configuração após o save"""
+        self.assertEqual(obter_configuracao().nome_fantasia, "Prestadora")
+        response = self.client.patch(
+            f'/empresa/configuracao/{self.config.id}/', {'nome_fantasia': 'Nova Prestadora'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(obter_configuracao().nome_fantasia, "Nova Prestadora")
+
+    
+    def _dados(self, **kwargs):
+        dados = {
+            "razao_social": "Prestadora LTDA",
+            "nome_fantasia": "Prestadora",
+            "cnpj": "11222333000181",
+            "endereco": "Rua Teste, 123",
+            "cep": "01234-567",
+            "cidade_id": 3550308,
+            "cidade_nome": "São Paulo",
+            "estado_id": 35,
+            "estado_sigla": "SP",
+            "email": "contato@prestadora.com",
+            "representante_nome": "Maria Souza",
+            "representante_cargo": "Diretora",
+            "representante_cpf": "529.982.247-25",
+        }
+        dados.update(kwargs)
+        return dados
+    
+    def test_put_atual_atualiza_no_lugar(self):
+        """Teste para o upsert atualizar o registro existente e incrementar a versão"""
+        response = self.client.put(self.url, self._dados(nome_fantasia="Atualizada"), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.config.id)
+        self.assertEqual(response.data['versao'], 2)
+        self.assertEqual(ConfiguracaoEmpresa.objects.count(), 1)
+    
+    def test_put_atual_cria_quando_vazio(self):
+        """Teste para o upsert criar a configuração quando não existe"""
+        ConfiguracaoEmpresa.objects.all().delete()
+        response = self.client.put(self.url, self._dados(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ConfiguracaoEmpresa.objects.count(), 1)
+    
+    def test_substituir_cria_com_201(self):
+        """Teste para o substituir responder 201 ao criar e 200 ao atualizar"""
+        ConfiguracaoEmpresa.objects.all().delete()
+        response = self.client.post('/empresa/configuracao/substituir/', self._dados(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post('/empresa/configuracao/substituir/', self._dados(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_put_atual_criacao_concorrente_vira_atualizacao(self):
+        """Teste para a criação que perde a corrida atualizar a configuração criada pela outra"""
+        existente = self.config
+        consultas = iter([None, existente])
+        with patch.object(ConfiguracaoEmpresaViewSet, 'get_queryset') as get_queryset:
+            get_queryset.return_value.select_for_update.return_value.order_by.return_value.first.side_effect = (
+                lambda: next(consultas)
+            )
+            response = self.client.put(self.url, self._dados(nome_fantasia="Concorrente"), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(ConfiguracaoEmpresa.objects.count(), 1)
+        self.assertEqual(ConfiguracaoEmpresa.objects.get().nome_fantasia, "Concorrente")
+    
+    def test_substituir_invalido_mantem_configuracao(self):
+        """Teste para não perder a configuração quando a validação falha"""
+        response = self.client.post('/empresa/configuracao/substituir/', self._dados(cnpj="123"), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(ConfiguracaoEmpresa.objects.filter(pk=self.config.id).exists())
+    
+    @patch('empresa.tarefas.consultar_cnpj')
+    def test_buscar_dados_em_segundo_plano(self, mock_consultar):
+        """Teste para consultar o CNPJ na ReceitaWS fora da requisição"""
+        mock_consultar.return_value = {'razao_social': 'RAZAO RECEITA LTDA', 'telefone': ''}
+        
+        response = self.client.put(self.url, self._dados(buscar_dados=True), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status_enriquecimento'], ConfiguracaoEmpresa.ENRIQUECIMENTO_PENDENTE)
+        mock_consultar.assert_not_called()
+        
+        executar_pendentes()
+        config = obter_configuracao()
+        self.assertEqual(config.status_enriquecimento, ConfiguracaoEmpresa.ENRIQUECIMENTO_CONCLUIDO)
+        self.assertEqual(config.razao_social, 'RAZAO RECEITA LTDA')
+    
+    def test_enriquecimento_com_receitaws_fora_do_ar_e_reagendado(self):
+        """Teste para tentar de novo o enriquecimento quando a ReceitaWS responde 503"""
+        cache.clear()
+        self.client.put(self.url, self._dados(buscar_dados=True), format='json')
+        with SimuladorUpstream(taxa_erro=1.0) as simulador, override_settings(**simulador.urls):
+            executar_pendentes()
+        
+        tarefa = Tarefa.objects.get(nome=ENRIQUECER_CNPJ)
+        self.assertEqual(tarefa.status, Tarefa.PENDENTE)
+        self.assertEqual(tarefa.tentativas, 1)
+        self.assertGreater(tarefa.executar_apos, timezone.now())
+        self.assertIn('ServicoIndisponivel', tarefa.erro)
+        self.assertEqual(obter_configuracao().status_enriquecimento, ConfiguracaoEmpresa.ENRIQUECIMENTO_PENDENTE)
+    
+    @patch('empresa.tarefas.consultar_cnpj')
+    def test_enriquecimento_com_cnpj_invalido_falha_definitivamente(self, mock_consultar):
+        """Teste para não tentar de novo quando a ReceitaWS responde que o CNPJ é inválido"""
+        mock_consultar.side_effect = ValueError('CNPJ inválido')
+        self.client.put(self.url, self._dados(buscar_dados=True), format='json')
+        executar_pendentes()
+        
+        self.assertEqual(Tarefa.objects.get(nome=ENRIQUECER_CNPJ).status, Tarefa.FALHOU)
+        self.assertEqual(obter_configuracao().status_enriquecimento, ConfiguracaoEmpresa.ENRIQUECIMENTO_ERRO)
+    
+    def test_consulta_cnpj_com_receitaws_fora_do_ar_responde_503(self):
+        """Teste para a consulta de CNPJ responder 503, e não 400, com a ReceitaWS fora do ar"""
+        cache.clear()
+        with SimuladorUpstream(taxa_erro=1.0) as simulador, override_settings(**simulador.urls):
+            response = self.client.get('/empresa/consulta/cnpj/11222333000181/')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    def test_if_match_desatualizado_retorna_412(self):
+        """Teste para recusar a gravação quando a configuração mudou desde a leitura"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.put(self.url, self._dados(nome_fantasia="Primeira"), format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+        
+        response = self.client.patch(
+            f'/empresa/configuracao/{self.config.id}/', {'nome_fantasia': 'Segunda'}, format='json', HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(obter_configuracao().nome_fantasia, "Primeira")
+
+class LogoRenditionsTestCase(APITestCase):
+    """Testes para a geração das versões redimensionadas do logo"""
+    
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        self.user = User.objects.create_user(username='admin', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.user)
+        
+        buffer = BytesIO()
+        Image.new('RGB', (1200, 600), color='red').save(buffer, format='PNG')
+        self.config = ConfiguracaoEmpresa.objects.create(
+            razao_social="Prestadora LTDA",
+            nome_fantasia="Prestadora",
+            cnpj="11.222.333/0001-81",
+            endereco="Rua Teste, 123",
+            cep="01234-567",
+            cidade_id=3550308,
+            cidade_nome="São Paulo",
+            estado_id=35,
+            estado_sigla="SP",
+            email="contato@prestadora.com",
+            representante_nome="Maria Souza",
+            representante_cargo="Diretora",
+            representante_cpf="529.982.247-25",
+            logo=SimpleUploadedFile('logo.png', buffer.getvalue(), content_type='image/png'),
+        )
+    
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+    
+    def test_processar_logo(self):
+        """Teste para gerar renditions WebP/PNG com nomes baseados no conteúdo"""
+        processar_logo(self.config.id)
+        self.config.refresh_from_db()
+        
+        renditions = self.config.logo_renditions
+        self.assertEqual(renditions['origem'], self.config.logo.name)
+        for tamanho in TAMANHOS_LOGO:
+            caminho = renditions[str(tamanho)]['webp']
+            with Image.open(f"{self.media_root}/{caminho}") as imagem:
+                self.assertEqual(max(imagem.size), tamanho)
+    
+    def test_serializer_expoe_urls(self):
+        """Teste para expor as URLs das renditions na configuração atual"""
+        processar_logo(self.config.id)
+        response = self.client.get('/empresa/configuracao/atual/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['logo_renditions']['128']['png'].endswith('_128.png'))
+
+
+class OrganizacaoTestCase(APITestCase):
+    """Testes para a configuração da empresa por organização"""
+    
+    def setUp(self):
+        limpar_caches()
+        self.organizacao = Organizacao.objects.create(nome='Prestadora A', slug='prestadora-a')
+        self.user = User.objects.create_user(username='admin', password='testpass', is_staff=True)
+        MembroOrganizacao.objects.create(usuario=self.user, organizacao=self.organizacao)
+        self.legada = ConfiguracaoEmpresa.objects.create(
+            razao_social="Legada LTDA", nome_fantasia="Legada", cnpj="11.444.777/0001-61",
+            endereco="Rua Teste, 123", cep="01234-567", cidade_id=3550308, cidade_nome="São Paulo",
+            estado_id=35, estado_sigla="SP", email="contato@legada.com",
+            representante_nome="Maria Souza", representante_cargo="Diretora", representante_cpf="529.982.247-25",
+        )
+        self.url = '/empresa/configuracao/atual/'
+        token = TokenOrganizacaoSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    
+    def _dados(self):
+        return {
+            "razao_social": "Prestadora A LTDA", "nome_fantasia": "Prestadora A", "cnpj": "11222333000181",
+            "endereco": "Rua Teste, 123", "cep": "01234-567", "cidade_id": 3550308, "cidade_nome": "São Paulo",
+            "estado_id": 35, "estado_sigla": "SP", "email": "contato@prestadora.com",
+            "representante_nome": "Maria Souza", "representante_cargo": "Diretora",
+            "representante_cpf": "529.982.247-25",
+        }
+    
+    def test_token_com_organizacao(self):
+        """Teste para incluir a organização no token de acesso, inclusive no renovado"""
+        response = self.client.post('/token/', {'username': 'admin', 'password': 'testpass'}, format='json')
+        self.assertEqual(AccessToken(response.data['access'])['organizacao'], self.organizacao.id)
+        
+        response = self.client.post('/token/refresh/', {'refresh': response.data['refresh']}, format='json')
+        self.assertEqual(AccessToken(response.data['access'])['organizacao'], self.organizacao.id)
+    
+    def test_configuracao_da_organizacao(self):
+        """Teste para criar e ler a configuração da organização sem alterar a configuração legada"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        
+        response = self.client.put(self.url, self._dados(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ConfiguracaoEmpresa.objects.get(pk=response.data['id']).organizacao_id, self.organizacao.id)
+        self.assertEqual(self.client.get(self.url).data['nome_fantasia'], "Prestadora A")
+        self.assertEqual(obter_configuracao().nome_fantasia, "Legada")
+        self.assertEqual(obter_configuracao(self.organizacao.id).nome_fantasia, "Prestadora A")
+    
+    def test_organizacao_lida_do_token(self):
+        """Teste para resolver a organização pelo token, sem consultar o vínculo do usuário"""
+        self.client.put(self.url, self._dados(), format='json')
+        self.client.get(self.url)
+        with self.assertNumQueries(1):  # somente o usuário do token
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_token_sem_claim_usa_organizacao_do_usuario(self):
+        """Teste para resolver pelo vínculo do usuário a organização de tokens emitidos sem o claim"""
+        self.client.put(self.url, self._dados(), format='json')
+        token = AccessToken.for_user(self.user)
+        self.assertNotIn('organizacao', token.payload)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['nome_fantasia'], "Prestadora A")
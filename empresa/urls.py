@@ -7,5 +7,5 @@ router.register(r'configuracao', ConfiguracaoEmpresaViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
-    path('consulta/cnpj/<str:cnpj>/', ConfiguracaoEmpresaViewSet.as_view({'get': 'consultar_cnpj'})),
+    path('consulta/cnpj/<str:cnpj>/', ConfiguracaoEmpresaViewSet.as_view({'get': 'consultar_cnpj'}, throttle_scope='consulta')),
 ]
\ No newline at end of file
@@ -2,19 +2,35 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from app.concorrencia import ConcorrenciaOtimistaMixin
+from app.disjuntor import ServicoIndisponivel
+from app.conditional import para_timestamp, verificar_condicional, aplicar_validadores
 from .models import ConfiguracaoEmpresa
+from .configuracao import cache_configuracao, obter_configuracao, invalidar_configuracao
+from .organizacao import EscopoOrganizacaoMixin
 from .serializers import ConfiguracaoEmpresaSerializer
+from .tarefas import agendar_enriquecimento
 from usuario.permissions import IsStaffUser
+from auditoria.models import RegistroAuditoria
+from auditoria.registro import capturar_estado, registrar_alteracoes
 from .services.cnpj_service import consultar_cnpj
 
-class ConfiguracaoEmpresaViewSet(viewsets.ModelViewSet):
+class ConfiguracaoEmpresaViewSet(ConcorrenciaOtimistaMixin, EscopoOrganizacaoMixin, viewsets.ModelViewSet):
+    """
+    Configuração da empresa da organização do usuário (uma por organização)
+    """
     queryset = ConfiguracaoEmpresa.objects.all()
+    prefixo_etag = 'configuracao_empresa'
     serializer_class = ConfiguracaoEmpresaSerializer
     permission_classes = [IsAuthenticated, IsStaffUser]
+    # Escopo de limite de taxa das rotas declaradas em urls.py (consulta de CNPJ);
+    # as demais usam o escopo pelo método (app/limites.py)
+    throttle_scope = None
     
     def create(self, request, *args, **kwargs):
-        if ConfiguracaoEmpresa.objects.exists():
+        if obter_configuracao(self.organizacao_id) is not None:
             return Response(
                 {"detail": "Já existe uma empresa cadastrada. Use PATCH para atualizar ou DELETE para remover."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -24,33 +40,106 @@ class ConfiguracaoEmpresaViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return self.atual(request)
     
+    def _extras_enriquecimento(self, serializer):
+        if getattr(serializer, 'buscar_dados', False):
+            return {'status_enriquecimento': ConfiguracaoEmpresa.ENRIQUECIMENTO_PENDENTE}
+        return {}
+    
+    def _agendar_enriquecimento(self, serializer, config):
+        if getattr(serializer, 'buscar_dados', False):
+            agendar_enriquecimento(config)
+    
     def perform_create(self, serializer):
-        serializer.save(criado_por=self.request.user, atualizado_por=self.request.user)
+        config = serializer.save(
+            organizacao_id=self.organizacao_id,
+            criado_por=self.request.user,
+            atualizado_por=self.request.user,
+            **self._extras_enriquecimento(serializer)
+        )
+        registrar_alteracoes(config, {}, self.request.user, RegistroAuditoria.CRIACAO)
+        self._agendar_enriquecimento(serializer, config)
     
     def perform_update(self, serializer):
-        serializer.save(atualizado_por=self.request.user, data_atualizacao=timezone.now())
+        # A versão é incrementada pelo save(); com If-Match/versao o UPDATE é condicional
+        self.definir_versao_esperada(serializer.instance)
+        antes = capturar_estado(serializer.instance)
+        config = serializer.save(
+            atualizado_por=self.request.user,
+            data_atualizacao=timezone.now(),
+            **self._extras_enriquecimento(serializer)
+        )
+        registrar_alteracoes(config, antes, self.request.user)
+        self._agendar_enriquecimento(serializer, config)
+    
+    def perform_destroy(self, instance):
+        antes = capturar_estado(instance)
+        instance.delete()
+        registrar_alteracoes(instance, antes, self.request.user, RegistroAuditoria.EXCLUSAO)
+    
+    def salvar_configuracao(self, request):
+        """
+        Cria ou atualiza a configuração única da empresa em uma transação.
+        Os dados são validados antes de bloquear o registro, que é então
+        atualizado no lugar (sem apagar) e tem a versão incrementada.
+        """
+        serializer = self.get_serializer(obter_configuracao(self.organizacao_id), data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        with transaction.atomic():
+            config = self.get_queryset().select_for_update().order_by('id').first()
+            if config is None:
+                serializer.instance = None
+                try:
+                    with transaction.atomic():
+                        self.perform_create(serializer)
+                    return self.aplicar_etag_versao(Response(serializer.data, status=status.HTTP_201_CREATED))
+                except IntegrityError:
+                    # Outra requisição criou a configuração da organização ao mesmo
+                    # tempo (não há linha para bloquear antes): vira atualização
+                    config = self.get_queryset().select_for_update().order_by('id').first()
+                    if config is None:
+                        raise
+            
+            serializer.instance = config
+            self.perform_update(serializer)
+        return self.aplicar_etag_versao(Response(serializer.data))
     
     @action(detail=False, methods=['get'])
     def atual(self, request):
         try:
-            config = ConfiguracaoEmpresa.objects.first()
+            config = obter_configuracao(self.organizacao_id)
             if config:
-                serializer = self.get_serializer(config)
-                return Response(serializer.data)
+                modificado = config.data_atualizacao or config.data_criacao
+                etag = self.etag_da_versao(config.id, config.versao)
+                last_modified = para_timestamp(modificado)
+                response = verificar_condicional(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    # URLs do logo são absolutas: a representação varia com o host da requisição
+                    dados = cache_configuracao.para(self.organizacao_id).obter(
+                        f"representacao:{request.build_absolute_uri('/')}",
+                        lambda: self.get_serializer(config).data,
+                    )
+                    response = Response(dados)
+                return aplicar_validadores(response, etag, last_modified)
             return Response({"detail": "Nenhuma configuração encontrada"}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @atual.mapping.put
+    def atualizar_atual(self, request):
+        """
+        Upsert atômico da configuração atual (PUT /empresa/configuracao/atual/)
+        """
+        return self.salvar_configuracao(request)
+    
     @action(detail=False, methods=['post'])
     def substituir(self, request):
-        try:
-            ConfiguracaoEmpresa.objects.all().delete()
-            serializer = self.get_serializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            self.perform_create(serializer)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        except Exception as e:
-            return Response({"error": f"Erro ao substituir configuração: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST)
+        """
+        Mantido por compatibilidade: equivale ao PUT em /atual/
+        """
+        response = self.salvar_configuracao(request)
+        invalidar_configuracao(self.organizacao_id)
+        return response
             
     @action(detail=False, methods=['get'])
     def consultar_cnpj(self, request, cnpj):
@@ -59,5 +148,7 @@ class ConfiguracaoEmpresaViewSet(viewsets.ModelViewSet):
             return Response(empresa_dados)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ServicoIndisponivel as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response({"error": f"Erro ao consultar CNPJ: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Tarefa
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ['id', 'nome', 'status', 'prioridade', 'tentativas', 'executar_apos', 'data_criacao']
+    list_filter = ['status', 'nome']
+    search_fields = ['nome', 'chave_idempotencia']
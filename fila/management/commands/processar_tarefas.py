@@ -0,0 +1,48 @@
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from fila.worker import executar_pendentes, loop_worker
+
+
+def _iniciar_processo(intervalo, parar):
+    # Cada processo abre suas próprias conexões com o banco
+    connections.close_all()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    loop_worker(intervalo, parar)
+
+
+class Command(BaseCommand):
+    help = 'Inicia os workers que processam a fila de tarefas assíncronas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processos', type=int, default=1, help='Quantidade de processos worker')
+        parser.add_argument('--intervalo', type=float, default=1.0, help='Segundos de espera quando a fila está vazia')
+        parser.add_argument('--uma-vez', action='store_true', help='Processa as tarefas pendentes e encerra')
+
+    def handle(self, *args, **options):
+        if options['uma_vez']:
+            total = executar_pendentes()
+            self.stdout.write(self.style.SUCCESS(f'{total} tarefa(s) processada(s)'))
+            return
+
+        parar = multiprocessing.Event()
+        connections.close_all()
+        processos = [
+            multiprocessing.Process(target=_iniciar_processo, args=(options['intervalo'], parar), daemon=True)
+            for _ in range(options['processos'])
+        ]
+        for processo in processos:
+            processo.start()
+        self.stdout.write(self.style.SUCCESS(f'{len(processos)} worker(s) iniciado(s)'))
+
+        try:
+            for processo in processos:
+                processo.join()
+        except KeyboardInterrupt:
+            self.stdout.write('Encerrando workers...')
+            parar.set()
+            for processo in processos:
+                processo.join()
@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tarefa(models.Model):
+    """Tarefa assíncrona armazenada no banco e executada pelos workers da fila"""
+
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDA = 'concluida'
+    FALHOU = 'falhou'
+    STATUS_CHOICES = [
+        (PENDENTE, 'Pendente'),
+        (EXECUTANDO, 'Executando'),
+        (CONCLUIDA, 'Concluída'),
+        (FALHOU, 'Falhou'),
+    ]
+
+    nome = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=15, choices=STATUS_CHOICES, default=PENDENTE)
+    # Tarefas com prioridade maior são executadas primeiro
+    prioridade = models.SmallIntegerField(default=0)
+    chave_idempotencia = models.CharField(max_length=255, unique=True, null=True, blank=True)
+
+    tentativas = models.PositiveSmallIntegerField(default=0)
+    max_tentativas = models.PositiveSmallIntegerField(default=5)
+    executar_apos = models.DateTimeField(default=timezone.now)
+    erro = models.TextField(blank=True, default='')
+
+    # Controle do worker que reservou a tarefa
+    reservada_por = models.CharField(max_length=100, blank=True, default='')
+    reservada_em = models.DateTimeField(null=True, blank=True)
+
+    data_criacao = models.DateTimeField(auto_now_add=True)
+    data_conclusao = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.nome} #{self.pk} ({self.status})"
+
+    class Meta:
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        db_table = 'fila_tarefas'
+        indexes = [
+            models.Index(fields=['status', '-prioridade', 'executar_apos'], name='fila_tarefa_proxima_idx'),
+        ]
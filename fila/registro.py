@@ -0,0 +1,56 @@
+from django.db import IntegrityError, transaction
+
+from .models import Tarefa
+
+# Funções registradas por nome de tarefa
+_tarefas = {}
+
+
+class TarefaDefinitiva(Exception):
+    """Erro que não deve gerar novas tentativas (ex.: dado inválido)"""
+
+
+def tarefa(nome, ao_falhar=None):
+    """
+    Decorator que registra uma função como tarefa da fila.
+    `ao_falhar(payload, erro)` é chamado quando a tarefa falha definitivamente.
+    """
+    def decorator(func):
+        _tarefas[nome] = {'funcao': func, 'ao_falhar': ao_falhar}
+        return func
+    return decorator
+
+
+def obter_tarefa(nome):
+    try:
+        return _tarefas[nome]
+    except KeyError:
+        raise LookupError(f"Tarefa não registrada: {nome}")
+
+
+def enfileirar(nome, payload=None, prioridade=0, chave_idempotencia=None, max_tentativas=5, executar_apos=None):
+    """
+    Cria uma tarefa pendente. Se já existir uma tarefa com a mesma chave de
+    idempotência, ela é retornada e nenhuma nova tarefa é criada.
+    """
+    obter_tarefa(nome)
+    campos = {
+        'nome': nome,
+        'payload': payload or {},
+        'prioridade': prioridade,
+        'max_tentativas': max_tentativas,
+    }
+    if executar_apos is not None:
+        campos['executar_apos'] = executar_apos
+
+    if chave_idempotencia is None:
+        return Tarefa.objects.create(**campos)
+
+    existente = Tarefa.objects.filter(chave_idempotencia=chave_idempotencia).first()
+    if existente is not None:
+        return existente
+    try:
+        with transaction.atomic():
+            return Tarefa.objects.create(chave_idempotencia=chave_idempotencia, **campos)
+    except IntegrityError:
+        return Tarefa.objects.get(chave_idempotencia=chave_idempotencia)
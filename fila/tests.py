@@ -0,0 +1,83 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Tarefa
+from .registro import tarefa, enfileirar
+from .worker import executar_pendentes
+
+executadas = []
+falhas = []
+
+
+@tarefa('teste.registrar')
+def registrar(valor):
+    executadas.append(valor)
+
+
+@tarefa('teste.falhar', ao_falhar=lambda payload, erro: falhas.append(payload))
+def falhar(**kwargs):
+    raise ConnectionError("serviço indisponível")
+
+
+def callback_com_erro(payload, erro):
+    raise RuntimeError("callback quebrado")
+
+
+@tarefa('teste.falhar_callback', ao_falhar=callback_com_erro)
+def falhar_com_callback_quebrado(**kwargs):
+    raise ConnectionError("serviço indisponível")
+
+
+class FilaTestCase(TestCase):
+    """Testes para a fila de tarefas assíncronas"""
+    
+    def setUp(self):
+        executadas.clear()
+        falhas.clear()
+    
+    def test_chave_idempotencia(self):
+        """Teste para não duplicar tarefas com a mesma chave de idempotência"""
+        primeira = enfileirar('teste.registrar', {'valor': 1}, chave_idempotencia='chave-1')
+        segunda = enfileirar('teste.registrar', {'valor': 2}, chave_idempotencia='chave-1')
+        self.assertEqual(primeira.pk, segunda.pk)
+        self.assertEqual(Tarefa.objects.count(), 1)
+    
+    def test_prioridade(self):
+        """Teste para executar primeiro as tarefas de maior prioridade"""
+        enfileirar('teste.registrar', {'valor': 'baixa'}, prioridade=0)
+        enfileirar('teste.registrar', {'valor': 'alta'}, prioridade=10)
+        self.assertEqual(executar_pendentes(), 2)
+        self.assertEqual(executadas, ['alta', 'baixa'])
+        self.assertFalse(Tarefa.objects.exclude(status=Tarefa.CONCLUIDA).exists())
+    
+    def test_nova_tentativa_com_backoff(self):
+        """Teste para reagendar a tarefa com espera após uma falha"""
+        enfileirar('teste.falhar', max_tentativas=3)
+        executar_pendentes()
+        
+        tarefa_falha = Tarefa.objects.get()
+        self.assertEqual(tarefa_falha.status, Tarefa.PENDENTE)
+        self.assertEqual(tarefa_falha.tentativas, 1)
+        self.assertGreater(tarefa_falha.executar_apos, timezone.now())
+        # Não deve ser executada novamente antes do fim da espera
+        self.assertEqual(executar_pendentes(), 0)
+    
+    def test_falha_definitiva(self):
+        """Teste para marcar como falha após esgotar as tentativas"""
+        enfileirar('teste.falhar', {'origem': 'teste'}, max_tentativas=1)
+        executar_pendentes()
+        
+        tarefa_falha = Tarefa.objects.get()
+        self.assertEqual(tarefa_falha.status, Tarefa.FALHOU)
+        self.assertIn('serviço indisponível', tarefa_falha.erro)
+        self.assertEqual(falhas, [{'origem': 'teste'}])
+
+    def test_falha_definitiva_com_callback_quebrado(self):
+        """Teste para gravar a falha mesmo quando o callback ao_falhar levanta erro"""
+        enfileirar('teste.falhar_callback', max_tentativas=1)
+        with self.assertLogs('fila.worker', level='ERROR'):
+            executar_pendentes()
+
+        tarefa_falha = Tarefa.objects.get()
+        self.assertEqual(tarefa_falha.status, Tarefa.FALHOU)
+        self.assertEqual(tarefa_falha.reservada_por, '')
@@ -0,0 +1,132 @@
+import logging
+import os
+import random
+import socket
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import Tarefa
+from .registro import obter_tarefa, TarefaDefinitiva
+
+logger = logging.getLogger(__name__)
+
+# Espera base (em segundos) entre tentativas; dobra a cada nova falha
+BACKOFF_BASE = 5
+BACKOFF_MAXIMO = 3600
+# Tarefas reservadas há mais tempo que isso são consideradas abandonadas
+TEMPO_RESERVA = timedelta(minutes=10)
+# Quantidade de candidatas lidas por consulta
+LOTE_CANDIDATAS = 10
+
+
+def identificador_worker():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def calcular_backoff(tentativas):
+    """
+    Tempo de espera exponencial com jitter para a próxima tentativa
+    """
+    espera = min(BACKOFF_BASE * (2 ** (tentativas - 1)), BACKOFF_MAXIMO)
+    return timedelta(seconds=espera * random.uniform(0.8, 1.2))
+
+
+def liberar_tarefas_abandonadas():
+    """
+    Devolve para a fila tarefas reservadas por workers que pararam no meio da execução
+    """
+    limite = timezone.now() - TEMPO_RESERVA
+    return Tarefa.objects.filter(status=Tarefa.EXECUTANDO, reservada_em__lt=limite).update(
+        status=Tarefa.PENDENTE, reservada_por='', reservada_em=None
+    )
+
+
+def reservar_proxima(worker):
+    """
+    Reserva a próxima tarefa disponível usando UPDATE condicional, o que funciona
+    com vários workers em qualquer banco (inclusive SQLite, sem SKIP LOCKED)
+    """
+    agora = timezone.now()
+    candidatas = Tarefa.objects.filter(
+        status=Tarefa.PENDENTE, executar_apos__lte=agora
+    ).order_by('-prioridade', 'executar_apos', 'id').values_list('id', flat=True)[:LOTE_CANDIDATAS]
+
+    for tarefa_id in candidatas:
+        reservada = Tarefa.objects.filter(pk=tarefa_id, status=Tarefa.PENDENTE).update(
+            status=Tarefa.EXECUTANDO, reservada_por=worker, reservada_em=agora
+        )
+        if reservada:
+            return Tarefa.objects.get(pk=tarefa_id)
+    return None
+
+
+def executar_tarefa(tarefa):
+    """
+    Executa uma tarefa reservada, registrando sucesso, nova tentativa ou falha definitiva
+    """
+    tarefa.tentativas += 1
+    try:
+        definicao = obter_tarefa(tarefa.nome)
+        definicao['funcao'](**tarefa.payload)
+    except Exception as e:
+        definitiva = isinstance(e, (TarefaDefinitiva, LookupError))
+        tarefa.erro = f"{type(e).__name__}: {e}"
+        if definitiva or tarefa.tentativas >= tarefa.max_tentativas:
+            logger.error("Tarefa %s falhou definitivamente: %s", tarefa, tarefa.erro)
+            tarefa.status = Tarefa.FALHOU
+            tarefa.data_conclusao = timezone.now()
+            ao_falhar = None if isinstance(e, LookupError) else definicao['ao_falhar']
+            if ao_falhar:
+                # Um erro no callback não pode impedir de gravar a falha, senão a
+                # tarefa fica EXECUTANDO e volta à fila repetindo os efeitos
+                try:
+                    ao_falhar(tarefa.payload, e)
+                except Exception:
+                    logger.exception("Callback ao_falhar da tarefa %s falhou", tarefa)
+        else:
+            logger.warning("Tarefa %s falhou (tentativa %s): %s", tarefa, tarefa.tentativas, tarefa.erro)
+            tarefa.status = Tarefa.PENDENTE
+            tarefa.executar_apos = timezone.now() + calcular_backoff(tarefa.tentativas)
+    else:
+        tarefa.status = Tarefa.CONCLUIDA
+        tarefa.erro = ''
+        tarefa.data_conclusao = timezone.now()
+
+    tarefa.reservada_por = ''
+    tarefa.reservada_em = None
+    tarefa.save(update_fields=[
+        'status', 'tentativas', 'erro', 'executar_apos', 'data_conclusao', 'reservada_por', 'reservada_em'
+    ])
+    return tarefa
+
+
+def executar_pendentes(worker=None, limite=None):
+    """
+    Executa tarefas disponíveis até esvaziar a fila (ou atingir o limite).
+    Retorna a quantidade de tarefas processadas.
+    """
+    worker = worker or identificador_worker()
+    processadas = 0
+    while limite is None or processadas < limite:
+        tarefa = reservar_proxima(worker)
+        if tarefa is None:
+            break
+        executar_tarefa(tarefa)
+        processadas += 1
+    return processadas
+
+
+def loop_worker(intervalo=1.0, parar=None):
+    """
+    Loop principal de um processo worker
+    """
+    worker = identificador_worker()
+    logger.info("Worker %s iniciado", worker)
+    while parar is None or not parar.is_set():
+        close_old_connections()
+        liberar_tarefas_abandonadas()
+        if not executar_pendentes(worker, limite=100):
+            time.sleep(intervalo)
@@ -0,0 +1,47 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from simulador.servidor import SimuladorUpstream, Latencia
+
+
+class Command(BaseCommand):
+    help = 'Inicia o simulador local das APIs ReceitaWS, ViaCEP e IBGE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--porta', type=int, default=8099)
+        parser.add_argument('--latencia', choices=Latencia.TIPOS, default='fixa', help='Distribuição da latência')
+        parser.add_argument('--latencia-ms', type=float, default=100, help='Latência média em milissegundos')
+        parser.add_argument('--desvio-ms', type=float, default=0, help='Desvio da latência em milissegundos')
+        parser.add_argument('--taxa-erro', type=float, default=0.0, help='Fração de respostas 503 (0 a 1)')
+        parser.add_argument('--limite-rps', type=float, default=0, help='Requisições por segundo por serviço antes de 429')
+        parser.add_argument('--semente', type=int, default=None, help='Semente para resultados reprodutíveis')
+        parser.add_argument('--completar-municipios', type=int, default=0,
+                            help='Completa as listas de municípios por UF até esse tamanho')
+
+    def handle(self, *args, **options):
+        simulador = SimuladorUpstream(
+            host=options['host'],
+            porta=options['porta'],
+            latencia=options['latencia'],
+            latencia_ms=options['latencia_ms'],
+            desvio_ms=options['desvio_ms'],
+            taxa_erro=options['taxa_erro'],
+            limite_rps=options['limite_rps'],
+            semente=options['semente'],
+            completar_municipios=options['completar_municipios'],
+        )
+
+        async def executar():
+            servidor = await simulador.iniciar_async()
+            self.stdout.write(self.style.SUCCESS(f'Simulador ouvindo em {options["host"]}:{simulador.porta}'))
+            for nome, url in simulador.urls.items():
+                self.stdout.write(f'export {nome}={url}')
+            async with servidor:
+                await servidor.serve_forever()
+
+        try:
+            asyncio.run(executar())
+        except KeyboardInterrupt:
+            self.stdout.write('Simulador encerrado')
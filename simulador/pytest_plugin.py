@@ -0,0 +1,30 @@
+"""
+Fixtures do simulador de APIs externas para pytest (com pytest-django).
+Ative com `pytest_plugins = ['simulador.pytest_plugin']` no conftest.
+"""
+import pytest
+
+from .servidor import SimuladorUpstream
+
+
+@pytest.fixture(scope='session')
+def simulador_upstream(request):
+    """
+    Simulador compartilhado pela sessão. Os parâmetros do SimuladorUpstream podem
+    ser ajustados com `@pytest.mark.parametrize('simulador_upstream', [{...}], indirect=True)`
+    ou sobrescrevendo esta fixture no conftest.
+    """
+    config = getattr(request, 'param', None) or {}
+    with SimuladorUpstream(**config) as simulador:
+        yield simulador
+
+
+@pytest.fixture
+def upstream(settings, simulador_upstream):
+    """
+    Aponta os services para o simulador e zera as estatísticas do teste
+    """
+    for nome, url in simulador_upstream.urls.items():
+        setattr(settings, nome, url)
+    simulador_upstream.zerar_estatisticas()
+    return simulador_upstream
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+DIRETORIO_FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+STATUS_HTTP = {200: 'OK', 404: 'Not Found', 429: 'Too Many Requests', 503: 'Service Unavailable'}
+
+
+def carregar_fixture(nome):
+    with open(DIRETORIO_FIXTURES / f'{nome}.json', encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+class Latencia:
+    """
+    Distribuição de latência simulada (em milissegundos)
+    Tipos: fixa, uniforme (media ± desvio), normal e lognormal
+    """
+    TIPOS = ('fixa', 'uniforme', 'normal', 'lognormal')
+
+    def __init__(self, tipo='fixa', media_ms=0, desvio_ms=0, rng=None):
+        if tipo not in self.TIPOS:
+            raise ValueError(f"Distribuição de latência inválida: {tipo}")
+        self.tipo = tipo
+        self.media_ms = media_ms
+        self.desvio_ms = desvio_ms
+        self.rng = rng or random.Random()
+
+    def sortear(self):
+        if self.tipo == 'fixa' or not self.media_ms:
+            valor = self.media_ms
+        elif self.tipo == 'uniforme':
+            valor = self.rng.uniform(self.media_ms - self.desvio_ms, self.media_ms + self.desvio_ms)
+        elif self.tipo == 'normal':
+            valor = self.rng.gauss(self.media_ms, self.desvio_ms)
+        else:
+            # Parâmetros da lognormal calculados para preservar média e desvio informados
+            variancia = (self.desvio_ms / self.media_ms) ** 2
+            sigma = math.sqrt(math.log(1 + variancia))
+            mu = math.log(self.media_ms) - sigma ** 2 / 2
+            valor = self.rng.lognormvariate(mu, sigma)
+        return max(0.0, valor) / 1000
+
+
+class LimiteRequisicoes:
+    """
+    Token bucket por serviço: acima de `limite_rps` o simulador responde 429
+    """
+
+    def __init__(self, limite_rps):
+        self.limite_rps = limite_rps
+        self.tokens = limite_rps
+        self.atualizado_em = time.monotonic()
+
+    def permitir(self):
+        if not self.limite_rps:
+            return True
+        agora = time.monotonic()
+        self.tokens = min(self.limite_rps, self.tokens + (agora - self.atualizado_em) * self.limite_rps)
+        self.atualizado_em = agora
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class Rotas:
+    """
+    Respostas das APIs simuladas a partir das fixtures gravadas
+    """
+
+    def __init__(self, completar_municipios=0):
+        self.receitaws = carregar_fixture('receitaws')
+        self.viacep = carregar_fixture('viacep')
+        self.estados = carregar_fixture('ibge_estados')
+        self.municipios = carregar_fixture('ibge_municipios')
+        self.completar_municipios = completar_municipios
+        self.rotas = [
+            ('receitaws', re.compile(r'/receitaws/cnpj/(\d+)'), self.cnpj),
+            ('viacep', re.compile(r'/viacep/(\d+)/json/?'), self.cep),
+            ('ibge', re.compile(r'/ibge/localidades/estados/?'), self.listar_estados),
+            ('ibge', re.compile(r'/ibge/localidades/estados/(\w+)/municipios/?'), self.municipios_por_uf),
+            ('ibge', re.compile(r'/ibge/localidades/estados/(\w+)/?'), self.estado),
+            ('ibge', re.compile(r'/ibge/localidades/municipios/(\d+)/?'), self.municipio),
+        ]
+
+    def resolver(self, caminho):
+        """
+        Retorna (servico, status, corpo) para o caminho requisitado
+        """
+        for servico, padrao, funcao in self.rotas:
+            match = padrao.fullmatch(caminho)
+            if match:
+                return (servico,) + funcao(*match.groups())
+        return None, 404, {}
+
+    def cnpj(self, cnpj):
+        if cnpj in self.receitaws:
+            return 200, self.receitaws[cnpj]
+        if len(cnpj) != 14:
+            return 200, {'status': 'ERROR', 'message': 'CNPJ inválido'}
+        # CNPJs não gravados recebem os dados da primeira fixture válida
+        modelo = next(dados for dados in self.receitaws.values() if dados.get('status') == 'OK')
+        mascara = f'{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}'
+        return 200, dict(modelo, cnpj=mascara)
+
+    def cep(self, cep):
+        if cep in self.viacep:
+            return 200, self.viacep[cep]
+        return 200, {'erro': 'true'}
+
+    def _buscar_estado(self, identificador):
+        for estado in self.estados:
+            if str(estado['id']) == identificador or estado['sigla'] == identificador.upper():
+                return estado
+        return None
+
+    def listar_estados(self):
+        return 200, self.estados
+
+    def estado(self, identificador):
+        estado = self._buscar_estado(identificador)
+        return (200, estado) if estado else (404, [])
+
+    def municipios_por_uf(self, identificador):
+        estado = self._buscar_estado(identificador)
+        if estado is None:
+            return 200, []
+        municipios = list(self.municipios.get(estado['sigla'], []))
+        # Completa a lista com municípios sintéticos para simular UFs grandes
+        for indice in range(len(municipios), self.completar_municipios):
+            municipios.append({'id': estado['id'] * 100000 + indice, 'nome': f"Município {indice} - {estado['sigla']}"})
+        return 200, municipios
+
+    def municipio(self, municipio_id):
+        for sigla, municipios in self.municipios.items():
+            for municipio in municipios:
+                if str(municipio['id']) == municipio_id:
+                    uf = self._buscar_estado(sigla)
+                    return 200, {
+                        'id': municipio['id'],
+                        'nome': municipio['nome'],
+                        'microrregiao': {'mesorregiao': {'UF': uf}},
+                    }
+        return 404, []
+
+
+class SimuladorUpstream:
+    """
+    Servidor HTTP assíncrono que simula ReceitaWS, ViaCEP e IBGE com latência,
+    taxa de erro e limite de requisições configuráveis. Pode ser usado como
+    context manager (executa em uma thread própria) em testes e benchmarks.
+    """
+
+    def __init__(self, host='127.0.0.1', porta=0, latencia='fixa', latencia_ms=0, desvio_ms=0,
+                 taxa_erro=0.0, limite_rps=0, semente=None, completar_municipios=0):
+        self.host = host
+        self.porta = porta
+        self.rng = random.Random(semente)
+        self.latencia = Latencia(latencia, latencia_ms, desvio_ms, self.rng)
+        self.taxa_erro = taxa_erro
+        self.limites = defaultdict(lambda: LimiteRequisicoes(limite_rps))
+        self.rotas = Rotas(completar_municipios)
+        self.contadores = defaultdict(lambda: defaultdict(int))
+        self._conexoes = set()
+        self._loop = None
+        self._servidor = None
+        self._thread = None
+
+    @property
+    def urls(self):
+        base = f'http://{self.host}:{self.porta}'
+        return {
+            'RECEITAWS_URL': f'{base}/receitaws',
+            'VIACEP_URL': f'{base}/viacep',
+            'IBGE_URL': f'{base}/ibge',
+        }
+
+    def estatisticas(self):
+        return {servico: dict(contadores) for servico, contadores in self.contadores.items()}
+
+    def zerar_estatisticas(self):
+        self.contadores.clear()
+
+    async def _atender(self, caminho):
+        if caminho == '/__simulador/estatisticas':
+            return 200, self.estatisticas(), {}
+
+        servico, status, corpo = self.rotas.resolver(caminho)
+        contadores = self.contadores[servico or 'desconhecido']
+        contadores['requisicoes'] += 1
+
+        if servico and not self.limites[servico].permitir():
+            contadores['limitadas'] += 1
+            return 429, {'status': 'ERROR', 'message': 'Too many requests'}, {'Retry-After': '1'}
+
+        await asyncio.sleep(self.latencia.sortear())
+
+        if self.taxa_erro and self.rng.random() < self.taxa_erro:
+            contadores['erros'] += 1
+            return 503, {'status': 'ERROR', 'message': 'Serviço indisponível (simulado)'}, {}
+        return status, corpo, {}
+
+    async def _conexao(self, reader, writer):
+        self._conexoes.add(writer)
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                metodo, alvo, versao = linha.decode('latin-1').split(' ', 2)
+                cabecalhos = {}
+                while True:
+                    cabecalho = await reader.readline()
+                    if cabecalho in (b'\r\n', b'\n', b''):
+                        break
+                    nome, _, valor = cabecalho.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                if int(cabecalhos.get('content-length', 0)):
+                    await reader.readexactly(int(cabecalhos['content-length']))
+
+                status, corpo, extras = await self._atender(alvo.split('?')[0])
+                conteudo = json.dumps(corpo, ensure_ascii=False).encode('utf-8')
+                manter = cabecalhos.get('connection', '').lower() != 'close' and versao.strip() == 'HTTP/1.1'
+                resposta = [
+                    f"HTTP/1.1 {status} {STATUS_HTTP.get(status, '')}",
+                    'Content-Type: application/json; charset=utf-8',
+                    f'Content-Length: {len(conteudo)}',
+                    f"Connection: {'keep-alive' if manter else 'close'}",
+                ] + [f'{nome}: {valor}' for nome, valor in extras.items()]
+                writer.write(('\r\n'.join(resposta) + '\r\n\r\n').encode('latin-1') + conteudo)
+                await writer.drain()
+                if not manter:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._conexoes.discard(writer)
+            writer.close()
+
+    async def iniciar_async(self):
+        self._servidor = await asyncio.start_server(self._conexao, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self._servidor
+
+    def iniciar(self):
+        """
+        Inicia o simulador em uma thread separada e retorna as URLs base
+        """
+        pronto = threading.Event()
+
+        def executar():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.iniciar_async())
+            pronto.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=executar, daemon=True, name='simulador-upstream')
+        self._thread.start()
+        pronto.wait()
+        return self.urls
+
+    def parar(self):
+        if self._loop is None:
+            return
+
+        async def fechar():
+            self._servidor.close()
+            # Fecha as conexões keep-alive ainda abertas; cada leitura pendente recebe EOF
+            for writer in list(self._conexoes):
+                writer.close()
+            tarefas = [tarefa for tarefa in asyncio.all_tasks() if tarefa is not asyncio.current_task()]
+            await asyncio.gather(*tarefas, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(fechar(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.parar()
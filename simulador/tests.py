@@ -0,0 +1,45 @@
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from cliente.services.cep_service import consultar_cep
+from cliente.services.cnpj_service import consultar_cnpj
+from cliente.services.ibge_service import consultar_municipio_por_id
+from .servidor import SimuladorUpstream, Latencia
+
+
+class SimuladorUpstreamTestCase(SimpleTestCase):
+    """Testes para o simulador local das APIs externas"""
+    
+    def test_services_usam_fixtures(self):
+        """Teste para os services consultarem o simulador pelas URLs configuradas"""
+        with SimuladorUpstream(semente=1) as simulador, override_settings(**simulador.urls):
+            self.assertEqual(consultar_cnpj('11.222.333/0001-81')['razao_social'],
+                             'EMPRESA EXEMPLO COMERCIO E SERVICOS LTDA')
+            self.assertEqual(consultar_cep('01001-000')['bairro'], 'Sé')
+            self.assertEqual(consultar_municipio_por_id(3106200)['estado']['sigla'], 'MG')
+            with self.assertRaises(ValueError):
+                consultar_municipio_por_id(1)
+            self.assertEqual(simulador.estatisticas()['ibge']['requisicoes'], 2)
+    
+    def test_limite_requisicoes(self):
+        """Teste para responder 429 com Retry-After acima do limite por segundo"""
+        with SimuladorUpstream(limite_rps=2) as simulador:
+            url = f"{simulador.urls['IBGE_URL']}/localidades/estados"
+            status_codes = [requests.get(url).status_code for _ in range(4)]
+            self.assertEqual(status_codes[:2], [200, 200])
+            self.assertIn(429, status_codes[2:])
+            self.assertEqual(requests.get(url).headers['Retry-After'], '1')
+    
+    def test_taxa_erro(self):
+        """Teste para simular indisponibilidade do serviço"""
+        with SimuladorUpstream(taxa_erro=1.0) as simulador:
+            response = requests.get(f"{simulador.urls['VIACEP_URL']}/01001000/json/")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(simulador.estatisticas()['viacep']['erros'], 1)
+    
+    def test_latencia_reprodutivel(self):
+        """Teste para sortear a mesma sequência de latências com a mesma semente"""
+        import random
+        primeira = Latencia('lognormal', 100, 50, random.Random(7))
+        segunda = Latencia('lognormal', 100, 50, random.Random(7))
+        self.assertEqual([primeira.sortear() for _ in range(5)], [segunda.sortear() for _ in range(5)])
@@ -1,9 +1,30 @@
+from django.conf import settings
 from django.contrib.auth.models import User, Group, Permission
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from app.campos import CamposDinamicosSerializerMixin
+from empresa.organizacao import organizacao_do_usuario
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UsuarioResumoSerializer(serializers.ModelSerializer):
+    """Dados básicos do usuário, usados ao expandir relacionamentos (?expand=)"""
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'email']
+
+
+class GrupoResumoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Group
+        fields = ['id', 'name']
+
+
+class UserSerializer(CamposDinamicosSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
+    # ?expand=groups devolve id e nome dos grupos em vez dos ids
+    expansoes = {'groups': GrupoResumoSerializer}
 
     class Meta:
         model = User
@@ -57,4 +78,14 @@ class PermissionSerializer(serializers.ModelSerializer):
     
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(required=True)
-    new_password = serializers.CharField(required=True)
\ No newline at end of file
+    new_password = serializers.CharField(required=True)
+
+
+class TokenOrganizacaoSerializer(TokenObtainPairSerializer):
+    """Inclui a organização do usuário no token (copiada para os tokens de acesso renovados)"""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[settings.ORGANIZACAO_CLAIM] = organizacao_do_usuario(user)
+        return token
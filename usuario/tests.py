@@ -1,3 +1,72 @@
-from django.test import TestCase
+from django.contrib.auth.models import Group, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from empresa.models import MembroOrganizacao, Organizacao
+from usuario.serializers import TokenOrganizacaoSerializer
+
+
+class UsuarioCamposDinamicosTestCase(APITestCase):
+    """Testes para ?fields= e ?expand= na API de usuários"""
+    
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='testpass', is_staff=True)
+        self.client.force_authenticate(user=self.admin)
+        grupo = Group.objects.create(name='Financeiro')
+        for indice in range(3):
+            User.objects.create_user(username=f'usuario{indice}', password='x').groups.add(grupo)
+        self.url = '/usuario/users/'
+    
+    def test_fields_sem_grupos(self):
+        """Teste para não consultar grupos quando eles não são pedidos"""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, {'fields': 'id,username'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'username'})
+        self.assertFalse(any('auth_group' in consulta['sql'] for consulta in consultas.captured_queries))
+    
+    def test_grupos_em_uma_consulta(self):
+        """Teste para carregar os grupos de todos os usuários em uma única consulta"""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, {'expand': 'groups'})
+        self.assertEqual(len([c for c in consultas.captured_queries if 'auth_group' in c['sql']]), 1)
+        usuario = next(item for item in response.data['results'] if item['username'] == 'usuario0')
+        self.assertEqual([grupo['name'] for grupo in usuario['groups']], ['Financeiro'])
+
+
+class UsuarioOrganizacaoTestCase(APITestCase):
+    """Testes para restringir a API de usuários à organização da requisição"""
+    
+    def setUp(self):
+        self.organizacao = Organizacao.objects.create(nome='Prestadora A', slug='prestadora-a')
+        outra = Organizacao.objects.create(nome='Prestadora B', slug='prestadora-b')
+        self.admin = User.objects.create_user(username='admin', password='testpass', is_staff=True)
+        MembroOrganizacao.objects.create(usuario=self.admin, organizacao=self.organizacao)
+        self.colega = User.objects.create_user(username='colega', password='x')
+        MembroOrganizacao.objects.create(usuario=self.colega, organizacao=self.organizacao)
+        self.externo = User.objects.create_user(username='externo', password='x')
+        MembroOrganizacao.objects.create(usuario=self.externo, organizacao=outra)
+        User.objects.create_user(username='sem_organizacao', password='x')
+        token = TokenOrganizacaoSerializer.get_token(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.url = '/usuario/users/'
+    
+    def test_lista_somente_usuarios_da_organizacao(self):
+        """Teste para não listar nem editar usuários de outras organizações"""
+        response = self.client.get(self.url)
+        self.assertEqual({item['username'] for item in response.data['results']}, {'admin', 'colega'})
+        
+        response = self.client.patch(f'{self.url}{self.externo.id}/', {'first_name': 'Alterado'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.externo.refresh_from_db()
+        self.assertEqual(self.externo.first_name, '')
+    
+    def test_usuario_criado_entra_na_organizacao(self):
+        """Teste para vincular à organização de quem cadastrou o usuário criado"""
+        response = self.client.post(self.url, {'username': 'novo', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            MembroOrganizacao.objects.get(usuario_id=response.data['id']).organizacao_id, self.organizacao.id
+        )
@@ -5,14 +5,35 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework_simplejwt.views import TokenObtainPairView
+from app.campos import CamposDinamicosMixin
+from empresa.models import MembroOrganizacao
+from empresa.organizacao import organizacao_da_requisicao
 from .serializers import UserSerializer, GroupSerializer, PermissionSerializer, ChangePasswordSerializer
 from .permissions import IsStaffUser
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(CamposDinamicosMixin, viewsets.ModelViewSet):
+    """
+    Usuários da organização da requisição (os sem organização, na instalação
+    sem organização); aceita ?fields= e ?expand=groups nas leituras
+    """
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsStaffUser]
 
+    def get_queryset(self):
+        organizacao_id = organizacao_da_requisicao(self.request)
+        if organizacao_id is None:
+            return super().get_queryset().filter(membro_organizacao__isnull=True)
+        return super().get_queryset().filter(membro_organizacao__organizacao_id=organizacao_id)
+
+    def perform_create(self, serializer):
+        # O usuário criado entra na organização de quem o cadastrou
+        super().perform_create(serializer)
+        organizacao_id = organizacao_da_requisicao(self.request)
+        if organizacao_id is not None:
+            MembroOrganizacao.objects.create(usuario=serializer.instance, organizacao_id=organizacao_id)
+
 class GroupViewSet(viewsets.ModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
@@ -61,4 +82,12 @@ class ChangePasswordView(APIView):
             user.set_password(serializer.data.get('new_password'))
             user.save()
             return Response({"detail": "Senha alterada com sucesso."}, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TokenLoginView(TokenObtainPairView):
+    """
+    Obtenção do token (login), no escopo de limite de taxa próprio contra
+    tentativas repetidas de senha
+    """
+    throttle_scope = 'login'